@@ -0,0 +1,413 @@
+"""
+Axiom Hive Benchmarks
+Measures fold latency for the brute-force scan and the KD-tree index, and
+runs a reproducible fold / chain-validation suite with regression checks
+"""
+
+import argparse
+import json
+import platform
+import sys
+import time
+import tracemalloc
+from datetime import datetime
+from typing import Callable, Dict, List, Optional, Tuple
+
+import numpy as np
+
+from axiom_core import HamiltonianValidator, LogicChain, VectorConstrainedSingularity
+
+
+def build_lattice(
+    n_states: int,
+    dim: int,
+    index: str,
+    threshold: float = 0.05,
+    seed: int = 0
+) -> VectorConstrainedSingularity:
+    """Build a reproducible lattice of uniformly distributed states."""
+    rng = np.random.default_rng(seed)
+    vcs = VectorConstrainedSingularity(
+        threshold=threshold,
+        max_states=n_states,
+        index=index
+    )
+    vcs.define_invariants(
+        rng.random((n_states, dim)),
+        [f"S{i:07d}" for i in range(n_states)]
+    )
+    return vcs
+
+
+def time_folds(vcs: VectorConstrainedSingularity, queries: np.ndarray) -> float:
+    """Mean seconds per fold over the query rows."""
+    vcs.fold(queries[0])  # build the index outside the timed loop
+    start = time.perf_counter()
+    for query in queries:
+        vcs.fold(query)
+    return (time.perf_counter() - start) / len(queries)
+
+
+def bench_index(
+    sizes: List[int],
+    dims: List[int],
+    n_queries: int = 200,
+    seed: int = 0
+) -> List[Dict]:
+    """Time brute vs kdtree folds for every (n_states, dim) pair."""
+    rng = np.random.default_rng(seed + 1)
+    rows = []
+    for dim in dims:
+        # Half the queries land near a state, half anywhere in the unit cube
+        for n_states in sizes:
+            brute = build_lattice(n_states, dim, "brute", seed=seed)
+            kdtree = build_lattice(n_states, dim, "kdtree", seed=seed)
+            anchors = brute.coordinates[rng.integers(n_states, size=n_queries // 2)]
+            queries = np.concatenate([
+                anchors + rng.normal(scale=0.01, size=anchors.shape),
+                rng.random((n_queries - len(anchors), dim))
+            ])
+            
+            brute_s = time_folds(brute, queries)
+            kdtree_s = time_folds(kdtree, queries)
+            rows.append({
+                "n_states": n_states,
+                "dim": dim,
+                "brute_us": brute_s * 1e6,
+                "kdtree_us": kdtree_s * 1e6,
+                "speedup": brute_s / kdtree_s,
+            })
+    return rows
+
+
+def print_index_report(rows: List[Dict]) -> None:
+    """Print the timing table and the per-dimension crossover."""
+    print(f"{'dim':>5} {'states':>8} {'brute us':>10} {'kdtree us':>10} {'speedup':>8}")
+    for row in rows:
+        print(
+            f"{row['dim']:>5} {row['n_states']:>8} {row['brute_us']:>10.1f} "
+            f"{row['kdtree_us']:>10.1f} {row['speedup']:>8.2f}"
+        )
+    
+    print("\nCrossover (smallest lattice where the KD-tree wins):")
+    for dim in sorted({row["dim"] for row in rows}):
+        wins = [r["n_states"] for r in rows if r["dim"] == dim and r["speedup"] > 1.0]
+        print(f"  dim={dim:<4} {'n_states >= ' + str(min(wins)) if wins else 'never'}")
+
+
+# Suite presets: lattice cases are (n_states, dim, tie_density), chain cases
+# are (n_nodes, shape). Each lattice case runs a single-vector and a batch
+# fold stream.
+SUITES = {
+    "quick": {
+        "lattices": [(3, 2, 0.0), (1000, 16, 0.1), (10000, 64, 0.0)],
+        "chains": [(10, "linear"), (10000, "linear"), (10000, "wide"), (10000, "cyclic")],
+        "queries": 500,
+        "batch_size": 256,
+        "repeats": 5,
+    },
+    "full": {
+        "lattices": [
+            (3, 2, 0.0), (1000, 2, 0.5), (1000, 16, 0.1), (10000, 64, 0.0),
+            (10000, 1024, 0.1), (100000, 8, 0.01), (100000, 64, 0.0),
+        ],
+        "chains": [
+            (10, "linear"), (10000, "linear"), (10000, "wide"), (10000, "cyclic"),
+            (1000000, "linear"), (1000000, "wide"), (1000000, "cyclic"),
+        ],
+        "queries": 2000,
+        "batch_size": 1024,
+        "repeats": 5,
+    },
+}
+
+# Default tolerances for `compare`: relative change that counts as a regression
+THROUGHPUT_TOLERANCE = 0.10
+LATENCY_TOLERANCE = 0.20
+MEMORY_TOLERANCE = 0.20
+
+
+def build_tie_lattice(
+    n_states: int,
+    dim: int,
+    tie_density: float,
+    threshold: float = 0.05,
+    seed: int = 0
+) -> Tuple[VectorConstrainedSingularity, np.ndarray]:
+    """
+    Reproducible lattice whose query stream has a chosen fraction of ties.
+    
+    States are spread over a cube wide enough that random states are
+    rarely within 2 x threshold of each other. The first states are then
+    paired off: each odd state sits `threshold` away from its even partner,
+    so the pair's midpoint is within threshold of both. Returns the
+    lattice and a (n_pairs x dim) array of those tie points.
+    """
+    rng = np.random.default_rng(seed)
+    side = max(1.0, 8 * threshold * n_states ** (1.0 / dim))
+    coords = rng.random((n_states, dim)) * side
+    n_pairs = min(n_states // 2, int(np.ceil(tie_density * n_states / 2)))
+    
+    direction = rng.standard_normal((n_pairs, dim))
+    direction /= np.linalg.norm(direction, axis=1, keepdims=True)
+    coords[1:2 * n_pairs:2] = coords[0:2 * n_pairs:2] + direction * threshold
+    
+    vcs = VectorConstrainedSingularity(threshold=threshold, max_states=n_states, index="brute")
+    vcs.define_invariants(coords, [f"S{i:07d}" for i in range(n_states)])
+    return vcs, coords[0:2 * n_pairs:2] + direction * (threshold / 2)
+
+
+def tie_queries(
+    vcs: VectorConstrainedSingularity,
+    tie_points: np.ndarray,
+    n_queries: int,
+    tie_density: float,
+    seed: int = 0
+) -> np.ndarray:
+    """Queries of which `tie_density` hit a tie point and the rest land near one unpaired state."""
+    rng = np.random.default_rng(seed + 1)
+    n_ties = int(round(tie_density * n_queries)) if len(tie_points) else 0
+    coords = vcs.coordinates
+    unpaired = coords[2 * len(tie_points):] if len(coords) > 2 * len(tie_points) else coords
+    near = unpaired[rng.integers(len(unpaired), size=n_queries - n_ties)]
+    near = near + rng.normal(scale=vcs.threshold * 0.2 / np.sqrt(coords.shape[1]), size=near.shape)
+    queries = np.concatenate([tie_points[rng.integers(len(tie_points), size=n_ties)], near]) if n_ties else near
+    return queries[rng.permutation(n_queries)]
+
+
+def build_chain(n_nodes: int, shape: str) -> Dict[str, np.ndarray]:
+    """
+    Columns of a synthetic logic chain (pass them to `LogicChain`).
+    
+    Shapes: "linear" (each node cites the one before: a path as deep as
+    the chain), "wide" (each node cites node 0, one huge fan-in) and
+    "cyclic" (linear, plus every 100th node also citing the node 50 ahead,
+    which closes a 51-node cycle per hundred nodes).
+    """
+    ids = np.arange(n_nodes)
+    node_ids = np.array([f"n{i}" for i in range(n_nodes)], dtype=object)
+    if shape == "linear":
+        citing, cited = ids[1:], ids[:-1]
+    elif shape == "wide":
+        citing, cited = ids[1:], np.zeros(n_nodes - 1, dtype=np.int64)
+    elif shape == "cyclic":
+        back = ids[ids % 100 == 0]
+        back = back[back + 50 < n_nodes]
+        citing = np.concatenate([ids[1:], back])
+        cited = np.concatenate([ids[:-1], back + 50])
+    else:
+        raise ValueError(f"Unknown chain shape: {shape}")
+    
+    order = np.argsort(citing, kind="stable")
+    counts = np.bincount(citing, minlength=n_nodes)
+    indptr = np.zeros(n_nodes + 1, dtype=np.int64)
+    np.cumsum(counts, out=indptr[1:])
+    return {
+        "node_ids": node_ids,
+        "propositions": np.array([f"proposition {i}" for i in range(n_nodes)], dtype=object),
+        "truth_values": np.ones(n_nodes),
+        "evidence_indptr": indptr,
+        "evidence_ids": node_ids[cited[order]],
+    }
+
+
+def measure(run: Callable[[], None], repeats: int) -> Tuple[np.ndarray, float]:
+    """
+    Per-call seconds over `repeats` calls, then peak traced memory (MB).
+    
+    Peak memory comes from one extra call under tracemalloc (which sees
+    NumPy buffers too), kept apart from the timed calls it would slow.
+    """
+    seconds = np.empty(repeats)
+    for i in range(repeats):
+        start = time.perf_counter()
+        run()
+        seconds[i] = time.perf_counter() - start
+    
+    tracemalloc.start()
+    try:
+        run()
+        _, peak = tracemalloc.get_traced_memory()
+    finally:
+        tracemalloc.stop()
+    return seconds, peak / 1e6
+
+
+def summarize(name: str, params: Dict, seconds: np.ndarray, items: int, unit: str, peak_mb: float) -> Dict:
+    """One result row: throughput over all calls plus per-call latency percentiles."""
+    p50, p90, p99 = np.percentile(seconds, [50, 90, 99]) * 1e3
+    return {
+        "name": name,
+        **params,
+        "throughput": items * len(seconds) / float(seconds.sum()),
+        "unit": unit,
+        "p50_ms": float(p50),
+        "p90_ms": float(p90),
+        "p99_ms": float(p99),
+        "peak_mb": peak_mb,
+    }
+
+
+def bench_folds(
+    n_states: int,
+    dim: int,
+    tie_density: float,
+    n_queries: int,
+    batch_size: int,
+    seed: int = 0
+) -> List[Dict]:
+    """Single-vector and batch fold streams over one tie-controlled lattice."""
+    vcs, tie_points = build_tie_lattice(n_states, dim, tie_density, seed=seed)
+    queries = tie_queries(vcs, tie_points, n_queries, tie_density, seed)
+    params = {"n_states": n_states, "dim": dim, "tie_density": tie_density}
+    tag = f"n={n_states}/d={dim}/ties={tie_density}"
+    
+    vcs.min_separation  # measure now rather than racing the timed folds
+    vcs.fold(queries[0])  # warm lazily built lattice facts outside the timing
+    rows = iter(queries)
+    seconds, peak = measure(lambda: vcs.fold(next(rows)), len(queries) - 1)
+    single = summarize(f"fold_single/{tag}", params, seconds, 1, "folds/s", peak)
+    
+    batches = [queries[i:i + batch_size] for i in range(0, len(queries), batch_size)]
+    blocks = iter(batches * 2)
+    seconds, peak = measure(lambda: vcs.fold_batch(next(blocks)), len(batches))
+    batch = summarize(f"fold_batch/{tag}", dict(params, batch_size=batch_size), seconds,
+                      len(queries) / len(batches), "rows/s", peak)
+    return [single, batch]
+
+
+def bench_chain(n_nodes: int, shape: str, repeats: int) -> Dict:
+    """Validation of a freshly wrapped chain (so its compile step is timed too)."""
+    columns = build_chain(n_nodes, shape)
+    validator = HamiltonianValidator()
+    seconds, peak = measure(lambda: validator.validate_logic_chain(LogicChain(**columns)), repeats)
+    return summarize(
+        f"validate_chain/n={n_nodes}/{shape}",
+        {"n_nodes": n_nodes, "shape": shape},
+        seconds, n_nodes, "nodes/s", peak
+    )
+
+
+def run_suite(suite: str, seed: int = 0, log: Optional[Callable[[str], None]] = None) -> Dict:
+    """Run a preset from SUITES and return the JSON-ready report."""
+    config = SUITES[suite]
+    results = []
+    for n_states, dim, tie_density in config["lattices"]:
+        results += bench_folds(n_states, dim, tie_density, config["queries"], config["batch_size"], seed)
+        if log:
+            log(f"  folds n={n_states} d={dim} ties={tie_density}: {results[-2]['throughput']:.0f} folds/s")
+    for n_nodes, shape in config["chains"]:
+        results.append(bench_chain(n_nodes, shape, config["repeats"]))
+        if log:
+            log(f"  chain n={n_nodes} {shape}: {results[-1]['throughput']:.0f} nodes/s")
+    return {
+        "suite": suite,
+        "seed": seed,
+        "timestamp": datetime.now().isoformat(),
+        "python": platform.python_version(),
+        "numpy": np.__version__,
+        "machine": platform.machine(),
+        "results": results,
+    }
+
+
+def compare(
+    baseline: Dict,
+    current: Dict,
+    throughput_tolerance: float = THROUGHPUT_TOLERANCE,
+    latency_tolerance: float = LATENCY_TOLERANCE,
+    memory_tolerance: float = MEMORY_TOLERANCE
+) -> List[Dict]:
+    """
+    Per-benchmark changes between two reports, with regressions flagged.
+    
+    A benchmark regresses when its throughput falls, or its p99 latency or
+    peak memory grows, by more than the matching tolerance.
+    """
+    before = {row["name"]: row for row in baseline["results"]}
+    rows = []
+    for row in current["results"]:
+        old = before.get(row["name"])
+        if old is None:
+            continue
+        throughput = row["throughput"] / old["throughput"] - 1
+        p99 = row["p99_ms"] / old["p99_ms"] - 1 if old["p99_ms"] else 0.0
+        memory = row["peak_mb"] / old["peak_mb"] - 1 if old["peak_mb"] else 0.0
+        reasons = []
+        if throughput < -throughput_tolerance:
+            reasons.append("throughput")
+        if p99 > latency_tolerance:
+            reasons.append("p99")
+        if memory > memory_tolerance:
+            reasons.append("memory")
+        rows.append({
+            "name": row["name"],
+            "throughput_change": throughput,
+            "p99_change": p99,
+            "memory_change": memory,
+            "regressions": reasons,
+        })
+    return rows
+
+
+def print_comparison(rows: List[Dict]) -> None:
+    """Print the comparison table."""
+    print(f"{'benchmark':<44} {'throughput':>11} {'p99':>9} {'memory':>9}")
+    for row in rows:
+        flag = "  REGRESSION: " + ", ".join(row["regressions"]) if row["regressions"] else ""
+        print(
+            f"{row['name']:<44} {row['throughput_change']:>+10.1%} "
+            f"{row['p99_change']:>+8.1%} {row['memory_change']:>+8.1%}{flag}"
+        )
+
+
+def main():
+    """Run the benchmarks from the command line"""
+    parser = argparse.ArgumentParser(description="Axiom Hive fold benchmarks")
+    parser.add_argument("--sizes", type=int, nargs="+",
+                        default=[256, 1024, 4096, 16384, 65536])
+    parser.add_argument("--dims", type=int, nargs="+", default=[2, 4, 8, 16, 32, 64])
+    parser.add_argument("--queries", type=int, default=200)
+    parser.add_argument("--seed", type=int, default=0)
+    parser.add_argument("--suite", choices=sorted(SUITES),
+                        help="Run a fold/chain suite instead of the brute vs kdtree table")
+    parser.add_argument("--output", help="Write the suite report to this JSON file")
+    parser.add_argument("--compare", metavar="BASELINE",
+                        help="Compare against a stored report; exit 1 on regressions")
+    parser.add_argument("--current", metavar="REPORT",
+                        help="With --compare: compare this stored report instead of running the suite")
+    parser.add_argument("--throughput-tolerance", type=float, default=THROUGHPUT_TOLERANCE)
+    parser.add_argument("--latency-tolerance", type=float, default=LATENCY_TOLERANCE)
+    parser.add_argument("--memory-tolerance", type=float, default=MEMORY_TOLERANCE)
+    args = parser.parse_args()
+    
+    if args.suite is None and args.current is None:
+        if args.compare:
+            parser.error("--compare needs --suite or --current")
+        print_index_report(bench_index(args.sizes, args.dims, args.queries, args.seed))
+        return
+    
+    if args.current:
+        with open(args.current, encoding="utf-8") as f:
+            report = json.load(f)
+    else:
+        print(f"Running suite {args.suite!r}")
+        report = run_suite(args.suite, args.seed, log=print)
+        if args.output:
+            with open(args.output, "w", encoding="utf-8") as f:
+                json.dump(report, f, indent=2)
+    
+    if args.compare:
+        with open(args.compare, encoding="utf-8") as f:
+            baseline = json.load(f)
+        rows = compare(
+            baseline, report,
+            args.throughput_tolerance, args.latency_tolerance, args.memory_tolerance
+        )
+        print_comparison(rows)
+        if any(row["regressions"] for row in rows):
+            sys.exit(1)
+
+
+if __name__ == "__main__":
+    main()
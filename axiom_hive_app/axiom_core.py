@@ -3,13 +3,21 @@ Axiom Hive Core Logic - Simplified Implementation
 Implements VCS (Vector Constrained Singularity) and Hamiltonian Validator
 """
 
+import bisect
 import hashlib
+import os
+import struct
+import threading
 import numpy as np
-from dataclasses import dataclass
-from typing import List, Dict, Optional, Tuple
+from collections import OrderedDict
+from dataclasses import dataclass, replace
+from typing import Callable, Iterator, List, Dict, Optional, Tuple, Union
 from enum import Enum
+from itertools import islice, repeat
 import json
 from datetime import datetime
+from time import perf_counter
+from axiom_merkle import LEAF_PREFIX, MerkleTree, hash_rows, proof_to_dict, verify_proof_dict
 
 
 class QuantizationResult(Enum):
@@ -20,7 +28,7 @@ class QuantizationResult(Enum):
     ERROR_INVALID_INPUT = "ERROR_INVALID_INPUT"
 
 
-@dataclass
+@dataclass(frozen=True, slots=True)
 class StateVector:
     """Represents a discrete, valid state within the system"""
     coordinates: np.ndarray
@@ -32,7 +40,7 @@ class StateVector:
         return float(np.linalg.norm(self.coordinates - point))
 
 
-@dataclass
+@dataclass(frozen=True, slots=True)
 class QuantizationOutput:
     """Complete output from VCS quantization"""
     result: QuantizationResult
@@ -42,7 +50,213 @@ class QuantizationOutput:
     input_hash: str
 
 
+RESULT_CODES: Tuple[QuantizationResult, ...] = tuple(QuantizationResult)
+
+
+class QuantizationView:
+    """
+    Read-only view of one row of a `QuantizationBatch`.
+    
+    Exposes the same attributes as `QuantizationOutput`, read from the
+    batch columns on access.
+    """
+    __slots__ = ("_batch", "_i")
+    
+    def __init__(self, batch: "QuantizationBatch", i: int):
+        self._batch = batch
+        self._i = i
+    
+    @property
+    def result(self) -> QuantizationResult:
+        return RESULT_CODES[self._batch.result_codes[self._i]]
+    
+    @property
+    def state_label(self) -> Optional[str]:
+        state_index = int(self._batch.label_index[self._i])
+        return self._batch.labels[state_index] if state_index >= 0 else None
+    
+    @property
+    def residual_energy(self) -> float:
+        return float(self._batch.residual_energy[self._i])
+    
+    @property
+    def nearest_states(self) -> List[Tuple[str, float]]:
+        batch = self._batch
+        lo, hi = batch.nearest_indptr[self._i], batch.nearest_indptr[self._i + 1]
+        return list(zip(
+            batch.labels[batch.nearest_index[lo:hi]].tolist(),
+            batch.nearest_distance[lo:hi].tolist()
+        ))
+    
+    @property
+    def input_hash(self) -> str:
+        return str(self._batch.input_hashes[self._i])
+    
+    def materialize(self) -> QuantizationOutput:
+        """Copy this row out as a standalone `QuantizationOutput`."""
+        return QuantizationOutput(
+            result=self.result,
+            state_label=self.state_label,
+            residual_energy=self.residual_energy,
+            nearest_states=self.nearest_states,
+            input_hash=self.input_hash
+        )
+    
+    def __repr__(self) -> str:
+        return f"QuantizationView({self.materialize()!r})"
+
+
+@dataclass(frozen=True, slots=True)
+class QuantizationBatch:
+    """
+    Columnar output from `VectorConstrainedSingularity.fold_batch`.
+    
+    `result_codes` index into `RESULT_CODES`; `label_index` indexes `labels`
+    (-1 when no state was selected). Nearest states are stored CSR-style:
+    row i owns `nearest_index[nearest_indptr[i]:nearest_indptr[i + 1]]`
+    and the matching slice of `nearest_distance`. Indexing or iterating
+    the batch yields `QuantizationView`s rather than per-row objects.
+    `snapshot` is the lattice version the rows were folded against.
+    """
+    result_codes: np.ndarray
+    label_index: np.ndarray
+    residual_energy: np.ndarray
+    nearest_indptr: np.ndarray
+    nearest_index: np.ndarray
+    nearest_distance: np.ndarray
+    input_hashes: np.ndarray
+    labels: np.ndarray
+    snapshot: Optional["LatticeSnapshot"] = None
+    
+    def __len__(self) -> int:
+        return len(self.result_codes)
+    
+    def __getitem__(self, i: int) -> QuantizationView:
+        n = len(self)
+        if not -n <= i < n:
+            raise IndexError(f"Row {i} out of range for a batch of {n}")
+        return QuantizationView(self, i % n)
+    
+    def __iter__(self) -> Iterator[QuantizationView]:
+        return (QuantizationView(self, i) for i in range(len(self)))
+    
+    def output(self, i: int) -> QuantizationOutput:
+        """Materialize row i as a `QuantizationOutput`."""
+        return self[i].materialize()
+    
+    def outputs(self) -> List[QuantizationOutput]:
+        """Materialize every row as a `QuantizationOutput`."""
+        return [self.output(i) for i in range(len(self))]
+
+
+# Preimage of a Merkle leaf (after LEAF_PREFIX): the full input digest and
+# the fold outcome, so a proof covers both what was folded and the result
+_MERKLE_LEAF_RECORD = np.dtype([
+    ("input_digest", "u1", (32,)),
+    ("result", "u1"),
+    ("label_index", "<i8"),
+    ("residual_energy", "<f8"),
+])
+
+
+def _merkle_leaf_records(
+    input_digests: np.ndarray,
+    result_codes: np.ndarray,
+    label_index: np.ndarray,
+    residual_energy: np.ndarray
+) -> np.ndarray:
+    """Pack fold outcomes into leaf preimage records."""
+    records = np.empty(len(result_codes), dtype=_MERKLE_LEAF_RECORD)
+    records["input_digest"] = input_digests
+    records["result"] = result_codes
+    records["label_index"] = label_index
+    records["residual_energy"] = residual_energy
+    return records
+
+
 @dataclass
+class MerkleBatchReceipt:
+    """
+    One receipt for a whole batch: a Merkle root over per-input leaves.
+    
+    Each leaf commits to the full-length digest of the input's float64
+    bytes and to its fold outcome. Only `header()` (timestamp, lattice
+    hash and root) needs to be signed or stored; per-item records and
+    inclusion proofs are produced on demand.
+    """
+    timestamp: str
+    lattice_hash: str
+    lattice_version: int
+    algorithm: str
+    batch: QuantizationBatch
+    input_digests: np.ndarray
+    tree: MerkleTree
+    
+    def __len__(self) -> int:
+        return len(self.batch)
+    
+    @property
+    def root(self) -> str:
+        """Hex Merkle root of the batch."""
+        return self.tree.root.hex()
+    
+    def header(self) -> Dict:
+        """The part of the receipt that is signed or logged."""
+        return {
+            "timestamp": self.timestamp,
+            "lattice_hash": self.lattice_hash,
+            "lattice_version": self.lattice_version,
+            "algorithm": self.algorithm,
+            "size": len(self),
+            "root": self.root
+        }
+    
+    def item(self, i: int) -> Dict:
+        """Receipt fields for input i."""
+        state_index = int(self.batch.label_index[i])
+        return {
+            "index": i,
+            "input_digest": self.input_digests[i].tobytes().hex(),
+            "result": RESULT_CODES[self.batch.result_codes[i]].value,
+            "state_label": self.batch.labels[state_index] if state_index >= 0 else None,
+            "state_index": state_index,
+            "residual_energy": float(self.batch.residual_energy[i])
+        }
+    
+    def proof(self, i: int) -> Dict:
+        """Inclusion proof tying input i to the root."""
+        return proof_to_dict(self.tree, i)
+
+
+def verify_merkle_item(input_vector, item: Dict, proof: Dict, root: Optional[str] = None) -> bool:
+    """
+    Check one fold against a batch receipt.
+    
+    Recomputes the input digest and the leaf from `input_vector` and the
+    item's recorded outcome, then checks the inclusion proof. Pass the
+    signed `root` to also check the proof is for that batch.
+    """
+    if root is not None and proof["root"] != root:
+        return False
+    
+    algorithm = proof["algorithm"]
+    input_arr = np.ascontiguousarray(input_vector, dtype=np.float64).reshape(1, -1)
+    input_digest = hash_rows(input_arr, algorithm)
+    if input_digest[0].tobytes().hex() != item["input_digest"]:
+        return False
+    
+    codes = [result.value for result in RESULT_CODES]
+    record = _merkle_leaf_records(
+        input_digest,
+        np.array([codes.index(item["result"])]),
+        np.array([item["state_index"]]),
+        np.array([item["residual_energy"]])
+    )
+    leaf = hash_rows(record, algorithm, LEAF_PREFIX)[0].tobytes()
+    return leaf.hex() == proof["leaf"] and proof["index"] == item["index"] and verify_proof_dict(proof)
+
+
+@dataclass(frozen=True, slots=True)
 class LogicNode:
     """Represents a proposition in reasoning chain"""
     proposition: str
@@ -51,7 +265,139 @@ class LogicNode:
     node_id: str
 
 
-@dataclass
+class LogicNodeView:
+    """Read-only view of one node of a `LogicChain`, with `LogicNode`'s attributes."""
+    __slots__ = ("_chain", "_i")
+    
+    def __init__(self, chain: "LogicChain", i: int):
+        self._chain = chain
+        self._i = i
+    
+    @property
+    def proposition(self) -> str:
+        return self._chain.propositions[self._i]
+    
+    @property
+    def truth_value(self) -> float:
+        return float(self._chain.truth_values[self._i])
+    
+    @property
+    def evidence_ids(self) -> List[str]:
+        chain = self._chain
+        return chain.evidence_ids[chain.evidence_indptr[self._i]:chain.evidence_indptr[self._i + 1]].tolist()
+    
+    @property
+    def node_id(self) -> str:
+        return self._chain.node_ids[self._i]
+    
+    def materialize(self) -> LogicNode:
+        """Copy this node out as a standalone `LogicNode`."""
+        return LogicNode(
+            proposition=self.proposition,
+            truth_value=self.truth_value,
+            evidence_ids=self.evidence_ids,
+            node_id=self.node_id
+        )
+    
+    def __repr__(self) -> str:
+        return f"LogicNodeView({self.materialize()!r})"
+
+
+class LogicChain:
+    """
+    Array-backed reasoning chain.
+    
+    Holds node ids, propositions and truth values as columns, and
+    evidence ids CSR-style: node i cites
+    `evidence_ids[evidence_indptr[i]:evidence_indptr[i + 1]]`. Indexing or
+    iterating yields `LogicNodeView`s, so a chain can be passed anywhere a
+    list of `LogicNode`s is accepted.
+    """
+    __slots__ = (
+        "node_ids", "propositions", "truth_values",
+        "evidence_indptr", "evidence_ids", "_node_index", "_evidence_rows"
+    )
+    
+    def __init__(
+        self,
+        node_ids: np.ndarray,
+        propositions: np.ndarray,
+        truth_values: np.ndarray,
+        evidence_indptr: np.ndarray,
+        evidence_ids: np.ndarray
+    ):
+        """Wrap existing columns (no copies are made)."""
+        n_nodes = len(node_ids)
+        if not len(propositions) == len(truth_values) == n_nodes:
+            raise ValueError("node_ids, propositions and truth_values must have the same length")
+        if len(evidence_indptr) != n_nodes + 1 or evidence_indptr[-1] != len(evidence_ids):
+            raise ValueError("evidence_indptr does not match node_ids and evidence_ids")
+        self.node_ids = node_ids
+        self.propositions = propositions
+        self.truth_values = truth_values
+        self.evidence_indptr = evidence_indptr
+        self.evidence_ids = evidence_ids
+        self._node_index: Optional[Dict[str, int]] = None
+        self._evidence_rows: Optional[np.ndarray] = None
+    
+    @classmethod
+    def from_nodes(cls, nodes: List[LogicNode]) -> "LogicChain":
+        """Pack a list of nodes into columns."""
+        n_nodes = len(nodes)
+        node_ids = np.empty(n_nodes, dtype=object)
+        propositions = np.empty(n_nodes, dtype=object)
+        node_ids[:] = [node.node_id for node in nodes]
+        propositions[:] = [node.proposition for node in nodes]
+        truth_values = np.fromiter((node.truth_value for node in nodes), dtype=np.float64, count=n_nodes)
+        
+        counts = np.fromiter((len(node.evidence_ids) for node in nodes), dtype=np.int64, count=n_nodes)
+        evidence_indptr = np.zeros(n_nodes + 1, dtype=np.int64)
+        np.cumsum(counts, out=evidence_indptr[1:])
+        evidence_ids = np.empty(int(evidence_indptr[-1]), dtype=object)
+        evidence_ids[:] = [eid for node in nodes for eid in node.evidence_ids]
+        return cls(node_ids, propositions, truth_values, evidence_indptr, evidence_ids)
+    
+    def __len__(self) -> int:
+        return len(self.node_ids)
+    
+    def __getitem__(self, i: int) -> LogicNodeView:
+        n = len(self)
+        if not -n <= i < n:
+            raise IndexError(f"Node {i} out of range for a chain of {n}")
+        return LogicNodeView(self, i % n)
+    
+    def __iter__(self) -> Iterator[LogicNodeView]:
+        return (LogicNodeView(self, i) for i in range(len(self)))
+    
+    @property
+    def node_index(self) -> Dict[str, int]:
+        """Row of each node id (built once, on first use)."""
+        if self._node_index is None:
+            self._node_index = dict(zip(self.node_ids.tolist(), range(len(self.node_ids))))
+        return self._node_index
+    
+    @property
+    def evidence_rows(self) -> np.ndarray:
+        """
+        Column indices of the CSR evidence matrix (built once, on first use).
+        
+        Aligned with `evidence_ids`: the row of each cited node, or -1 if
+        no node has that id. Together with `evidence_indptr` this is the
+        chain's evidence adjacency matrix.
+        """
+        if self._evidence_rows is None:
+            self._evidence_rows = np.array(
+                list(map(self.node_index.get, self.evidence_ids.tolist(), repeat(-1))),
+                dtype=np.int64
+            )
+        return self._evidence_rows
+    
+    def nodes(self) -> List[LogicNode]:
+        """Materialize every node as a `LogicNode`."""
+        return [view.materialize() for view in self]
+
+
+@dataclass(frozen=True, slots=True)
 class ValidationResult:
     """Result of Hamiltonian validation"""
     is_valid: bool
@@ -59,32 +405,727 @@ class ValidationResult:
     energy_level: float
     violations: List[str]
     trace_hash: str
+    trace_hash_version: str = "sha256/1"
+
+
+# Trace hash formats, recorded in `ValidationResult.trace_hash_version`:
+# "sha256/1" is the first 16 hex digits of SHA-256 over the "|"-joined
+# "node_id:proposition:truth_value" fields (streamed, never joined);
+# "merkle-sha256/1" is the full hex root of a Merkle tree with one leaf
+# per node over the same field strings.
+TRACE_HASH_VERSIONS = {"stream": "sha256/1", "merkle": "merkle-sha256/1"}
+
+# Nodes formatted per hasher update when streaming the trace hash
+_TRACE_CHUNK_NODES = 4096
+
+
+def _trace_field(node_id, proposition, truth_value) -> str:
+    """The string a node contributes to its chain's trace hash."""
+    return f"{node_id}:{proposition}:{truth_value}"
+
+
+def _trace_leaf(node_id, proposition, truth_value) -> bytes:
+    """Merkle leaf hash of one node's trace field."""
+    return hashlib.sha256(LEAF_PREFIX + _trace_field(node_id, proposition, truth_value).encode()).digest()
+
+
+# Smallest lattice for which index="auto" uses the KD-tree, keyed by the
+# largest dimension it applies to. Above 8 dimensions the brute-force scan
+# wins at every size measured by `python axiom_bench.py`.
+KDTREE_AUTO_MIN_STATES = {4: 4096, 8: 16384}
+
+
+def _euclidean(coords: np.ndarray, point: np.ndarray) -> np.ndarray:
+    """
+    Euclidean distance from point(s) to every row of coords.
+    
+    Accepts a single vector or a (rows x dim) block, returning (n,) or
+    (rows x n) distances. Each pair is reduced with a per-row dot product
+    (the same kernel `np.linalg.norm` uses), so results are bit-identical
+    to `StateVector.distance_to`.
+    """
+    if point.ndim == 2:
+        diff = coords[None, :, :] - point[:, None, :]
+    else:
+        diff = coords - point
+    return np.sqrt(np.matmul(diff[..., None, :], diff[..., :, None])[..., 0, 0])
+
+
+class _KDTree:
+    """
+    Pure-NumPy KD-tree over lattice coordinates.
+    
+    Answers "every state within radius, plus the k nearest" by seeding a
+    search bound from the leaf that contains the query, then pruning with
+    vectorized bounding-box tests: first over a mid-level cut of the tree,
+    then over the leaves below the surviving cut nodes. States appended
+    after the build are kept in a pending tail that is scanned brute force
+    until the tree is rebuilt.
+    """
+    
+    def __init__(self, coords: np.ndarray, leaf_size: int = 64):
+        """Build the tree over the rows of coords."""
+        n_points = coords.shape[0]
+        self.n_indexed = n_points
+        self.perm = np.arange(n_points)
+        
+        # Nodes are created in depth-first order, so the leaves under any
+        # node form a contiguous run of leaf ids.
+        nodes = []
+        stack = [(0, n_points, -1, 0, 0)]
+        while stack:
+            start, end, parent, side, depth = stack.pop()
+            node = len(nodes)
+            if parent >= 0:
+                nodes[parent]["children"][side] = node
+            
+            rows = self.perm[start:end]
+            points = coords[rows]
+            low, high = points.min(axis=0), points.max(axis=0)
+            nodes.append({
+                "start": start, "end": end, "low": low, "high": high,
+                "depth": depth, "children": [-1, -1], "split": (0, 0.0)
+            })
+            
+            spread = high - low
+            split_dim = int(np.argmax(spread))
+            if end - start <= leaf_size or spread[split_dim] == 0:
+                continue
+            
+            mid = (start + end) // 2
+            part = np.argpartition(points[:, split_dim], mid - start)
+            self.perm[start:end] = rows[part]
+            nodes[node]["split"] = (split_dim, float(points[part[mid - start], split_dim]))
+            stack.append((mid, end, node, 1, depth + 1))
+            stack.append((start, mid, node, 0, depth + 1))
+        
+        leaf_of = {}
+        for node, info in enumerate(nodes):
+            if info["children"][0] < 0:
+                leaf_of[node] = len(leaf_of)
+        leaf_span = [None] * len(nodes)
+        for node in range(len(nodes) - 1, -1, -1):
+            left, right = nodes[node]["children"]
+            if left < 0:
+                leaf_span[node] = (leaf_of[node], leaf_of[node] + 1)
+            else:
+                leaf_span[node] = (leaf_span[left][0], leaf_span[right][1])
+        
+        leaves = [nodes[node] for node in leaf_of]
+        self.leaf_starts = np.array([leaf["start"] for leaf in leaves], dtype=np.int64)
+        self.leaf_ends = np.array([leaf["end"] for leaf in leaves], dtype=np.int64)
+        self.leaf_lows = np.array([leaf["low"] for leaf in leaves])
+        self.leaf_highs = np.array([leaf["high"] for leaf in leaves])
+        
+        cut_depth = int(np.log2(max(len(leaves), 1)) // 2)
+        cut = [
+            node for node, info in enumerate(nodes)
+            if info["depth"] == cut_depth or (info["depth"] < cut_depth and node in leaf_of)
+        ]
+        self.cut_lows = np.array([nodes[node]["low"] for node in cut])
+        self.cut_highs = np.array([nodes[node]["high"] for node in cut])
+        self.cut_leaf_first = np.array([leaf_span[node][0] for node in cut], dtype=np.int64)
+        self.cut_leaf_count = np.array([leaf_span[node][1] - leaf_span[node][0] for node in cut], dtype=np.int64)
+        
+        self._descent = [
+            (info["children"][0], info["children"][1]) + info["split"] + (leaf_of.get(node, -1),)
+            for node, info in enumerate(nodes)
+        ]
+    
+    def needs_rebuild(self, n_states: int) -> bool:
+        """True once the pending tail outgrows a quarter of the tree."""
+        return n_states < self.n_indexed or n_states - self.n_indexed > max(64, self.n_indexed // 4)
+    
+    @staticmethod
+    def _ranges(firsts: np.ndarray, counts: np.ndarray) -> np.ndarray:
+        """Concatenate the integer ranges [first, first + count)."""
+        offsets = np.repeat(firsts - np.cumsum(counts) + counts, counts)
+        return offsets + np.arange(offsets.shape[0])
+    
+    @staticmethod
+    def _box_gap(lows: np.ndarray, highs: np.ndarray, point: np.ndarray) -> np.ndarray:
+        """Squared distance from point to each bounding box."""
+        gap = np.maximum(lows - point, 0) + np.maximum(point - highs, 0)
+        return (gap * gap).sum(axis=1)
+    
+    def query(
+        self,
+        coords: np.ndarray,
+        point: np.ndarray,
+        radius: float,
+        k: int
+    ) -> Tuple[np.ndarray, np.ndarray]:
+        """
+        Candidate states for a fold query.
+        
+        Returns (distances, indices) with indices ascending. The set contains
+        every state within `radius` and every state at or below the k-th
+        nearest distance, so fold resolution over it matches a full scan.
+        """
+        if point.shape != coords.shape[1:]:
+            point = np.broadcast_to(point, coords.shape[1:])
+        if not np.isfinite(point).all():
+            return _euclidean(coords, point), np.arange(coords.shape[0])
+        
+        # Seed the bound with the leaf containing the point and the pending tail
+        left, right, split_dim, split_value, seed_leaf = self._descent[0]
+        while left >= 0:
+            node = left if point[split_dim] < split_value else right
+            left, right, split_dim, split_value, seed_leaf = self._descent[node]
+        seed = self.perm[self.leaf_starts[seed_leaf]:self.leaf_ends[seed_leaf]]
+        if coords.shape[0] > self.n_indexed:
+            seed = np.concatenate((seed, np.arange(self.n_indexed, coords.shape[0])))
+        seed_distance = _euclidean(coords[seed], point)
+        kth = float('inf')
+        if len(seed_distance) >= k:
+            kth = float(np.partition(seed_distance, k - 1)[k - 1])
+        # Slack keeps the prune conservative against rounding in the box bound
+        bound = max(radius, kth) * (1 + 1e-9)
+        bound_sq = bound * bound
+        
+        cut = np.flatnonzero(self._box_gap(self.cut_lows, self.cut_highs, point) <= bound_sq)
+        leaves = self._ranges(self.cut_leaf_first[cut], self.cut_leaf_count[cut])
+        gaps = self._box_gap(self.leaf_lows[leaves], self.leaf_highs[leaves], point)
+        leaves = leaves[(gaps <= bound_sq) & (leaves != seed_leaf)]
+        rows = self.perm[self._ranges(
+            self.leaf_starts[leaves],
+            self.leaf_ends[leaves] - self.leaf_starts[leaves]
+        )]
+        
+        index = np.concatenate((seed, rows))
+        distances = np.concatenate((seed_distance, _euclidean(coords[rows], point)))
+        order = np.argsort(index)
+        return distances[order], index[order]
+
+
+# Largest lattice (in state pairs) whose minimum separation is measured in
+# the background after a bulk change; above it the tie scan is never skipped
+# unless the separation was tracked as states were added one at a time.
+SEPARATION_MAX_PAIRS = 1 << 24
+
+# Lattices up to this many state pairs are measured on publish; starting a
+# background thread would cost more than the scan itself
+_SEPARATION_INLINE_PAIRS = 1 << 12
+
+# Relative slack on the separation test, covering rounding in the distances
+_SEPARATION_SLACK = 1 + 1e-9
+
+
+def _min_separation(
+    coords: np.ndarray,
+    start: int = 0,
+    max_chunk_bytes: int = 64 * 1024 * 1024,
+    stop: Optional[Callable[[], bool]] = None
+) -> Optional[float]:
+    """
+    Smallest distance between row j >= start and any earlier row of coords.
+    
+    With start=0 this is the minimum pairwise separation of the whole set
+    (inf for fewer than two rows). NaN coordinates make the result NaN.
+    If `stop` returns True between chunks the scan is abandoned and None
+    is returned.
+    """
+    n_rows, dim = coords.shape
+    start = max(start, 1)
+    separation = float('inf')
+    if start >= n_rows:
+        return separation
+    chunk_rows = max(1, max_chunk_bytes // max(1, n_rows * dim * 8))
+    for first in range(start, n_rows, chunk_rows):
+        if stop is not None and stop():
+            return None
+        stop_row = min(first + chunk_rows, n_rows)
+        block = _euclidean(coords[:stop_row], coords[first:stop_row])
+        block[np.arange(stop_row)[None, :] >= np.arange(first, stop_row)[:, None]] = float('inf')
+        separation = float(np.min(np.append(block.reshape(-1), separation)))
+    return separation
+
+
+def _extends(snapshot: "LatticeSnapshot", earlier: "LatticeSnapshot") -> bool:
+    """Whether `snapshot` holds the states of `earlier`, in place, plus any appended since."""
+    return snapshot._buffer is earlier._buffer and snapshot.n_states >= earlier.n_states
+
+
+class _SeparationTracker:
+    """
+    Measures lattice minimum separations on a background thread.
+    
+    Folds never pay for the O(n^2) scan: until a snapshot's separation is
+    known they simply run the exact tie scan. Only the latest request is
+    kept, a measurement is abandoned once the lattice stops extending the
+    snapshot being measured, and a finished one is carried forward to
+    states appended meanwhile.
+    """
+    
+    def __init__(self, current: Callable[[], "LatticeSnapshot"]):
+        """
+        Args:
+            current: Returns the lattice's currently published snapshot
+        """
+        self._current = current
+        self._lock = threading.Lock()
+        self._pending: Optional[Tuple["LatticeSnapshot", float, int]] = None
+        self._active: Optional["LatticeSnapshot"] = None
+        self._thread: Optional[threading.Thread] = None
+    
+    def measure(self, snapshot: "LatticeSnapshot", base: Optional[float] = None, start: int = 0) -> None:
+        """
+        Measure `snapshot` in the background (inline if tiny, not at all if too large).
+        
+        Args:
+            snapshot: Freshly published snapshot
+            base: Known separation of its first `start` rows (None if unknown)
+            start: Rows before this were already measured as `base`
+        """
+        if base is None:
+            base, start = float('inf'), 0
+        n = snapshot.n_states
+        pairs = n * (n - 1) // 2 - start * (start - 1) // 2
+        if pairs > SEPARATION_MAX_PAIRS:
+            return
+        if pairs <= _SEPARATION_INLINE_PAIRS:
+            snapshot._separation = float(np.min([base, _min_separation(snapshot._coords, start)]))
+            return
+        with self._lock:
+            covered = self._pending[0] if self._pending is not None else self._active
+            if start == 0 and covered is not None and _extends(snapshot, covered):
+                # The running measurement is carried forward on completion
+                return
+            self._pending = (snapshot, base, start)
+            if self._thread is None or not self._thread.is_alive():
+                self._thread = threading.Thread(target=self._run, name="lattice-separation", daemon=True)
+                self._thread.start()
+    
+    def _run(self) -> None:
+        while True:
+            with self._lock:
+                job, self._pending = self._pending, None
+                if job is None:
+                    self._thread = None
+                    return
+                self._active = job[0]
+            
+            snapshot, base, start = job
+            separation = _min_separation(
+                snapshot._coords, start, stop=lambda: not _extends(self._current(), snapshot)
+            )
+            if separation is not None:
+                snapshot._separation = float(np.min([base, separation]))
+            
+            with self._lock:
+                self._active = None
+                current = self._current()
+                if separation is not None and current._separation is None and _extends(current, snapshot):
+                    if current.n_states == snapshot.n_states:
+                        current._separation = snapshot._separation
+                    else:
+                        self._pending = (current, snapshot._separation, snapshot.n_states)
+
+
+# Reduced-precision scan: unit roundoff and half the smallest subnormal of
+# each storage type. Distances are always accumulated in float32.
+_PRECISION_ROUNDING = {
+    "float32": (2.0 ** -24, 2.0 ** -150),
+    "float16": (2.0 ** -11, 2.0 ** -25),
+}
+# Row norms above this could overflow float32 squares; such scans run exact
+_LOW_PRECISION_MAX_NORM = 1e18
+
+
+# On-disk lattice format: a fixed header, a page-aligned little-endian
+# float64 coordinate block (mappable with np.memmap), then a label table of
+# (n_states + 1) uint64 offsets followed by the UTF-8 label bytes. Per-state
+# metadata and engine settings live in a JSON sidecar next to the file.
+LATTICE_MAGIC = b"AXLATTIC"
+LATTICE_FORMAT_VERSION = 1
+_LATTICE_HEADER = struct.Struct("<8sIIQQQQQ")
+_LATTICE_ALIGN = 4096
+
+
+def _lattice_sidecar(path: str) -> str:
+    """Path of the JSON sidecar for a lattice file."""
+    return path + ".json"
+
+
+def _coords_bytes(coords: np.ndarray) -> memoryview:
+    """Little-endian float64 bytes of a coordinate block, without copying."""
+    flat = np.ascontiguousarray(coords, dtype="<f8").reshape(-1)
+    return memoryview(flat).cast("B") if flat.size else memoryview(b"")
+
+
+def _label_table(labels: List[str]) -> bytes:
+    """Encode labels as uint64 offsets followed by UTF-8 bytes."""
+    encoded = [label.encode("utf-8") for label in labels]
+    offsets = np.zeros(len(encoded) + 1, dtype="<u8")
+    np.cumsum([len(e) for e in encoded], out=offsets[1:])
+    return offsets.tobytes() + b"".join(encoded)
+
+
+def _decode_label_table(table: bytes, n_states: int) -> List[str]:
+    """Inverse of `_label_table`."""
+    offsets = np.frombuffer(table, dtype="<u8", count=n_states + 1)
+    blob = table[offsets.nbytes:]
+    return [
+        blob[start:end].decode("utf-8")
+        for start, end in zip(offsets[:-1].tolist(), offsets[1:].tolist())
+    ]
+
+
+class _LRUCache:
+    """
+    Bounded LRU map for fold results with hit, miss and eviction counters.
+    
+    Entries belong to one lattice generation; the first lookup under a new
+    generation drops them all.
+    """
+    
+    def __init__(self, capacity: int):
+        """Create an empty cache holding at most `capacity` entries."""
+        self.capacity = capacity
+        self._entries: OrderedDict = OrderedDict()
+        self._generation = 0
+        self._lock = threading.Lock()
+        self.hits = 0
+        self.misses = 0
+        self.evictions = 0
+        self.invalidations = 0
+    
+    def get(self, key, generation: int):
+        """Cached value for key, or None on a miss."""
+        with self._lock:
+            if generation != self._generation:
+                self._reset(generation)
+            value = self._entries.get(key)
+            if value is None:
+                self.misses += 1
+                return None
+            self._entries.move_to_end(key)
+            self.hits += 1
+            return value
+    
+    def put(self, key, value, generation: int) -> None:
+        """Store a value computed under the given lattice generation."""
+        with self._lock:
+            if generation != self._generation:
+                # The lattice changed while this value was being computed
+                return
+            self._entries[key] = value
+            self._entries.move_to_end(key)
+            if len(self._entries) > self.capacity:
+                self._entries.popitem(last=False)
+                self.evictions += 1
+    
+    def _reset(self, generation: int) -> None:
+        """Drop every entry and adopt the new generation."""
+        if self._entries:
+            self.invalidations += 1
+        self._entries.clear()
+        self._generation = generation
+    
+    def info(self) -> Dict[str, int]:
+        """Snapshot of the cache counters."""
+        with self._lock:
+            return {
+                "hits": self.hits,
+                "misses": self.misses,
+                "evictions": self.evictions,
+                "invalidations": self.invalidations,
+                "size": len(self._entries),
+                "capacity": self.capacity,
+            }
+
+
+class LatticeSnapshot:
+    """
+    Immutable, versioned state of a lattice.
+    
+    Lattice mutations never modify a published snapshot: they build a new
+    one and publish it with a single reference swap, so readers take no
+    lock and a fold finishes on the snapshot it started with. Appends share
+    the previous snapshot's buffers, since a snapshot only reads its first
+    `n_states` rows and rows past them are only written by the next append;
+    removals, coordinate updates and replacements copy.
+    
+    Derived facts (content hash, label ranks, the reduced-precision copy
+    and the KD-tree) are filled in lazily. They depend only on the
+    snapshot's contents, so readers racing to compute one store the same
+    value. The minimum separation is the exception: folds never compute
+    it, it is measured in the background when the snapshot is published.
+    """
+    
+    def __init__(
+        self,
+        coords: np.ndarray,
+        labels: np.ndarray,
+        metadata: List[Dict],
+        label_index: Dict[str, int],
+        n_states: int,
+        version: int
+    ):
+        """
+        Wrap lattice buffers, of which the first `n_states` rows are live.
+        
+        Args:
+            coords: Row-major float64 coordinate buffer
+            labels: Object array of state labels, parallel to `coords`
+            metadata: Per-state metadata dicts, parallel to `coords`
+            label_index: Row of each label (may also hold later appends)
+            n_states: Number of states in this snapshot
+            version: Lattice version this snapshot publishes
+        """
+        self.n_states = n_states
+        self.version = version
+        self._buffer = coords
+        self._label_buffer = labels
+        self._metadata = metadata
+        self._label_index = label_index
+        self._coords = coords[:n_states]
+        self._coords.flags.writeable = False
+        self._labels = labels[:n_states]
+        self._labels.flags.writeable = False
+        
+        # Derived lattice facts, None until computed
+        self._content_hash: Optional[str] = None
+        self._separation: Optional[float] = None
+        # Lower bound on the separation, known while it is being measured
+        self._separation_floor: Optional[float] = None
+        self._label_rank: Optional[np.ndarray] = None
+        self._sorted_labels: Optional[List[str]] = None
+        self._low_coords: Dict[str, Tuple[Optional[np.ndarray], float]] = {}
+        self._tree: Optional[_KDTree] = None
+    
+    @classmethod
+    def empty(cls) -> "LatticeSnapshot":
+        """Version 0: a lattice without states."""
+        snapshot = cls(np.empty((0, 0), dtype=np.float64), np.empty(0, dtype=object), [], {}, 0, 0)
+        snapshot._separation = float('inf')
+        return snapshot
+    
+    def __len__(self) -> int:
+        return self.n_states
+    
+    def __repr__(self) -> str:
+        return f"LatticeSnapshot(version={self.version}, n_states={self.n_states}, dim={self.dim})"
+    
+    @property
+    def dim(self) -> int:
+        """Dimension of the lattice (0 while the lattice is empty)."""
+        return self._coords.shape[1] if self.n_states else 0
+    
+    @property
+    def coordinates(self) -> np.ndarray:
+        """Read-only (n_states x dim) coordinate matrix."""
+        return self._coords
+    
+    @property
+    def labels(self) -> List[str]:
+        """State labels in row order."""
+        return self._labels.tolist()
+    
+    @property
+    def metadata(self) -> List[Dict]:
+        """Per-state metadata in row order."""
+        return self._metadata[:self.n_states]
+    
+    def state_index(self, label: str) -> int:
+        """Row index of the state with the given label."""
+        index = self._label_index.get(label, -1)
+        if not 0 <= index < self.n_states:
+            raise KeyError(f"Unknown state label: {label}")
+        return index
+    
+    def __contains__(self, label: str) -> bool:
+        return 0 <= self._label_index.get(label, -1) < self.n_states
+    
+    @property
+    def content_hash(self) -> str:
+        """SHA-256 content hash (coordinates and labels), as in the lattice file."""
+        if self._content_hash is None:
+            digest = hashlib.sha256(LATTICE_MAGIC)
+            digest.update(struct.pack("<IQQ", LATTICE_FORMAT_VERSION, self.n_states, self.dim))
+            digest.update(_coords_bytes(self._coords))
+            digest.update(_label_table(self.labels))
+            self._content_hash = digest.hexdigest()
+        return self._content_hash
+    
+    @property
+    def min_separation(self) -> float:
+        """
+        Smallest distance between two states (inf below two states).
+        
+        Measured here, synchronously, if the background measurement has
+        not finished yet.
+        """
+        if self._separation is None:
+            self._separation = _min_separation(self._coords)
+        return self._separation
+    
+    def _known_separation(self) -> Optional[float]:
+        """The separation if measured, else a lower bound on it if one is known."""
+        return self._separation if self._separation is not None else self._separation_floor
+    
+    @property
+    def label_rank(self) -> np.ndarray:
+        """Lexicographic rank of each state label, by row."""
+        if self._label_rank is None:
+            labels = self.labels
+            order = sorted(range(self.n_states), key=labels.__getitem__)
+            rank = np.empty(self.n_states, dtype=np.int64)
+            rank[order] = np.arange(self.n_states)
+            self._sorted_labels = [labels[i] for i in order]
+            self._label_rank = rank
+        return self._label_rank
+    
+    def _appended(self, coords: np.ndarray, labels: List[str], metadata: List[Dict]) -> "LatticeSnapshot":
+        """
+        Next version with states appended, sharing this snapshot's buffers.
+        
+        Callers validate first and hold the lattice's write lock. For a
+        single new state a known minimum separation and known label ranks
+        are updated in place (larger appends leave the separation to the
+        background tracker), and the KD-tree is kept (new rows sit in its
+        pending tail).
+        """
+        start, n_new = self.n_states, coords.shape[0]
+        n_states = start + n_new
+        buffer, label_buffer = self._buffer, self._label_buffer
+        if n_states > buffer.shape[0] or buffer.shape[1] != coords.shape[1] or not buffer.flags.writeable:
+            capacity = max(n_states, 2 * buffer.shape[0], 16)
+            buffer = np.empty((capacity, coords.shape[1]), dtype=np.float64)
+            label_buffer = np.empty(capacity, dtype=object)
+            if start:
+                buffer[:start] = self._coords
+                label_buffer[:start] = self._labels
+        
+        # Entries past `start` belong to no published snapshot
+        buffer[start:n_states] = coords
+        label_buffer[start:n_states] = labels
+        del self._metadata[start:]
+        self._metadata.extend(metadata)
+        self._label_index.update(zip(labels, range(start, n_states)))
+        
+        snapshot = LatticeSnapshot(
+            buffer, label_buffer, self._metadata, self._label_index, n_states, self.version + 1
+        )
+        if self._separation is not None and n_new == 1:
+            added = _min_separation(snapshot._coords, start)
+            snapshot._separation = float(np.min([self._separation, added]))
+        if self._label_rank is not None and n_new == 1:
+            position = bisect.bisect_left(self._sorted_labels, labels[0])
+            rank = self._label_rank
+            snapshot._label_rank = np.append(np.where(rank >= position, rank + 1, rank), position)
+            snapshot._sorted_labels = self._sorted_labels[:position] + [labels[0]] + self._sorted_labels[position:]
+        snapshot._tree = self._tree
+        return snapshot
 
 
 class VectorConstrainedSingularity:
     """
     The Fold: Maps continuous inputs to discrete valid states.
     Production-ready implementation with comprehensive error handling.
+    
+    The lattice is stored as one contiguous (n_states x dim) float64 matrix
+    with parallel label and metadata arrays, so a fold is a single
+    vectorized distance pass instead of a Python loop over states.
+    
+    The lattice is published as immutable `LatticeSnapshot`s: every
+    mutation builds the next version and swaps it in atomically, so folds
+    never lock and always see one consistent version, while concurrent
+    mutations are serialized by a writer lock.
     """
     
     def __init__(
         self,
         threshold: float = 0.05,
         max_states: int = 10000,
-        tie_break_strategy: str = "lexicographic"
+        tie_break_strategy: str = "lexicographic",
+        index: str = "auto",
+        cache_size: int = 0,
+        precision: str = "float64"
     ):
         """
         Initialize VCS engine.
         
         Args:
             threshold: Maximum allowed distance for state acceptance
-            max_states: Maximum number of valid states
+            max_states: Maximum number of valid states. Storage grows with
+                the lattice rather than being sized by this cap, so it can
+                be raised freely for large deployments.
             tie_break_strategy: How to handle equidistant states
+            index: Nearest-state search method: "brute" scans every state,
+                "kdtree" uses a KD-tree over the lattice, "auto" picks the
+                KD-tree for large, low-dimensional lattices
+            cache_size: Number of fold results to keep in an LRU cache
+                keyed by the raw input bytes (0 disables caching)
+            precision: "float64", or "float32"/"float16" to scan a reduced-
+                precision copy of the lattice for candidates first; only the
+                candidates are re-measured in float64, so outputs are unchanged
         """
+        if index not in ("auto", "brute", "kdtree"):
+            raise ValueError(f"Unknown index method: {index}")
+        if precision not in ("float64",) + tuple(_PRECISION_ROUNDING):
+            raise ValueError(f"Unknown precision: {precision}")
+        
         self.threshold = threshold
-        self.max_states = max_states
+        self._max_states = max_states
         self.tie_break_strategy = tie_break_strategy
-        self.valid_states: List[StateVector] = []
+        self.index = index
+        self.precision = precision
+        # Instrumentation hook (see axiom_metrics.MetricsHook); None disables it
+        self.metrics = None
+        self._cache = _LRUCache(cache_size) if cache_size > 0 else None
+        
+        # Readers load `_snapshot` once per call; writers hold `_write_lock`
+        self._snapshot = LatticeSnapshot.empty()
+        self._write_lock = threading.Lock()
+        self._separations = _SeparationTracker(lambda: self._snapshot)
+    
+    @property
+    def snapshot(self) -> LatticeSnapshot:
+        """The current lattice version. Pass it to `fold`/`fold_batch` to pin one."""
+        return self._snapshot
+    
+    @property
+    def max_states(self) -> int:
+        """Maximum number of valid states the lattice may hold."""
+        return self._max_states
+    
+    @max_states.setter
+    def max_states(self, value: int) -> None:
+        with self._write_lock:
+            if value < self._snapshot.n_states:
+                raise ValueError(
+                    f"max_states={value} is below the current lattice size {self._snapshot.n_states}"
+                )
+            self._max_states = value
+    
+    @property
+    def dim(self) -> int:
+        """Dimension of the lattice (0 while the lattice is empty)."""
+        return self._snapshot.dim
+    
+    @property
+    def coordinates(self) -> np.ndarray:
+        """Read-only (n_states x dim) view of the lattice coordinates."""
+        return self._snapshot.coordinates
+    
+    @property
+    def labels(self) -> List[str]:
+        """State labels in insertion order."""
+        return self._snapshot.labels
+    
+    @property
+    def valid_states(self) -> List[StateVector]:
+        """Lattice states as `StateVector` views over the coordinate matrix."""
+        snapshot = self._snapshot
+        return [
+            StateVector(
+                coordinates=snapshot._coords[i],
+                label=snapshot._labels[i],
+                metadata=snapshot._metadata[i]
+            )
+            for i in range(snapshot.n_states)
+        ]
     
     def define_invariant(
         self, 
@@ -93,33 +1134,486 @@ class VectorConstrainedSingularity:
         metadata: Optional[Dict] = None
     ) -> None:
         """Add a valid state to the lattice."""
-        if len(self.valid_states) >= self.max_states:
-            raise ValueError(f"Cannot exceed {self.max_states} states")
+        coords = np.array(coordinates, dtype=np.float64)
+        if coords.ndim != 1:
+            raise ValueError("State coordinates must be a one-dimensional vector")
+        
+        with self._write_lock:
+            snapshot = self._snapshot
+            if snapshot.n_states >= self.max_states:
+                raise ValueError(f"Cannot exceed {self.max_states} states")
+                
+            if label in snapshot:
+                raise ValueError(f"Duplicate state label: {label}")
+            
+            if snapshot.n_states and coords.shape[0] != snapshot.dim:
+                raise ValueError(
+                    f"State dimension {coords.shape[0]} does not match "
+                    f"lattice dimension {snapshot.dim}"
+                )
+            
+            self._publish(
+                snapshot._appended(coords[None, :], [label], [metadata or {}]),
+                snapshot._separation,
+                snapshot.n_states
+            )
+    
+    def define_invariants(
+        self,
+        coords_array: np.ndarray,
+        labels: List[str],
+        metadata: Optional[List[Optional[Dict]]] = None
+    ) -> None:
+        """
+        Add many valid states to the lattice at once.
+        
+        Equivalent to calling `define_invariant` for each row, but validates
+        the whole batch up front (dimension, `max_states`, duplicate labels
+        within the batch and against the lattice), copies the coordinates in
+        one block and publishes a single new version. Nothing is added if
+        validation fails.
+        """
+        coords, labels = self._bulk_states(coords_array, labels, metadata)
+        with self._write_lock:
+            snapshot = self._snapshot
+            n_new = coords.shape[0]
+            if snapshot.n_states + n_new > self.max_states:
+                raise ValueError(f"Cannot exceed {self.max_states} states")
+            if snapshot.n_states and coords.shape[1] != snapshot.dim:
+                raise ValueError(
+                    f"State dimension {coords.shape[1]} does not match "
+                    f"lattice dimension {snapshot.dim}"
+                )
+            clashes = [label for label in labels if label in snapshot]
+            if clashes:
+                raise ValueError(f"Duplicate state label: {clashes[0]}")
+            
+            if n_new == 0:
+                return
+            
+            self._publish(
+                snapshot._appended(
+                    coords,
+                    labels,
+                    [{} for _ in range(n_new)] if metadata is None else [m or {} for m in metadata]
+                ),
+                snapshot._separation,
+                snapshot.n_states
+            )
+    
+    @staticmethod
+    def _bulk_states(
+        coords_array: np.ndarray,
+        labels: List[str],
+        metadata: Optional[List[Optional[Dict]]]
+    ) -> Tuple[np.ndarray, List[str]]:
+        """Check the shapes of a bulk state batch and that its labels are unique."""
+        coords = np.asarray(coords_array, dtype=np.float64)
+        if coords.ndim != 2:
+            raise ValueError("Bulk state coordinates must be a two-dimensional array")
+        labels = labels.tolist() if isinstance(labels, np.ndarray) else list(labels)
+        
+        n_new = coords.shape[0]
+        if len(labels) != n_new:
+            raise ValueError(f"Got {len(labels)} labels for {n_new} states")
+        if metadata is not None and len(metadata) != n_new:
+            raise ValueError(f"Got {len(metadata)} metadata entries for {n_new} states")
+        
+        if len(set(labels)) != n_new:
+            seen = set()
+            duplicate = next(label for label in labels if label in seen or seen.add(label))
+            raise ValueError(f"Duplicate state label: {duplicate}")
+        return coords, labels
+    
+    def remove_invariant(self, label: str) -> None:
+        """Remove a valid state from the lattice."""
+        self.remove_invariants([label])
+    
+    def remove_invariants(self, labels: List[str]) -> None:
+        """
+        Remove several valid states as one new lattice version.
+        
+        Remaining states keep their relative order. Nothing is removed if
+        any label is unknown.
+        """
+        with self._write_lock:
+            snapshot = self._snapshot
+            rows = [snapshot.state_index(label) for label in labels]
+            if not rows:
+                return
+            keep = np.ones(snapshot.n_states, dtype=bool)
+            keep[rows] = False
+            kept = np.flatnonzero(keep)
+            updated = self._rebuilt(
+                snapshot,
+                snapshot._coords[kept],
+                snapshot._labels[kept],
+                [snapshot._metadata[i] for i in kept.tolist()]
+            )
+            # Removing states never brings the rest closer together
+            updated._separation_floor = snapshot._known_separation()
+            self._publish(updated)
+    
+    def update_invariant(
+        self,
+        label: str,
+        coordinates: Optional[List[float]] = None,
+        metadata: Optional[Dict] = None
+    ) -> None:
+        """
+        Move a valid state and/or replace its metadata, as one new version.
+        
+        A metadata-only update shares the coordinate buffer and every
+        derived lattice fact with the previous version.
+        """
+        with self._write_lock:
+            snapshot = self._snapshot
+            row = snapshot.state_index(label)
+            state_metadata = snapshot.metadata
+            if metadata is not None:
+                state_metadata[row] = metadata
             
-        if any(s.label == label for s in self.valid_states):
-            raise ValueError(f"Duplicate state label: {label}")
+            if coordinates is None:
+                updated = LatticeSnapshot(
+                    snapshot._buffer, snapshot._label_buffer, state_metadata,
+                    snapshot._label_index, snapshot.n_states, snapshot.version + 1
+                )
+                updated._content_hash = snapshot._content_hash
+                updated._separation = snapshot._separation
+                updated._separation_floor = snapshot._separation_floor
+                updated._label_rank = snapshot._label_rank
+                updated._sorted_labels = snapshot._sorted_labels
+                updated._low_coords = snapshot._low_coords
+                updated._tree = snapshot._tree
+                self._publish(updated)
+                return
             
-        state = StateVector(
-            coordinates=np.array(coordinates, dtype=np.float64),
-            label=label,
-            metadata=metadata or {}
+            coords = np.array(coordinates, dtype=np.float64)
+            if coords.shape != (snapshot.dim,):
+                raise ValueError(
+                    f"State dimension {coords.reshape(-1).shape[0]} does not match "
+                    f"lattice dimension {snapshot.dim}"
+                )
+            moved = np.array(snapshot._coords)
+            moved[row] = coords
+            updated = self._rebuilt(snapshot, moved, snapshot._labels.copy(), state_metadata)
+            updated._label_rank = snapshot._label_rank
+            updated._sorted_labels = snapshot._sorted_labels
+            # Pairs without the moved state keep their distances
+            known = snapshot._known_separation()
+            if known is not None and updated.n_states > 1:
+                distances = _euclidean(updated._coords, coords)
+                distances[row] = float('inf')
+                updated._separation_floor = float(np.min(np.append(distances, known)))
+            self._publish(updated)
+    
+    def replace_invariants(
+        self,
+        coords_array: np.ndarray,
+        labels: List[str],
+        metadata: Optional[List[Optional[Dict]]] = None
+    ) -> None:
+        """
+        Swap the whole lattice for a new set of states, as one new version.
+        
+        Validated like `define_invariants`; the dimension may change.
+        """
+        coords, labels = self._bulk_states(coords_array, labels, metadata)
+        if coords.shape[0] > self.max_states:
+            raise ValueError(f"Cannot exceed {self.max_states} states")
+        state_labels = np.empty(len(labels), dtype=object)
+        state_labels[:] = labels
+        with self._write_lock:
+            self._publish(self._rebuilt(
+                self._snapshot,
+                np.array(coords, dtype=np.float64),
+                state_labels,
+                [{} for _ in labels] if metadata is None else [m or {} for m in metadata]
+            ))
+    
+    @staticmethod
+    def _rebuilt(
+        previous: LatticeSnapshot,
+        coords: np.ndarray,
+        labels: np.ndarray,
+        metadata: List[Dict]
+    ) -> LatticeSnapshot:
+        """The version after `previous`, over freshly built (unshared) buffers."""
+        label_index = {label: i for i, label in enumerate(labels.tolist())}
+        return LatticeSnapshot(coords, labels, metadata, label_index, coords.shape[0], previous.version + 1)
+    
+    def _publish(
+        self,
+        snapshot: LatticeSnapshot,
+        base: Optional[float] = None,
+        start: int = 0
+    ) -> None:
+        """
+        Make `snapshot` the current version and measure its separation if unknown.
+        
+        Args:
+            snapshot: Next lattice version
+            base: Known separation of its first `start` rows, if any
+            start: Number of rows it shares with the previous version
+        """
+        self._snapshot = snapshot
+        if snapshot._separation is None:
+            self._separations.measure(snapshot, base, start)
+    
+    def state_index(self, label: str) -> int:
+        """Row index of the state with the given label."""
+        return self._snapshot.state_index(label)
+    
+    @property
+    def generation(self) -> int:
+        """Version of the current lattice snapshot, bumped by every lattice mutation."""
+        return self._snapshot.version
+    
+    @property
+    def min_separation(self) -> float:
+        """
+        Smallest distance between two lattice states (inf below two states).
+        
+        Tracked incrementally as states are added one at a time, and
+        measured in the background for lattices that were loaded, built in
+        bulk or edited; computed here if that has not finished yet.
+        """
+        return self._snapshot.min_separation
+    
+    def _needs_tie_scan(self, snapshot: LatticeSnapshot) -> bool:
+        """Whether a fold must look for several states within threshold."""
+        return (
+            self.tie_break_strategy in ("reject", "lexicographic")
+            and not self._unique_within_threshold(snapshot)
         )
-        self.valid_states.append(state)
     
-    def fold(self, input_vector: List[float]) -> QuantizationOutput:
-        """Quantize input to nearest valid state."""
+    def _unique_within_threshold(self, snapshot: LatticeSnapshot) -> bool:
+        """
+        True when no input can lie within threshold of two states.
+        
+        Holds whenever the states are more than 2 x threshold apart, by the
+        triangle inequality. Never measures anything: while the separation
+        is still being measured (or too large to measure, see
+        SEPARATION_MAX_PAIRS) only a known lower bound can vouch for it.
+        """
+        separation = snapshot._known_separation()
+        if separation is None:
+            return False
+        return separation > 2 * self.threshold * _SEPARATION_SLACK
+    
+    @property
+    def label_rank(self) -> np.ndarray:
+        """Lexicographic rank of each state label, by row."""
+        return self._snapshot.label_rank
+    
+    def cache_info(self) -> Dict[str, int]:
+        """Fold cache counters (all zero when caching is disabled)."""
+        if self._cache is None:
+            return {"hits": 0, "misses": 0, "evictions": 0, "invalidations": 0, "size": 0, "capacity": 0}
+        return self._cache.info()
+    
+    @property
+    def lattice_hash(self) -> str:
+        """
+        SHA-256 content hash of the lattice (coordinates and labels).
+        
+        Computed lazily and cached per snapshot; lattices opened with
+        `load` reuse the hash recorded when they were saved.
+        """
+        return self._snapshot.content_hash
+    
+    def save(self, path: str) -> str:
+        """
+        Write the lattice to `path` and its JSON sidecar to `path + ".json"`.
+        
+        Both files are written to temporaries and renamed into place.
+        Returns the lattice content hash.
+        """
+        snapshot = self._snapshot
+        n_states, dim = snapshot.n_states, snapshot.dim
+        labels = _label_table(snapshot.labels)
+        coords_offset = -(-_LATTICE_HEADER.size // _LATTICE_ALIGN) * _LATTICE_ALIGN
+        labels_offset = coords_offset + n_states * dim * 8
+        header = _LATTICE_HEADER.pack(
+            LATTICE_MAGIC, LATTICE_FORMAT_VERSION, 0,
+            n_states, dim, coords_offset, labels_offset, len(labels)
+        )
+        
+        tmp_path = path + ".tmp"
+        with open(tmp_path, "wb") as f:
+            f.write(header)
+            f.write(b"\0" * (coords_offset - len(header)))
+            f.write(_coords_bytes(snapshot.coordinates))
+            f.write(labels)
+            f.flush()
+            os.fsync(f.fileno())
+        
+        sidecar = {
+            "format": "axiom-lattice",
+            "version": LATTICE_FORMAT_VERSION,
+            "n_states": n_states,
+            "dim": dim,
+            "content_hash": snapshot.content_hash,
+            "threshold": self.threshold,
+            "max_states": self.max_states,
+            "tie_break_strategy": self.tie_break_strategy,
+            "index": self.index,
+            "metadata": snapshot.metadata,
+        }
+        tmp_sidecar = _lattice_sidecar(path) + ".tmp"
+        with open(tmp_sidecar, "w", encoding="utf-8") as f:
+            json.dump(sidecar, f)
+        
+        os.replace(tmp_path, path)
+        os.replace(tmp_sidecar, _lattice_sidecar(path))
+        return sidecar["content_hash"]
+    
+    @classmethod
+    def load(
+        cls,
+        path: str,
+        mmap: bool = True,
+        verify: bool = False,
+        **overrides
+    ) -> "VectorConstrainedSingularity":
+        """
+        Open a lattice written by `save`.
+        
+        With `mmap=True` the coordinate block is mapped read-only, so every
+        process opening the same file shares one page-cached copy; adding
+        states later copies it into private memory first. `verify=True`
+        recomputes the content hash instead of trusting the sidecar.
+        Keyword overrides replace the engine settings stored in the sidecar.
+        """
+        with open(_lattice_sidecar(path), encoding="utf-8") as f:
+            sidecar = json.load(f)
+        
+        with open(path, "rb") as f:
+            header = f.read(_LATTICE_HEADER.size)
+            if len(header) < _LATTICE_HEADER.size:
+                raise ValueError(f"Truncated lattice file: {path}")
+            (magic, version, _, n_states, dim,
+             coords_offset, labels_offset, labels_size) = _LATTICE_HEADER.unpack(header)
+            if magic != LATTICE_MAGIC:
+                raise ValueError(f"Not a lattice file: {path}")
+            if version != LATTICE_FORMAT_VERSION:
+                raise ValueError(f"Unsupported lattice format version {version}: {path}")
+            f.seek(labels_offset)
+            table = f.read(labels_size)
+        
+        if n_states != sidecar["n_states"] or dim != sidecar["dim"]:
+            raise ValueError(f"Lattice sidecar does not match {path}")
+        
+        labels = _decode_label_table(table, n_states)
+        
+        if n_states == 0:
+            coords = np.empty((0, dim), dtype=np.float64)
+        elif mmap:
+            coords = np.memmap(path, dtype="<f8", mode="r", offset=coords_offset, shape=(n_states, dim))
+        else:
+            coords = np.fromfile(path, dtype="<f8", count=n_states * dim, offset=coords_offset)
+            coords = coords.reshape(n_states, dim)
+        
+        settings = {
+            key: sidecar[key]
+            for key in ("threshold", "max_states", "tie_break_strategy", "index")
+        }
+        settings.update(overrides)
+        vcs = cls.from_arrays(coords, labels, sidecar["metadata"], **settings)
+        
+        if verify:
+            if vcs.lattice_hash != sidecar["content_hash"]:
+                raise ValueError(f"Lattice content hash mismatch: {path}")
+        else:
+            vcs._snapshot._content_hash = sidecar["content_hash"]
+        return vcs
+    
+    @classmethod
+    def from_arrays(
+        cls,
+        coords: np.ndarray,
+        labels: List[str],
+        metadata: Optional[List[Dict]] = None,
+        **settings
+    ) -> "VectorConstrainedSingularity":
+        """
+        Wrap an existing (n_states x dim) float64 coordinate array.
+        
+        The array is used in place rather than copied, so it may be a
+        read-only memory map or shared-memory buffer; adding states later
+        copies it into private memory first. Labels must be unique.
+        """
+        if coords.ndim != 2 or coords.dtype != np.float64:
+            raise ValueError("Lattice coordinates must be a two-dimensional float64 array")
+        if len(labels) != coords.shape[0]:
+            raise ValueError(f"Got {len(labels)} labels for {coords.shape[0]} states")
+        
+        vcs = cls(**settings)
+        n_states = coords.shape[0]
+        if n_states > vcs.max_states:
+            raise ValueError(f"Cannot exceed {vcs.max_states} states")
+        
+        label_index = {label: i for i, label in enumerate(labels)}
+        if len(label_index) != n_states:
+            raise ValueError("Duplicate state labels in lattice")
+        
+        state_labels = np.empty(n_states, dtype=object)
+        state_labels[:] = list(labels)
+        snapshot = LatticeSnapshot(
+            coords,
+            state_labels,
+            list(metadata) if metadata is not None else [{} for _ in range(n_states)],
+            label_index,
+            n_states,
+            0
+        )
+        vcs._publish(snapshot)
+        return vcs
+    
+    def fold(self, input_vector: List[float], snapshot: Optional[LatticeSnapshot] = None) -> QuantizationOutput:
+        """
+        Quantize input to nearest valid state.
+        
+        The fold runs against one lattice snapshot from start to finish:
+        `snapshot` if given, else the version current when the call began.
+        """
+        if snapshot is None:
+            snapshot = self._snapshot
         try:
             input_arr = np.array(input_vector, dtype=np.float64)
         except (ValueError, TypeError) as e:
-            return QuantizationOutput(
+            output = QuantizationOutput(
                 result=QuantizationResult.ERROR_INVALID_INPUT,
                 state_label=None,
                 residual_energy=float('inf'),
                 nearest_states=[],
                 input_hash=self._hash_input(input_vector)
             )
+        else:
+            output = self._fold_cached(input_arr, snapshot)
+        
+        if self.metrics is not None:
+            self.metrics.count_folds(output.result)
+        return output
+    
+    def _fold_cached(self, input_arr: np.ndarray, snapshot: LatticeSnapshot) -> QuantizationOutput:
+        """`_fold_array` through the LRU cache, when one is configured."""
+        cache = self._cache
+        if cache is None:
+            return self._fold_array(input_arr, snapshot)
         
-        if len(self.valid_states) == 0:
+        # Settings are part of the key so changing them never serves stale results
+        key = (input_arr.tobytes(), input_arr.shape, self.threshold, self.tie_break_strategy)
+        generation = snapshot.version
+        output = cache.get(key, generation)
+        if output is None:
+            output = self._fold_array(input_arr, snapshot)
+            cache.put(key, output, generation)
+        return replace(output, nearest_states=list(output.nearest_states))
+    
+    def _fold_array(self, input_arr: np.ndarray, snapshot: LatticeSnapshot) -> QuantizationOutput:
+        """Quantize an input that has already been converted to float64."""
+        if snapshot.n_states == 0:
             return QuantizationOutput(
                 result=QuantizationResult.REJECTED_OUT_OF_BOUNDS,
                 state_label=None,
@@ -128,56 +1622,446 @@ class VectorConstrainedSingularity:
                 input_hash=self._hash_input(input_arr)
             )
         
-        # Compute distances to all states
-        distances = [
-            (state.label, state.distance_to(input_arr))
-            for state in self.valid_states
-        ]
-        distances.sort(key=lambda x: x[1])
-        
-        min_distance = distances[0][1]
-        nearest_label = distances[0][0]
-        
-        # Check for within threshold
-        if min_distance > self.threshold:
+        if input_arr.shape not in ((), (1,), (snapshot.dim,)):
             return QuantizationOutput(
-                result=QuantizationResult.REJECTED_OUT_OF_BOUNDS,
+                result=QuantizationResult.ERROR_INVALID_INPUT,
                 state_label=None,
-                residual_energy=min_distance,
-                nearest_states=distances[:3],
+                residual_energy=float('inf'),
+                nearest_states=[],
                 input_hash=self._hash_input(input_arr)
             )
         
-        # Check for ties
-        ties = [d for d in distances if d[1] <= self.threshold]
-        
-        if len(ties) > 1:
-            if self.tie_break_strategy == "reject":
-                return QuantizationOutput(
-                    result=QuantizationResult.REJECTED_AMBIGUOUS,
-                    state_label=None,
-                    residual_energy=min_distance,
-                    nearest_states=ties,
-                    input_hash=self._hash_input(input_arr)
+        metrics = self.metrics
+        if metrics is not None:
+            start = perf_counter()
+        
+        # Compute distances to all candidate states in one pass
+        distances, index = self._scan(snapshot, input_arr)
+        if metrics is not None:
+            scanned = perf_counter()
+        result, state_index, residual, nearest, nearest_distance = self._resolve(snapshot, distances, index)
+        if metrics is not None:
+            resolved = perf_counter()
+        input_hash = self._hash_input(input_arr)
+        if metrics is not None:
+            metrics.observe_stage("scan", scanned - start)
+            metrics.observe_stage("resolve", resolved - scanned)
+            metrics.observe_stage("hash", perf_counter() - resolved)
+        
+        return QuantizationOutput(
+            result=result,
+            state_label=snapshot._labels[state_index] if state_index >= 0 else None,
+            residual_energy=residual,
+            nearest_states=self._pairs(snapshot, nearest, nearest_distance),
+            input_hash=input_hash
+        )
+    
+    def fold_batch(
+        self,
+        vectors: np.ndarray,
+        max_chunk_bytes: int = 64 * 1024 * 1024,
+        snapshot: Optional[LatticeSnapshot] = None
+    ) -> "QuantizationBatch":
+        """
+        Quantize an (N x D) array of inputs.
+        
+        Rows are processed in chunks sized so the intermediate
+        (rows x states x dim) difference block stays under
+        `max_chunk_bytes`. When a spatial index is active, rows are queried
+        through it one at a time instead. Row i of the result equals
+        `fold(vectors[i])`. Every row is folded against the same snapshot
+        (`snapshot` if given, else the current one), which the result keeps.
+        """
+        if snapshot is None:
+            snapshot = self._snapshot
+        try:
+            batch = np.ascontiguousarray(vectors, dtype=np.float64)
+        except (ValueError, TypeError) as e:
+            raise ValueError(f"Batch input must be a numeric (N x D) array: {e}")
+        if batch.ndim != 2:
+            raise ValueError(f"Batch input must be two-dimensional, got shape {batch.shape}")
+        
+        n_rows = batch.shape[0]
+        codes = np.empty(n_rows, dtype=np.int8)
+        label_index = np.full(n_rows, -1, dtype=np.int64)
+        residual = np.empty(n_rows, dtype=np.float64)
+        counts = np.zeros(n_rows, dtype=np.int64)
+        metrics = self.metrics
+        if metrics is not None:
+            hash_start = perf_counter()
+        hashes = self._hash_rows(batch)
+        if metrics is not None:
+            metrics.observe_stage("hash", perf_counter() - hash_start)
+        
+        if snapshot.n_states == 0 or batch.shape[1] not in (1, snapshot.dim):
+            invalid = snapshot.n_states > 0
+            codes[:] = RESULT_CODES.index(
+                QuantizationResult.ERROR_INVALID_INPUT if invalid
+                else QuantizationResult.REJECTED_OUT_OF_BOUNDS
+            )
+            residual[:] = float('inf')
+            if metrics is not None:
+                self._count_codes(codes)
+            return QuantizationBatch(
+                result_codes=codes,
+                label_index=label_index,
+                residual_energy=residual,
+                nearest_indptr=np.zeros(n_rows + 1, dtype=np.int64),
+                nearest_index=np.empty(0, dtype=np.int64),
+                nearest_distance=np.empty(0, dtype=np.float64),
+                input_hashes=hashes,
+                labels=snapshot._labels,
+                snapshot=snapshot
+            )
+        
+        row_bytes = max(1, snapshot.n_states * snapshot.dim * 8)
+        chunk_rows = max(1, max_chunk_bytes // row_bytes)
+        nearest_index = [np.empty(0, dtype=np.int64)]
+        nearest_distance = [np.empty(0, dtype=np.float64)]
+        scan_seconds = resolve_seconds = 0.0
+        
+        if self._spatial_index(snapshot) is not None:
+            for row in range(n_rows):
+                if metrics is not None:
+                    began = perf_counter()
+                distances, index = self._scan(snapshot, batch[row])
+                if metrics is not None:
+                    scanned = perf_counter()
+                result, state_index, row_residual, nearest, distance = self._resolve(snapshot, distances, index)
+                if metrics is not None:
+                    scan_seconds += scanned - began
+                    resolve_seconds += perf_counter() - scanned
+                codes[row] = RESULT_CODES.index(result)
+                label_index[row] = state_index
+                residual[row] = row_residual
+                counts[row] = len(nearest)
+                nearest_index.append(nearest)
+                nearest_distance.append(distance)
+        else:
+            for start in range(0, n_rows, chunk_rows):
+                stop = min(start + chunk_rows, n_rows)
+                if metrics is not None:
+                    began = perf_counter()
+                distances = self._block_distances(snapshot, batch[start:stop])
+                if metrics is not None:
+                    scanned = perf_counter()
+                chunk_index, chunk_distance = self._resolve_block(
+                    snapshot,
+                    distances,
+                    codes[start:stop],
+                    label_index[start:stop],
+                    residual[start:stop],
+                    counts[start:stop]
                 )
-            elif self.tie_break_strategy == "lexicographic":
-                nearest_label = sorted([t[0] for t in ties])[0]
-            elif self.tie_break_strategy == "first":
-                nearest_label = ties[0][0]
+                if metrics is not None:
+                    scan_seconds += scanned - began
+                    resolve_seconds += perf_counter() - scanned
+                nearest_index.append(chunk_index)
+                nearest_distance.append(chunk_distance)
+        
+        if metrics is not None:
+            metrics.observe_stage("scan", scan_seconds)
+            metrics.observe_stage("resolve", resolve_seconds)
+            self._count_codes(codes)
+        
+        indptr = np.zeros(n_rows + 1, dtype=np.int64)
+        np.cumsum(counts, out=indptr[1:])
+        
+        return QuantizationBatch(
+            result_codes=codes,
+            label_index=label_index,
+            residual_energy=residual,
+            nearest_indptr=indptr,
+            nearest_index=np.concatenate(nearest_index),
+            nearest_distance=np.concatenate(nearest_distance),
+            input_hashes=hashes,
+            labels=snapshot._labels,
+            snapshot=snapshot
+        )
+    
+    def _count_codes(self, codes: np.ndarray) -> None:
+        """Report a batch's result codes to the metrics hook."""
+        for code, count in enumerate(np.bincount(codes, minlength=len(RESULT_CODES)).tolist()):
+            if count:
+                self.metrics.count_folds(RESULT_CODES[code], count)
+    
+    def _resolve(
+        self,
+        snapshot: LatticeSnapshot,
+        distances: np.ndarray,
+        index: Optional[np.ndarray] = None
+    ) -> Tuple[QuantizationResult, int, float, np.ndarray, np.ndarray]:
+        """
+        Apply the threshold and tie-break rules to one row of distances.
+        
+        `distances` covers every state, or only the states listed in `index`
+        (ascending) when a spatial index has narrowed the candidates.
+        Returns the result, the selected state index (-1 if none), the
+        residual energy, and the indices and distances of the reported
+        nearest states.
+        """
+        states = np.arange(len(distances)) if index is None else index
+        order = self._nearest_order(distances, 5)
+        nearest = int(order[0])
+        min_distance = float(distances[nearest])
+        
+        # Check for within threshold
+        if min_distance > self.threshold:
+            order = order[:3]
+            return (
+                QuantizationResult.REJECTED_OUT_OF_BOUNDS, -1, min_distance,
+                states[order], distances[order]
+            )
+        
+        # Check for ties, unless the lattice is too sparse to have any
+        if self._needs_tie_scan(snapshot):
+            ties = np.flatnonzero(distances <= self.threshold)
+            if len(ties) > 1:
+                if self.tie_break_strategy == "reject":
+                    ties = ties[np.argsort(distances[ties], kind="stable")]
+                    return (
+                        QuantizationResult.REJECTED_AMBIGUOUS, -1, min_distance,
+                        states[ties], distances[ties]
+                    )
+                nearest = int(ties[np.argmin(snapshot.label_rank[states[ties]])])
+        # "first" keeps the nearest state, which always heads the tie set
         
         # Successful quantization
-        return QuantizationOutput(
-            result=QuantizationResult.ACCEPTED,
-            state_label=nearest_label,
-            residual_energy=0.0,
-            nearest_states=distances[:5],
-            input_hash=self._hash_input(input_arr)
+        return (
+            QuantizationResult.ACCEPTED, int(states[nearest]), 0.0,
+            states[order], distances[order]
+        )
+    
+    def _resolve_block(
+        self,
+        snapshot: LatticeSnapshot,
+        distances: np.ndarray,
+        codes: np.ndarray,
+        label_index: np.ndarray,
+        residual: np.ndarray,
+        counts: np.ndarray
+    ) -> Tuple[np.ndarray, np.ndarray]:
+        """
+        Vectorized `_resolve` over a (rows x states) distance block.
+        
+        Fills the per-row output arrays in place and returns the flattened
+        nearest-state indices and distances. Rows whose top-k has ties at
+        the k-th distance, NaNs, or several states within threshold are
+        handed to `_resolve` so they follow exactly the same rules.
+        """
+        n_rows, n_states = distances.shape
+        k = min(5, n_states)
+        
+        if n_states > k:
+            top = np.argpartition(distances, k - 1, axis=1)[:, :k]
+        else:
+            top = np.broadcast_to(np.arange(n_states), (n_rows, n_states))
+        top_distance = np.take_along_axis(distances, top, axis=1)
+        order = np.lexsort((top, top_distance), axis=1)
+        top = np.take_along_axis(top, order, axis=1)
+        top_distance = np.take_along_axis(top_distance, order, axis=1)
+        
+        min_distance = top_distance[:, 0]
+        out_of_bounds = min_distance > self.threshold
+        slow = np.isnan(top_distance).any(axis=1)
+        if self._needs_tie_scan(snapshot):
+            slow |= ~out_of_bounds & ((distances <= self.threshold).sum(axis=1) > 1)
+        if n_states > k:
+            slow |= (distances <= top_distance[:, -1:]).sum(axis=1) > k
+        
+        codes[:] = np.where(
+            out_of_bounds,
+            RESULT_CODES.index(QuantizationResult.REJECTED_OUT_OF_BOUNDS),
+            RESULT_CODES.index(QuantizationResult.ACCEPTED)
         )
+        label_index[:] = np.where(out_of_bounds, -1, top[:, 0])
+        residual[:] = np.where(out_of_bounds, min_distance, 0.0)
+        counts[:] = np.where(out_of_bounds, min(3, k), k)
+        
+        slow_rows = {}
+        for row in np.flatnonzero(slow).tolist():
+            result, state_index, row_residual, nearest, _ = self._resolve(snapshot, distances[row])
+            codes[row] = RESULT_CODES.index(result)
+            label_index[row] = state_index
+            residual[row] = row_residual
+            counts[row] = len(nearest)
+            slow_rows[row] = nearest
+        
+        width = max([k] + [len(nearest) for nearest in slow_rows.values()])
+        nearest_index = np.full((n_rows, width), -1, dtype=np.int64)
+        nearest_index[:, :k] = top
+        for row, nearest in slow_rows.items():
+            nearest_index[row, :len(nearest)] = nearest
+            nearest_index[row, len(nearest):] = -1
+        
+        mask = np.arange(width) < counts[:, None]
+        nearest_index = nearest_index[mask]
+        rows = np.broadcast_to(np.arange(n_rows)[:, None], mask.shape)[mask]
+        return nearest_index, distances[rows, nearest_index]
+    
+    def _scan(self, snapshot: LatticeSnapshot, input_arr: np.ndarray) -> Tuple[np.ndarray, Optional[np.ndarray]]:
+        """
+        Distances from input to the candidate states.
+        
+        Returns (distances, None) for a brute-force scan over every state, or
+        (distances, state indices) when the spatial index narrowed the scan.
+        """
+        tree = self._spatial_index(snapshot)
+        if tree is not None:
+            return tree.query(snapshot._coords, input_arr, self.threshold, 5)
+        
+        candidates = self._candidate_mask(snapshot, input_arr.reshape(1, -1))
+        if candidates is None:
+            return self._distances(snapshot, input_arr), None
+        index = np.flatnonzero(candidates[0])
+        return _euclidean(snapshot._coords[index], input_arr), index
+    
+    def _block_distances(self, snapshot: LatticeSnapshot, block: np.ndarray) -> np.ndarray:
+        """
+        `_distances` for a (rows x dim) block, for `_resolve_block`.
+        
+        In reduced-precision mode only candidate pairs are measured; the
+        rest are set to inf, which `_resolve_block` treats exactly like
+        their true (larger) distances.
+        """
+        candidates = self._candidate_mask(snapshot, block)
+        if candidates is None:
+            return self._distances(snapshot, block)
+        distances = np.full(candidates.shape, float('inf'))
+        rows, states = np.nonzero(candidates)
+        diff = snapshot._coords[states] - block[rows]
+        distances[rows, states] = np.sqrt(np.matmul(diff[:, None, :], diff[:, :, None])[:, 0, 0])
+        return distances
+    
+    def _low_precision(self, snapshot: LatticeSnapshot) -> Tuple[Optional[np.ndarray], float]:
+        """
+        Reduced-precision lattice copy and its largest row norm.
+        
+        The copy is None (exact scans only) for lattices with non-finite
+        coordinates or values the storage type cannot hold.
+        """
+        low_coords = snapshot._low_coords.get(self.precision)
+        if low_coords is None:
+            coords = snapshot._coords
+            radius = float(np.sqrt(np.einsum("ij,ij->i", coords, coords)).max())
+            low = None
+            if (
+                radius <= _LOW_PRECISION_MAX_NORM
+                and float(np.abs(coords).max()) <= float(np.finfo(self.precision).max) / 2
+            ):
+                low = coords.astype(self.precision)
+            low_coords = snapshot._low_coords[self.precision] = (low, radius)
+        return low_coords
+    
+    def _candidate_mask(self, snapshot: LatticeSnapshot, points: np.ndarray) -> Optional[np.ndarray]:
+        """
+        (rows x states) mask of states a reduced-precision scan cannot rule out.
+        
+        Each row keeps every state that may be within threshold or among the
+        5 nearest, widened by a bound on the rounding error of the storage
+        type and of float32 accumulation, so resolving over the candidates
+        with exact distances matches a full float64 scan. Returns None when
+        the mode is off or a point is non-finite or too large.
+        """
+        if self.precision == "float64":
+            return None
+        low, radius = self._low_precision(snapshot)
+        if low is None:
+            return None
+        dim = snapshot.dim
+        points = np.broadcast_to(points, (points.shape[0], dim))
+        norms = np.sqrt(np.einsum("ij,ij->i", points, points))
+        if not (norms <= _LOW_PRECISION_MAX_NORM).all():
+            return None
+        
+        approx = _euclidean(low, points.astype(np.float32))
+        k = min(5, snapshot.n_states)
+        kth = np.partition(approx, k - 1, axis=1)[:, k - 1].astype(np.float64)
+        cutoff = np.fmax(kth, self.threshold)
+        
+        unit, tiny = _PRECISION_ROUNDING[self.precision]
+        unit32, tiny32 = _PRECISION_ROUNDING["float32"]
+        error = unit * radius + unit32 * norms + 2 * np.sqrt(dim) * (tiny + tiny32)
+        relative = (dim + 4) * unit32
+        margin = 2 * (error + relative * (cutoff + error)) * (1 + relative)
+        return approx <= (cutoff + 2 * margin)[:, None]
+    
+    def _spatial_index(self, snapshot: LatticeSnapshot) -> Optional["_KDTree"]:
+        """The KD-tree for a snapshot, or None when scanning brute force."""
+        if self.index == "brute" or snapshot.n_states == 0:
+            return None
+        if self.index == "auto" and not any(
+            snapshot.dim <= max_dim and snapshot.n_states >= min_states
+            for max_dim, min_states in KDTREE_AUTO_MIN_STATES.items()
+        ):
+            return None
+        
+        tree = snapshot._tree
+        if tree is None or tree.needs_rebuild(snapshot.n_states):
+            tree = snapshot._tree = _KDTree(snapshot._coords)
+        return tree
+    
+    def _distances(self, snapshot: LatticeSnapshot, input_arr: np.ndarray) -> np.ndarray:
+        """
+        Euclidean distance from input to every state.
+        
+        Accepts a single vector or a (rows x dim) block, returning
+        (n_states,) or (rows x n_states) distances. Each pair is reduced with
+        a per-row dot product (the same kernel `np.linalg.norm` uses), so
+        results are bit-identical to `StateVector.distance_to`.
+        """
+        return _euclidean(snapshot._coords, input_arr)
+    
+    @staticmethod
+    def _nearest_order(distances: np.ndarray, k: int) -> np.ndarray:
+        """
+        Indices of the k nearest states, in stable-sort order.
+        
+        Uses partial selection, then widens the candidate set to every state
+        tied with the k-th distance so equal distances keep insertion order.
+        """
+        if distances.shape[0] <= k:
+            return np.argsort(distances, kind="stable")
+        
+        kth = float(distances[np.argpartition(distances, k - 1)[:k]].max())
+        if kth != kth:  # NaN
+            return np.argsort(distances, kind="stable")[:k]
+        
+        candidates = np.flatnonzero(distances <= kth)
+        return candidates[np.argsort(distances[candidates], kind="stable")[:k]]
+    
+    def _pairs(self, snapshot: LatticeSnapshot, indices: np.ndarray, distances: np.ndarray) -> List[Tuple[str, float]]:
+        """Build (label, distance) pairs for the given state indices."""
+        return list(zip(snapshot._labels[indices].tolist(), distances.tolist()))
     
     def _hash_input(self, input_arr) -> str:
         """Generate SHA-256 hash of input for receipts"""
         input_bytes = np.array(input_arr).tobytes()
         return hashlib.sha256(input_bytes).hexdigest()[:16]
+    
+    def _hash_rows(self, batch: np.ndarray) -> np.ndarray:
+        """`_hash_input` for every row of a C-contiguous batch, without copies."""
+        if batch.size == 0:
+            return np.array([self._hash_input(row) for row in batch], dtype="<U16")
+        
+        row_bytes = batch.shape[1] * batch.itemsize
+        data = memoryview(batch.reshape(-1)).cast("B")
+        return np.array([
+            hashlib.sha256(data[i:i + row_bytes]).hexdigest()[:16]
+            for i in range(0, batch.shape[0] * row_bytes, row_bytes)
+        ], dtype="<U16")
+
+
+# Node ids listed in one cycle violation; the rest are only counted
+_CYCLE_IDS_LISTED = 20
+
+
+def _cycle_violation(component: List[str]) -> str:
+    """The CYCLE_DETECTED violation for one strongly connected component."""
+    listed = ", ".join(component[:_CYCLE_IDS_LISTED])
+    if len(component) > _CYCLE_IDS_LISTED:
+        listed += f" (+{len(component) - _CYCLE_IDS_LISTED} more)"
+    return f"CYCLE_DETECTED: Circular reasoning among nodes {listed}"
 
 
 class HamiltonianValidator:
@@ -188,12 +2072,25 @@ class HamiltonianValidator:
     def __init__(
         self,
         energy_ceiling: float = 100.0,
-        lambda_threshold: float = 1e-9
+        lambda_threshold: float = 1e-9,
+        trace_mode: str = "stream"
     ):
-        """Initialize validator."""
+        """
+        Initialize validator.
+        
+        `trace_mode` selects the trace hash: "stream" (the original
+        value, computed without building the joined string) or "merkle"
+        (a Merkle root that supports per-node proofs and O(log n)
+        rehashing in a `LogicChainSession`).
+        """
+        if trace_mode not in TRACE_HASH_VERSIONS:
+            raise ValueError(f"Unknown trace mode: {trace_mode}")
         self.energy_ceiling = energy_ceiling
         self.lambda_threshold = lambda_threshold
+        self.trace_mode = trace_mode
         self.current_energy = 0.0
+        # Instrumentation hook (see axiom_metrics.MetricsHook); None disables it
+        self.metrics = None
     
     def validate_energy(self, proposed_energy: float) -> bool:
         """Check if proposed energy violates constraints."""
@@ -206,131 +2103,839 @@ class HamiltonianValidator:
         self.current_energy = proposed_energy
         return True
     
+    def validate_energy_sequence(self, proposals: np.ndarray) -> Tuple[np.ndarray, float]:
+        """
+        `validate_energy` over a whole sequence of proposals in one pass.
+        
+        Returns the per-step accept mask and the final energy, which also
+        becomes `current_energy`; the result equals calling
+        `validate_energy` on each proposal in turn.
+        """
+        accepted, self.current_energy = _energy_sequence(
+            proposals, self.energy_ceiling, self.current_energy
+        )
+        return accepted, self.current_energy
+    
     def validate_logic_chain(
         self, 
-        nodes: List[LogicNode]
+        nodes: Union[List[LogicNode], LogicChain]
     ) -> ValidationResult:
-        """Validate logical consistency of reasoning chain."""
-        violations = []
+        """
+        Validate logical consistency of reasoning chain (a node list or a `LogicChain`).
         
-        # Build dependency graph
-        node_map = {n.node_id: n for n in nodes}
+        The chain is compiled to a CSR evidence matrix (see
+        `LogicChain.evidence_rows`) and every node's Λ is computed with
+        array operations; a list of nodes is packed into a `LogicChain`
+        first. Violations and the overall Λ (the scores summed left to
+        right, then averaged) match the original per-node loop exactly.
+        """
+        metrics = self.metrics
+        if metrics is not None:
+            start = perf_counter()
+        chain = nodes if isinstance(nodes, LogicChain) else LogicChain.from_nodes(nodes)
+        violations = []
         
-        # Check for cycles
-        if self._has_cycle(nodes, node_map):
-            violations.append("CYCLE_DETECTED: Circular reasoning found")
+        # Check for cycles: one violation per strongly connected component
+        violations.extend(map(_cycle_violation, self._find_cycles(chain)))
+        if metrics is not None:
+            checked = perf_counter()
         
         # Validate each node's truth value against evidence
-        lambda_scores = []
-        
-        for node in nodes:
-            if not node.evidence_ids:
-                lambda_scores.append(1.0)
-                continue
-            
-            # Get evidence nodes
-            evidence_nodes = [
-                node_map[eid] for eid in node.evidence_ids 
-                if eid in node_map
-            ]
-            
-            if len(evidence_nodes) != len(node.evidence_ids):
-                violations.append(f"MISSING_EVIDENCE: Node {node.node_id}")
-                lambda_scores.append(0.0)
-                continue
-            
-            # Compute Λ
-            evidence_strength = sum(e.truth_value for e in evidence_nodes)
-            claim_strength = node.truth_value
-            
-            if claim_strength == 0:
-                lambda_scores.append(1.0)
-                continue
-            
-            lambda_score = evidence_strength / claim_strength
-            lambda_scores.append(lambda_score)
-            
-            # Check if Λ ≈ 1.0
-            if abs(lambda_score - 1.0) > self.lambda_threshold:
+        lambda_scores, missing, inconsistent = self._lambda_scores(chain)
+        node_ids = chain.node_ids
+        for i in np.flatnonzero(missing | inconsistent).tolist():
+            if missing[i]:
+                violations.append(f"MISSING_EVIDENCE: Node {node_ids[i]}")
+            else:
                 violations.append(
-                    f"INCONSISTENT: Node {node.node_id} has Λ={lambda_score:.6f}"
+                    f"INCONSISTENT: Node {node_ids[i]} has Λ={float(lambda_scores[i]):.6f}"
                 )
         
         # Overall Λ score
-        overall_lambda = sum(lambda_scores) / len(lambda_scores) if lambda_scores else 0.0
+        n_nodes = len(chain)
+        if n_nodes:
+            # cumsum adds strictly left to right, like the original sum()
+            with np.errstate(invalid="ignore", over="ignore"):
+                overall_lambda = (0.0 + float(np.cumsum(lambda_scores)[-1])) / n_nodes
+        else:
+            overall_lambda = 0.0
         
         # Compute energy
-        energy = float(len(nodes))
+        energy = float(n_nodes)
         
         is_valid = len(violations) == 0 and overall_lambda >= (1.0 - self.lambda_threshold)
+        if metrics is not None:
+            scored = perf_counter()
         
-        return ValidationResult(
+        result = ValidationResult(
             is_valid=is_valid,
             lambda_score=overall_lambda,
             energy_level=energy,
             violations=violations,
-            trace_hash=self._hash_chain(nodes)
+            trace_hash=self._hash_chain(nodes),
+            trace_hash_version=TRACE_HASH_VERSIONS[self.trace_mode]
         )
+        if metrics is not None:
+            metrics.observe_stage("chain_cycles", checked - start)
+            metrics.observe_stage("chain_lambda", scored - checked)
+            metrics.observe_stage("chain_hash", perf_counter() - scored)
+            metrics.count_chain(result)
+        return result
     
-    def _has_cycle(self, nodes: List[LogicNode], node_map: Dict) -> bool:
-        """Detect cycles in dependency graph (DFS)"""
-        visited = set()
-        rec_stack = set()
+    def _lambda_scores(self, chain: LogicChain) -> Tuple[np.ndarray, np.ndarray, np.ndarray]:
+        """
+        Λ for every node, plus MISSING_EVIDENCE and INCONSISTENT masks.
         
-        def visit(node_id):
-            if node_id in rec_stack:
-                return True
-            if node_id in visited:
-                return False
-            
-            visited.add(node_id)
-            rec_stack.add(node_id)
-            
-            node = node_map.get(node_id)
-            if node:
-                for dep_id in node.evidence_ids:
-                    if visit(dep_id):
-                        return True
-            
-            rec_stack.remove(node_id)
-            return False
+        Evidence strengths come from one sparse mat-vec: `np.bincount`
+        with weights adds each row's evidence truth values one at a time,
+        in citation order, starting from 0.0. `LogicChainSession` sums the
+        same way, and neither uses `sum`, whose rounding changed in Python
+        3.12. Nodes without evidence or with a zero claim score 1.0; nodes
+        citing a missing id score 0.0.
+        """
+        n_nodes = len(chain)
+        truth = chain.truth_values
+        targets = chain.evidence_rows
+        counts = np.diff(chain.evidence_indptr)
+        owner = np.repeat(np.arange(n_nodes), counts)
         
-        for node in nodes:
-            if visit(node.node_id):
-                return True
+        missing_edge = targets < 0
+        missing = np.zeros(n_nodes, dtype=bool)
+        missing[owner[missing_edge]] = True
+        weights = np.where(missing_edge, 0.0, truth[np.where(missing_edge, 0, targets)])
+        strength = np.bincount(owner, weights=weights, minlength=n_nodes)
         
-        return False
+        scores = np.ones(n_nodes)
+        scored = (counts > 0) & ~missing & (truth != 0)
+        with np.errstate(divide="ignore", invalid="ignore"):
+            scores[scored] = strength[scored] / truth[scored]
+        scores[missing] = 0.0
+        inconsistent = scored & (np.abs(scores - 1.0) > self.lambda_threshold)
+        return scores, missing, inconsistent
     
-    def _hash_chain(self, nodes: List[LogicNode]) -> str:
+    def _has_cycle(self, nodes: List[LogicNode], node_map: Optional[Dict] = None) -> bool:
+        """Detect cycles in dependency graph"""
+        chain = nodes if isinstance(nodes, LogicChain) else LogicChain.from_nodes(nodes)
+        return bool(self._find_cycles(chain))
+    
+    def _find_cycles(self, chain: LogicChain) -> List[List[str]]:
+        """
+        Strongly connected components that contain a cycle.
+        
+        Runs over the chain's CSR evidence rows and its `node_index`. If
+        every evidence edge points to an earlier node, or every one to a
+        later node, the chain is acyclic and the answer is read off with
+        array operations; otherwise an iterative Tarjan search (linear
+        time, no recursion limit) over the rows a cycle could pass
+        through finds the components. Evidence ids missing from the
+        chain are ignored here (they are reported separately),
+        and a repeated node id resolves to its last occurrence. A single
+        node only counts if it cites itself. Components, and the node ids
+        in each, are listed in chain order.
+        """
+        n_nodes = len(chain)
+        node_index = chain.node_index
+        if len(node_index) == n_nodes:
+            canonical = np.arange(n_nodes)
+        else:
+            canonical = np.fromiter(
+                map(node_index.__getitem__, chain.node_ids.tolist()),
+                dtype=np.int64,
+                count=n_nodes
+            )
+        counts = np.diff(chain.evidence_indptr)
+        owner = np.repeat(np.arange(n_nodes), counts)
+        targets = chain.evidence_rows
+        live = (targets >= 0) & (canonical[owner] == owner)
+        forward = live & (targets >= owner)
+        backward = live & (targets <= owner)
+        if not np.any(forward) or not np.any(backward):
+            return []
+        
+        self_looped = live & (targets == owner)
+        self_citing = set(owner[self_looped].tolist())
+        
+        # Going round a cycle crosses every gap between its lowest and
+        # highest rows once by a forward and once by a backward edge, so
+        # only rows next to a gap both kinds of edge span (or that cite
+        # themselves) can be on one, and the search keeps to those rows
+        crossed = np.ones(n_nodes, dtype=bool)
+        for low, high in ((owner[forward], targets[forward]), (targets[backward], owner[backward])):
+            spans = np.bincount(low, minlength=n_nodes) - np.bincount(high, minlength=n_nodes)
+            crossed &= np.cumsum(spans) > 0
+        candidate = crossed.copy()
+        candidate[1:] |= crossed[:-1]
+        candidate[owner[self_looped]] = True
+        candidate &= canonical == np.arange(n_nodes)
+        if not np.any(candidate):
+            return []
+        roots = np.flatnonzero(candidate).tolist()
+        
+        node_ids = chain.node_ids.tolist()
+        indptr = chain.evidence_indptr.tolist()
+        kept = live.copy()
+        kept[live] = candidate[owner[live]] & candidate[targets[live]]
+        edges = np.where(kept, targets, -1).tolist()
+        # index[v] is v's visit number (0: unvisited); it becomes n_nodes + 1
+        # once v's component is emitted, so it never lowers a lowlink again
+        index = [0] * n_nodes
+        lowlink = [0] * n_nodes
+        resume = [0] * n_nodes
+        done = n_nodes + 1
+        stack: List[int] = []
+        parents: List[int] = []
+        cycles = []
+        counter = 1
+        
+        for root in roots:
+            if index[root]:
+                continue
+            node = root
+            index[node] = lowlink[node] = counter
+            counter += 1
+            stack.append(node)
+            position, end = indptr[node], indptr[node + 1]
+            
+            while True:
+                # Walk node's edges, descending into the first unvisited one
+                while position < end:
+                    dep = edges[position]
+                    position += 1
+                    if dep < 0:
+                        continue
+                    visit = index[dep]
+                    if not visit:
+                        resume[node] = position
+                        parents.append(node)
+                        node = dep
+                        index[node] = lowlink[node] = counter
+                        counter += 1
+                        stack.append(node)
+                        position, end = indptr[node], indptr[node + 1]
+                    elif visit < lowlink[node]:
+                        lowlink[node] = visit
+                
+                # Every edge of node explored: finish it
+                low = lowlink[node]
+                if low == index[node] and stack[-1] == node:
+                    # A single node is only a cycle if it cites itself
+                    stack.pop()
+                    index[node] = done
+                    if node in self_citing:
+                        cycles.append([node])
+                elif low == index[node]:
+                    start = len(stack) - 2
+                    while stack[start] != node:
+                        start -= 1
+                    component = stack[start:]
+                    del stack[start:]
+                    for member in component:
+                        index[member] = done
+                    component.sort()
+                    cycles.append(component)
+                if not parents:
+                    break
+                node = parents.pop()
+                if low < lowlink[node]:
+                    lowlink[node] = low
+                position, end = resume[node], indptr[node + 1]
+        
+        cycles.sort()
+        return [[node_ids[member] for member in component] for component in cycles]
+    
+    def _hash_chain(self, nodes: Union[List[LogicNode], LogicChain]) -> str:
         """Generate hash of logic chain for receipts"""
-        chain_str = "|".join([
-            f"{n.node_id}:{n.proposition}:{n.truth_value}" 
-            for n in nodes
+        if self.trace_mode == "merkle":
+            return self.trace_tree(nodes).root.hex()
+        
+        # Stream the "|"-joined fields into the hasher a chunk at a time
+        digest = hashlib.sha256()
+        separator = b""
+        for chunk in self._trace_chunks(nodes):
+            digest.update(separator)
+            digest.update("|".join([
+                f"{node_id}:{proposition}:{truth_value}" for node_id, proposition, truth_value in chunk
+            ]).encode())
+            separator = b"|"
+        return digest.hexdigest()[:16]
+    
+    def _trace_chunks(self, nodes: Union[List[LogicNode], LogicChain]) -> Iterator[List[Tuple]]:
+        """(node_id, proposition, truth_value) tuples, a bounded chunk at a time."""
+        if isinstance(nodes, LogicChain):
+            for start in range(0, len(nodes), _TRACE_CHUNK_NODES):
+                stop = start + _TRACE_CHUNK_NODES
+                yield list(zip(
+                    nodes.node_ids[start:stop].tolist(),
+                    nodes.propositions[start:stop].tolist(),
+                    nodes.truth_values[start:stop].tolist()
+                ))
+            return
+        
+        fields = ((n.node_id, n.proposition, n.truth_value) for n in nodes)
+        while True:
+            chunk = list(islice(fields, _TRACE_CHUNK_NODES))
+            if not chunk:
+                return
+            yield chunk
+    
+    def trace_tree(self, nodes: Union[List[LogicNode], LogicChain]) -> MerkleTree:
+        """Merkle tree with one leaf per node, as used by trace_mode="merkle"."""
+        return MerkleTree([
+            _trace_leaf(*fields)
+            for chunk in self._trace_chunks(nodes)
+            for fields in chunk
         ])
-        return hashlib.sha256(chain_str.encode()).hexdigest()[:16]
+    
+    def trace_proof(self, nodes: Union[List[LogicNode], LogicChain], index: int) -> Dict:
+        """Inclusion proof that node `index` is part of the chain's Merkle trace root."""
+        return proof_to_dict(self.trace_tree(nodes), index)
+    
+    def session(self, nodes: Optional[List[LogicNode]] = None) -> "LogicChainSession":
+        """Start an incrementally validated chain (see `LogicChainSession`)."""
+        return LogicChainSession(self, nodes)
+
+
+def _energy_sequence(
+    proposals: np.ndarray,
+    energy_ceiling: float,
+    current_energy: float
+) -> Tuple[np.ndarray, float]:
+    """
+    Accept mask and final energy for a run of energy proposals.
+    
+    A proposal is accepted if it is within the ceiling and not above the
+    current energy, and then becomes the current energy. Rejected
+    proposals are always above the current energy, so the energy before
+    step i is simply the running minimum of the start and every
+    in-ceiling proposal before it. NaNs break that ordering argument and
+    take the step-by-step path.
+    """
+    proposals = np.asarray(proposals, dtype=np.float64).reshape(-1)
+    if np.isnan(current_energy) or np.isnan(proposals).any():
+        accepted = np.zeros(len(proposals), dtype=bool)
+        for i, proposed in enumerate(proposals.tolist()):
+            if proposed > energy_ceiling or proposed > current_energy:
+                continue
+            accepted[i] = True
+            current_energy = proposed
+        return accepted, current_energy
+    
+    within = ~(proposals > energy_ceiling)
+    candidates = np.where(within, proposals, np.inf)
+    before = np.empty(len(proposals))
+    if len(proposals):
+        before[0] = current_energy
+        np.minimum.accumulate(np.minimum(candidates[:-1], current_energy), out=before[1:])
+    accepted = within & ~(proposals > before)
+    
+    # The last accepted proposal is the final energy (exactly, signed zeros included)
+    last = np.flatnonzero(accepted)
+    return accepted, float(proposals[last[-1]]) if len(last) else current_energy
+
+
+class EnergyLedger:
+    """
+    Independent energy states for many sessions, safe under threads.
+    
+    Each session follows `HamiltonianValidator.validate_energy` rules
+    against a shared ceiling. Sessions are spread over `shards` locks by
+    hash, so threads working on different sessions rarely contend and a
+    session's updates are always serialized.
+    """
+    
+    def __init__(
+        self,
+        energy_ceiling: float = 100.0,
+        initial_energy: float = 0.0,
+        shards: int = 64
+    ):
+        """
+        Create an empty ledger.
+        
+        Args:
+            energy_ceiling: Upper bound on any accepted energy
+            initial_energy: Energy of a session before its first proposal
+            shards: Number of independently locked partitions
+        """
+        if shards < 1:
+            raise ValueError("shards must be at least 1")
+        self.energy_ceiling = energy_ceiling
+        self.initial_energy = initial_energy
+        self._locks = [threading.Lock() for _ in range(shards)]
+        self._states: List[Dict[str, float]] = [{} for _ in range(shards)]
+    
+    def _shard(self, session_id: str) -> int:
+        return hash(session_id) % len(self._locks)
+    
+    def energy(self, session_id: str) -> float:
+        """Current energy of a session."""
+        shard = self._shard(session_id)
+        with self._locks[shard]:
+            return self._states[shard].get(session_id, self.initial_energy)
+    
+    def validate_energy(self, session_id: str, proposed_energy: float) -> bool:
+        """Check one proposal for a session, updating it if accepted."""
+        shard = self._shard(session_id)
+        with self._locks[shard]:
+            states = self._states[shard]
+            current = states.get(session_id, self.initial_energy)
+            if proposed_energy > self.energy_ceiling or proposed_energy > current:
+                return False
+            states[session_id] = proposed_energy
+            return True
+    
+    def validate_energy_sequence(
+        self,
+        session_id: str,
+        proposals: np.ndarray
+    ) -> Tuple[np.ndarray, float]:
+        """Check a run of proposals for a session in one vectorized pass."""
+        shard = self._shard(session_id)
+        with self._locks[shard]:
+            states = self._states[shard]
+            accepted, final = _energy_sequence(
+                proposals,
+                self.energy_ceiling,
+                states.get(session_id, self.initial_energy)
+            )
+            states[session_id] = final
+            return accepted, final
+    
+    def reset(self, session_id: str, energy: Optional[float] = None) -> None:
+        """Set a session's energy (back to the initial energy by default)."""
+        shard = self._shard(session_id)
+        with self._locks[shard]:
+            self._states[shard][session_id] = self.initial_energy if energy is None else energy
+    
+    def discard(self, session_id: str) -> None:
+        """Forget a session."""
+        shard = self._shard(session_id)
+        with self._locks[shard]:
+            self._states[shard].pop(session_id, None)
+    
+    def sessions(self) -> List[str]:
+        """Ids of every session with recorded state."""
+        ids = []
+        for lock, states in zip(self._locks, self._states):
+            with lock:
+                ids.extend(states)
+        return ids
+
+
+# Trace hash states and Λ partial sums are checkpointed every this many nodes
+_TRACE_CHECKPOINT_NODES = 1024
+
+
+class LogicChainSession:
+    """
+    A reasoning chain that is revalidated incrementally as it changes.
+    
+    Each change recomputes Λ only for the node involved and the nodes
+    that cite it. The mean Λ is the validator's left-to-right sum,
+    extended as nodes are appended and resumed from the nearest
+    checkpoint before a changed score, so it equals
+    `validate_logic_chain`'s exactly. Cycle status is only recomputed
+    when a change can create or break a cycle. In the validator's "stream" trace mode the hash is
+    extended as nodes are appended and, after an update or removal,
+    rehashed from the nearest checkpoint before the change; in "merkle"
+    mode appends and updates rehash one O(log n) path and only a removal
+    rebuilds the tree. Node ids must be unique within a session.
+    """
+    
+    def __init__(self, validator: HamiltonianValidator, nodes: Optional[List[LogicNode]] = None):
+        """
+        Start a session.
+        
+        Args:
+            validator: Supplies `lambda_threshold` and cycle detection
+            nodes: Initial nodes, added in order
+        """
+        self.validator = validator
+        self._nodes: Dict[str, LogicNode] = {}
+        self._order: List[str] = []
+        self._dependents: Dict[str, set] = {}
+        self._scores: Dict[str, float] = {}
+        self._violations: Dict[str, str] = {}
+        # Increasing sequence number of each node, in chain order
+        self._position: Dict[str, int] = {}
+        self._next_position = 0
+        
+        # Λ sum of the first _lambda_count scores, in chain order
+        self._lambda_total = 0.0
+        self._lambda_count = 0
+        self._lambda_checkpoints: List[Tuple[int, float]] = []
+        
+        # None while the cycle list needs recomputing
+        self._cycles: Optional[List[List[str]]] = []
+        self._cyclic_nodes: set = set()
+        
+        self._trace_state = hashlib.sha256()
+        self._trace_count = 0
+        self._trace_checkpoints: List[Tuple[int, "hashlib._Hash"]] = []
+        # Merkle mode only; None while it needs rebuilding
+        self._trace_tree: Optional[MerkleTree] = None
+        if validator.trace_mode == "merkle":
+            self._trace_tree = MerkleTree([])
+        
+        for node in nodes or []:
+            self.add_node(node)
+    
+    def __len__(self) -> int:
+        return len(self._nodes)
+    
+    @property
+    def nodes(self) -> List[LogicNode]:
+        """Current nodes in chain order."""
+        return [self._nodes[node_id] for node_id in self._order]
+    
+    def add_node(self, node: LogicNode) -> None:
+        """Append a node to the chain."""
+        node_id = node.node_id
+        if node_id in self._nodes:
+            raise ValueError(f"Node {node_id} is already in the session")
+        
+        self._nodes[node_id] = node
+        self._order.append(node_id)
+        if self._trace_tree is not None:
+            self._trace_tree.append(_trace_leaf(node_id, node.proposition, node.truth_value))
+        self._position[node_id] = self._next_position
+        self._next_position += 1
+        for eid in node.evidence_ids:
+            self._dependents.setdefault(eid, set()).add(node_id)
+        
+        # Nodes that cited this id were missing evidence until now
+        dependents = self._dependents.get(node_id, ())
+        self._rescore(node_id)
+        for dependent in dependents:
+            if dependent != node_id:
+                self._rescore(dependent)
+        
+        # Only a node that is cited can close a cycle, and only through itself
+        if dependents and self._cycles is not None and self._reaches_itself(node_id):
+            self._cycles = None
+    
+    def update_truth_value(self, node_id: str, truth_value: float) -> None:
+        """Change a node's truth value in place."""
+        node = self._nodes.get(node_id)
+        if node is None:
+            raise ValueError(f"Unknown node: {node_id}")
+        
+        self._nodes[node_id] = replace(node, truth_value=truth_value)
+        self._rescore(node_id)
+        for dependent in self._dependents.get(node_id, ()):
+            if dependent != node_id:
+                self._rescore(dependent)
+        
+        index = self._index_of(node_id)
+        if self._trace_tree is not None:
+            self._trace_tree.update(index, _trace_leaf(node_id, node.proposition, truth_value))
+        self._invalidate_trace(index)
+    
+    def remove_node(self, node_id: str) -> None:
+        """Remove a node; nodes citing it become MISSING_EVIDENCE."""
+        node = self._nodes.get(node_id)
+        if node is None:
+            raise ValueError(f"Unknown node: {node_id}")
+        
+        index = self._index_of(node_id)
+        del self._order[index]
+        del self._nodes[node_id]
+        del self._position[node_id]
+        for eid in node.evidence_ids:
+            dependents = self._dependents.get(eid)
+            if dependents is not None:
+                dependents.discard(node_id)
+                if not dependents:
+                    del self._dependents[eid]
+        
+        del self._scores[node_id]
+        self._violations.pop(node_id, None)
+        self._invalidate_lambda(index)
+        for dependent in self._dependents.get(node_id, ()):
+            self._rescore(dependent)
+        
+        # Removing a node can only break cycles it was part of
+        if self._cycles is not None and node_id in self._cyclic_nodes:
+            self._cycles = None
+        self._trace_tree = None
+        self._invalidate_trace(index)
+    
+    def _index_of(self, node_id: str) -> int:
+        """Position of a node in the chain, by binary search on sequence numbers."""
+        return bisect.bisect_left(self._order, self._position[node_id], key=self._position.__getitem__)
+    
+    def _rescore(self, node_id: str) -> None:
+        """Recompute one node's Λ and violation (same rules as validate_logic_chain)."""
+        node = self._nodes[node_id]
+        violation = None
+        if not node.evidence_ids:
+            score = 1.0
+        else:
+            evidence_nodes = [self._nodes.get(eid) for eid in node.evidence_ids]
+            if any(evidence is None for evidence in evidence_nodes):
+                score = 0.0
+                violation = f"MISSING_EVIDENCE: Node {node_id}"
+            elif node.truth_value == 0:
+                score = 1.0
+            else:
+                # Left to right from 0.0, like the validator's bincount
+                strength = 0.0
+                for evidence in evidence_nodes:
+                    strength += evidence.truth_value
+                score = strength / node.truth_value
+                if abs(score - 1.0) > self.validator.lambda_threshold:
+                    violation = f"INCONSISTENT: Node {node_id} has Λ={score:.6f}"
+        
+        self._scores[node_id] = score
+        self._invalidate_lambda(self._index_of(node_id))
+        if violation is None:
+            self._violations.pop(node_id, None)
+        else:
+            self._violations[node_id] = violation
+    
+    @property
+    def lambda_score(self) -> float:
+        """Mean Λ over the chain (0.0 for an empty chain)."""
+        n_nodes = len(self._order)
+        if not n_nodes:
+            return 0.0
+        
+        total = self._lambda_total
+        for index in range(self._lambda_count, n_nodes):
+            score = self._scores[self._order[index]]
+            total = total + score if index else score
+            if (index + 1) % _TRACE_CHECKPOINT_NODES == 0:
+                self._lambda_checkpoints.append((index + 1, total))
+        self._lambda_total = total
+        self._lambda_count = n_nodes
+        return (0.0 + total) / n_nodes
+    
+    def _invalidate_lambda(self, index: int) -> None:
+        """Drop the Λ partial sum covering nodes from `index` on."""
+        if index >= self._lambda_count:
+            return
+        while self._lambda_checkpoints and self._lambda_checkpoints[-1][0] > index:
+            self._lambda_checkpoints.pop()
+        if self._lambda_checkpoints:
+            self._lambda_count, self._lambda_total = self._lambda_checkpoints[-1]
+        else:
+            self._lambda_count = 0
+            self._lambda_total = 0.0
+    
+    def _reaches_itself(self, node_id: str) -> bool:
+        """Whether following evidence from node_id leads back to it."""
+        seen = set()
+        stack = [node_id]
+        while stack:
+            for eid in self._nodes[stack.pop()].evidence_ids:
+                if eid == node_id:
+                    return True
+                if eid in self._nodes and eid not in seen:
+                    seen.add(eid)
+                    stack.append(eid)
+        return False
+    
+    @property
+    def cycles(self) -> List[List[str]]:
+        """Node ids of every strongly connected component containing a cycle."""
+        if self._cycles is None:
+            self._cycles = self.validator._find_cycles(LogicChain.from_nodes(self.nodes))
+            self._cyclic_nodes = {node_id for component in self._cycles for node_id in component}
+        return self._cycles
+    
+    @property
+    def has_cycle(self) -> bool:
+        return bool(self.cycles)
+    
+    def _invalidate_trace(self, index: int) -> None:
+        """Drop streamed trace hash state covering nodes from `index` on."""
+        if index >= self._trace_count:
+            return
+        while self._trace_checkpoints and self._trace_checkpoints[-1][0] > index:
+            self._trace_checkpoints.pop()
+        if self._trace_checkpoints:
+            self._trace_count, state = self._trace_checkpoints[-1]
+            self._trace_state = state.copy()
+        else:
+            self._trace_count = 0
+            self._trace_state = hashlib.sha256()
+    
+    @property
+    def trace_tree(self) -> MerkleTree:
+        """The chain's Merkle trace tree (merkle mode), for roots and proofs."""
+        if self._trace_tree is None:
+            self._trace_tree = self.validator.trace_tree(self.nodes)
+        return self._trace_tree
+    
+    @property
+    def trace_hash(self) -> str:
+        """Same value as `_hash_chain(nodes)`, hashing only what changed."""
+        if self.validator.trace_mode == "merkle":
+            return self.trace_tree.root.hex()
+        
+        state = self._trace_state
+        for index in range(self._trace_count, len(self._order)):
+            node = self._nodes[self._order[index]]
+            part = f"{node.node_id}:{node.proposition}:{node.truth_value}"
+            state.update((f"|{part}" if index else part).encode())
+            if (index + 1) % _TRACE_CHECKPOINT_NODES == 0:
+                self._trace_checkpoints.append((index + 1, state.copy()))
+        self._trace_count = len(self._order)
+        return state.copy().hexdigest()[:16]
+    
+    def result(self) -> ValidationResult:
+        """The `ValidationResult` for the chain as it stands."""
+        violations = [_cycle_violation(component) for component in self.cycles]
+        violations.extend(
+            self._violations[node_id]
+            for node_id in sorted(self._violations, key=self._position.__getitem__)
+        )
+        lambda_score = self.lambda_score
+        return ValidationResult(
+            is_valid=not violations and lambda_score >= (1.0 - self.validator.lambda_threshold),
+            lambda_score=lambda_score,
+            energy_level=float(len(self._nodes)),
+            violations=violations,
+            trace_hash=self.trace_hash,
+            trace_hash_version=TRACE_HASH_VERSIONS[self.validator.trace_mode]
+        )
 
 
 class AxiomHive:
     """Main Axiom Hive system combining VCS and Hamiltonian"""
     
-    def __init__(self, vcs: VectorConstrainedSingularity, hamiltonian: HamiltonianValidator):
-        """Initialize Axiom Hive with VCS and Hamiltonian"""
+    def __init__(
+        self,
+        vcs: VectorConstrainedSingularity,
+        hamiltonian: HamiltonianValidator,
+        receipt_log=None,
+        metrics=None
+    ):
+        """
+        Initialize Axiom Hive with VCS and Hamiltonian.
+        
+        If `receipt_log` (an `axiom_receipt_log.ReceiptLog`) is given, every
+        receipt issued by `process`, `process_batch` and `issue_receipts`
+        is appended to it.
+        If `metrics` (an `axiom_metrics.MetricsHook`) is given, it is also
+        installed on the VCS and validator and watches the lattice.
+        """
         self.vcs = vcs
         self.hamiltonian = hamiltonian
+        self.receipt_log = receipt_log
+        self.metrics = metrics
+        if metrics is not None:
+            vcs.metrics = metrics
+            hamiltonian.metrics = metrics
+            metrics.watch_lattice(vcs)
     
     def process(self, input_vector: List[float]) -> Dict:
         """Process input and return result with receipt"""
-        # Quantize input
-        quant_result = self.vcs.fold(input_vector)
+        metrics = self.metrics
+        if metrics is not None:
+            start = perf_counter()
+        
+        # Quantize input against one pinned lattice version
+        snapshot = self.vcs.snapshot
+        quant_result = self.vcs.fold(input_vector, snapshot)
+        if metrics is not None:
+            folded = perf_counter()
         
         # Generate receipt
-        receipt = {
-            "timestamp": datetime.now().isoformat(),
+        receipt = self._receipt(quant_result, datetime.now().isoformat(), snapshot)
+        if self.receipt_log is not None:
+            self.receipt_log.append(receipt)
+        if metrics is not None:
+            done = perf_counter()
+            metrics.observe_stage("receipt", done - folded)
+            metrics.observe_stage("process", done - start)
+        return receipt
+    
+    def process_batch(self, vectors: np.ndarray) -> List[Dict]:
+        """
+        Process an (N x D) array and return one receipt per row.
+        
+        Rows are folded with `fold_batch`; every receipt in the batch shares
+        one timestamp and is otherwise identical to `process(row)`.
+        """
+        metrics = self.metrics
+        if metrics is not None:
+            start = perf_counter()
+        batch = self.vcs.fold_batch(vectors)
+        if metrics is not None:
+            folded = perf_counter()
+        receipts = self.issue_receipts(batch)
+        if metrics is not None:
+            done = perf_counter()
+            metrics.observe_stage("receipt", done - folded)
+            metrics.observe_stage("process_batch", done - start)
+        return receipts
+    
+    def issue_receipts(self, batch: QuantizationBatch) -> List[Dict]:
+        """
+        Receipts for an already-folded batch, logged like `process_batch`'s.
+        
+        For callers that fold batches themselves (e.g. the streaming
+        pipeline) but still issue receipts.
+        """
+        receipts = self.batch_receipts(batch)
+        if self.receipt_log is not None:
+            self.receipt_log.append_many(receipts)
+        return receipts
+    
+    def batch_receipts(self, batch: QuantizationBatch) -> List[Dict]:
+        """Receipts for every row of an already-folded batch (not logged)."""
+        timestamp = datetime.now().isoformat()
+        snapshot = batch.snapshot if batch.snapshot is not None else self.vcs.snapshot
+        return [self._receipt(row, timestamp, snapshot) for row in batch]
+    
+    def merkle_receipt(self, vectors: np.ndarray, algorithm: str = "sha256") -> MerkleBatchReceipt:
+        """
+        Fold an (N x D) array under a single Merkle-batched receipt.
+        
+        Instead of a receipt dict per row, the batch gets one root and
+        timestamp; see `MerkleBatchReceipt`. With sha256, each input
+        digest's first 16 hex characters equal the row's `input_hash`.
+        
+        Args:
+            vectors: Input rows
+            algorithm: Leaf and node hash, "sha256" or "blake2b"
+        """
+        inputs = np.ascontiguousarray(vectors, dtype=np.float64)
+        snapshot = self.vcs.snapshot
+        batch = self.vcs.fold_batch(inputs, snapshot=snapshot)
+        input_digests = hash_rows(inputs, algorithm)
+        records = _merkle_leaf_records(
+            input_digests,
+            batch.result_codes,
+            batch.label_index,
+            batch.residual_energy
+        )
+        leaves = hash_rows(records, algorithm, LEAF_PREFIX)
+        return MerkleBatchReceipt(
+            timestamp=datetime.now().isoformat(),
+            lattice_hash=snapshot.content_hash,
+            lattice_version=snapshot.version,
+            algorithm=algorithm,
+            batch=batch,
+            input_digests=input_digests,
+            tree=MerkleTree([leaf.tobytes() for leaf in leaves], algorithm)
+        )
+    
+    @staticmethod
+    def _receipt(
+        quant_result: Union[QuantizationOutput, QuantizationView],
+        timestamp: str,
+        snapshot: LatticeSnapshot
+    ) -> Dict:
+        """Build the receipt dict for one quantization against a lattice snapshot."""
+        return {
+            "timestamp": timestamp,
             "input_hash": quant_result.input_hash,
             "result": quant_result.result.value,
             "state_label": quant_result.state_label,
             "residual_energy": quant_result.residual_energy,
-            "nearest_states": quant_result.nearest_states[:3]
+            "nearest_states": quant_result.nearest_states[:3],
+            "lattice_hash": snapshot.content_hash,
+            "lattice_version": snapshot.version
         }
-        
-        return receipt
@@ -4,8 +4,18 @@ A GUI for the Axiom Hive deterministic AI system
 """
 
 import tkinter as tk
-from tkinter import ttk, messagebox, scrolledtext
+from tkinter import ttk, messagebox, scrolledtext, filedialog
+import inspect
+import itertools
 import json
+import os
+import queue
+import shutil
+import tempfile
+import threading
+import time
+from collections import Counter
+from typing import Callable, Dict, Optional, Tuple
 from axiom_core import (
     VectorConstrainedSingularity,
     HamiltonianValidator,
@@ -13,6 +23,76 @@ from axiom_core import (
     LogicNode,
     QuantizationResult
 )
+from axiom_hive import chain_nodes, read_chains, validation_dict
+from axiom_stream import StreamPipeline
+
+
+# How often the Tk thread drains worker events (milliseconds)
+POLL_INTERVAL_MS = 50
+
+# Rows per engine call in the Batch tab, and the minimum gap between
+# progress updates it sends to the UI (seconds)
+BATCH_ROWS = 1024
+PROGRESS_INTERVAL = 0.1
+
+# File extensions read as raw little-endian float64 records
+RAW_EXTENSIONS = (".f64", ".bin", ".raw")
+
+
+class BackgroundWorker:
+    """
+    Runs engine jobs one at a time on a background thread.
+    
+    A job is called as `job(cancel, *args)`, where `cancel` is a
+    threading.Event it should check between steps. If the job is a
+    generator, every value it yields is posted as a ("progress", id, value)
+    event; its result is posted as ("done", id, result) and an exception as
+    ("error", id, exc). The Tk thread drains `events` with `root.after`, so
+    it never waits on the engine, and the engine is only touched from this
+    one thread.
+    """
+    
+    def __init__(self):
+        self.jobs: queue.Queue = queue.Queue()
+        self.events: queue.Queue = queue.Queue()
+        self._ids = itertools.count(1)
+        self._thread = threading.Thread(target=self._run, name="axiom-desktop-worker", daemon=True)
+        self._thread.start()
+    
+    def submit(self, job: Callable, *args) -> Tuple[int, threading.Event]:
+        """Queue a job; returns its id and the event that cancels it."""
+        job_id = next(self._ids)
+        cancel = threading.Event()
+        self.jobs.put((job_id, job, args, cancel))
+        return job_id, cancel
+    
+    def _run(self) -> None:
+        while True:
+            item = self.jobs.get()
+            if item is None:
+                return
+            job_id, job, args, cancel = item
+            try:
+                result = job(cancel, *args)
+                if inspect.isgenerator(result):
+                    result = self._drain(job_id, result)
+                self.events.put(("done", job_id, result))
+            except Exception as e:
+                self.events.put(("error", job_id, e))
+    
+    def _drain(self, job_id: int, steps):
+        """Post every progress value of a generator job; returns its result."""
+        while True:
+            try:
+                progress = next(steps)
+            except StopIteration as stop:
+                return stop.value
+            self.events.put(("progress", job_id, progress))
+    
+    def close(self, timeout: Optional[float] = None) -> None:
+        """Stop after the queued jobs have run."""
+        self.jobs.put(None)
+        self._thread.join(timeout)
 
 
 class AxiomHiveApp:
@@ -33,8 +113,21 @@ class AxiomHiveApp:
         # Setup default states
         self.setup_default_states()
         
+        # Engine calls run on the worker; results come back through callbacks
+        self.worker = BackgroundWorker()
+        self._callbacks: Dict[int, Tuple[Optional[Callable], Optional[Callable], Optional[Callable]]] = {}
+        
+        # Batch tab state
+        self.batch_path: Optional[str] = None
+        self.batch_cancel: Optional[threading.Event] = None
+        self.batch_spool: Optional[str] = None
+        self.batch_unit = "rows"
+        
         # Create UI
         self.create_ui()
+        
+        self.root.protocol("WM_DELETE_WINDOW", self.on_close)
+        self.root.after(POLL_INTERVAL_MS, self._poll_worker)
     
     def setup_default_states(self):
         """Define default valid states for the system"""
@@ -58,7 +151,12 @@ class AxiomHiveApp:
         notebook.add(ham_frame, text="Hamiltonian Validation")
         self.create_hamiltonian_tab(ham_frame)
         
-        # Tab 3: System Info
+        # Tab 3: Batch Processing
+        batch_frame = ttk.Frame(notebook)
+        notebook.add(batch_frame, text="Batch")
+        self.create_batch_tab(batch_frame)
+        
+        # Tab 4: System Info
         info_frame = ttk.Frame(notebook)
         notebook.add(info_frame, text="System Info")
         self.create_info_tab(info_frame)
@@ -126,6 +224,57 @@ class AxiomHiveApp:
         self.ham_result_text = scrolledtext.ScrolledText(result_frame, height=15, width=80)
         self.ham_result_text.pack(fill="both", expand=True)
     
+    def create_batch_tab(self, parent):
+        """Create the Batch tab"""
+        # Input section
+        input_frame = ttk.LabelFrame(parent, text="Input File", padding=10)
+        input_frame.pack(fill="x", padx=10, pady=10)
+        
+        kind_frame = ttk.Frame(input_frame)
+        kind_frame.pack(fill="x", pady=5)
+        
+        self.batch_kind_var = tk.StringVar(value="vectors")
+        ttk.Radiobutton(kind_frame, text="Vectors (NDJSON, CSV or raw float64)", variable=self.batch_kind_var,
+                        value="vectors").pack(side="left", padx=5)
+        ttk.Radiobutton(kind_frame, text="Logic chains (JSON or NDJSON)", variable=self.batch_kind_var,
+                        value="chains").pack(side="left", padx=5)
+        
+        file_frame = ttk.Frame(input_frame)
+        file_frame.pack(fill="x", pady=5)
+        
+        ttk.Button(file_frame, text="Load File...", command=self.load_batch_file).pack(side="left", padx=5)
+        self.batch_file_var = tk.StringVar(value="No file loaded")
+        ttk.Label(file_frame, textvariable=self.batch_file_var).pack(side="left", padx=5)
+        
+        # Run section
+        run_frame = ttk.LabelFrame(parent, text="Progress", padding=10)
+        run_frame.pack(fill="x", padx=10, pady=10)
+        
+        button_frame = ttk.Frame(run_frame)
+        button_frame.pack(fill="x", pady=5)
+        
+        self.batch_start_button = ttk.Button(button_frame, text="Start", command=self.start_batch, state="disabled")
+        self.batch_start_button.pack(side="left", padx=5)
+        self.batch_cancel_button = ttk.Button(button_frame, text="Cancel", command=self.cancel_batch, state="disabled")
+        self.batch_cancel_button.pack(side="left", padx=5)
+        self.batch_export_button = ttk.Button(button_frame, text="Export Receipts...", command=self.export_batch,
+                                              state="disabled")
+        self.batch_export_button.pack(side="left", padx=5)
+        
+        self.batch_progress = ttk.Progressbar(run_frame, mode="determinate", maximum=1)
+        self.batch_progress.pack(fill="x", pady=5)
+        
+        self.batch_status_var = tk.StringVar(value="Idle")
+        ttk.Label(run_frame, textvariable=self.batch_status_var).pack(anchor="w")
+        
+        # Result section
+        result_frame = ttk.LabelFrame(parent, text="Batch Summary", padding=10)
+        result_frame.pack(fill="both", expand=True, padx=10, pady=10)
+        
+        self.batch_result_text = scrolledtext.ScrolledText(result_frame, height=12, width=80)
+        self.batch_result_text.pack(fill="both", expand=True)
+        self.batch_result_text.config(state="disabled")
+    
     def create_info_tab(self, parent):
         """Create the System Info tab"""
         info_frame = ttk.Frame(parent, padding=20)
@@ -230,30 +379,87 @@ For more information, visit the documentation or source code.
         info_text.insert("1.0", info_content)
         info_text.config(state="disabled")
     
+    def run_in_background(
+        self,
+        job: Callable,
+        *args,
+        on_done: Optional[Callable] = None,
+        on_progress: Optional[Callable] = None,
+        on_error: Optional[Callable] = None
+    ) -> threading.Event:
+        """
+        Run `job(cancel, *args)` on the worker thread.
+        
+        The callbacks run later on the Tk thread; errors default to a
+        message box. Returns the job's cancel event.
+        """
+        job_id, cancel = self.worker.submit(job, *args)
+        self._callbacks[job_id] = (on_done, on_progress, on_error)
+        return cancel
+    
+    def _poll_worker(self):
+        """Dispatch finished and in-progress worker events to their callbacks"""
+        try:
+            while True:
+                kind, job_id, payload = self.worker.events.get_nowait()
+                on_done, on_progress, on_error = self._callbacks.get(job_id, (None, None, None))
+                if kind == "progress":
+                    if on_progress is not None:
+                        on_progress(payload)
+                    continue
+                del self._callbacks[job_id]
+                if kind == "done":
+                    if on_done is not None:
+                        on_done(payload)
+                elif on_error is not None:
+                    on_error(payload)
+                else:
+                    messagebox.showerror("Processing Error", str(payload))
+        except queue.Empty:
+            pass
+        self.root.after(POLL_INTERVAL_MS, self._poll_worker)
+    
+    def on_close(self):
+        """Stop background work and close the window"""
+        if self.batch_cancel is not None:
+            self.batch_cancel.set()
+        self.worker.close(timeout=1.0)
+        if self.batch_spool is not None:
+            _remove_file(self.batch_spool)
+        self.root.destroy()
+    
     def process_vcs(self):
         """Process VCS quantization"""
         try:
             x = float(self.vcs_x_var.get())
             y = float(self.vcs_y_var.get())
-            
-            # Validate input range
-            if not (0.0 <= x <= 1.0) or not (0.0 <= y <= 1.0):
-                messagebox.showerror("Input Error", "Values must be between 0.0 and 1.0")
-                return
-            
-            # Process through Axiom Hive
-            receipt = self.hive.process([x, y])
-            
-            # Display result
-            self.vcs_result_text.config(state="normal")
-            self.vcs_result_text.delete("1.0", "end")
-            
-            result_text = f"""
+        except ValueError:
+            messagebox.showerror("Input Error", "Please enter valid floating-point numbers")
+            return
+        
+        # Validate input range
+        if not (0.0 <= x <= 1.0) or not (0.0 <= y <= 1.0):
+            messagebox.showerror("Input Error", "Values must be between 0.0 and 1.0")
+            return
+        
+        # Process through Axiom Hive
+        self.run_in_background(
+            lambda cancel: self.hive.process([x, y]),
+            on_done=lambda receipt: self.show_vcs_receipt(receipt, x, y)
+        )
+    
+    def show_vcs_receipt(self, receipt: Dict, x: float, y: float):
+        """Display a quantization receipt"""
+        self.vcs_result_text.config(state="normal")
+        self.vcs_result_text.delete("1.0", "end")
+        
+        result_text = f"""
 QUANTIZATION RECEIPT
 ====================
 
 Timestamp: {receipt['timestamp']}
 Input Hash: {receipt['input_hash']}
+Lattice Hash: {receipt['lattice_hash']}
 
 Input Vector: [{x}, {y}]
 Result: {receipt['result']}
@@ -262,36 +468,39 @@ Residual Energy: {receipt['residual_energy']:.6f}
 
 Nearest States:
 """
-            for i, (label, distance) in enumerate(receipt['nearest_states'], 1):
-                result_text += f"  {i}. {label}: distance = {distance:.6f}\n"
-            
-            result_text += f"""
+        for i, (label, distance) in enumerate(receipt['nearest_states'], 1):
+            result_text += f"  {i}. {label}: distance = {distance:.6f}\n"
+        
+        result_text += f"""
 SECURITY PROPERTIES:
 - Deterministic: ✓ (C=0)
 - Reproducible: ✓ (Same input → Same output)
 - Auditable: ✓ (SHA-256 hash provided)
 - Hallucination-proof: ✓ (Constrained to valid states)
 """
-            
-            self.vcs_result_text.insert("1.0", result_text)
-            self.vcs_result_text.config(state="disabled")
-            
-        except ValueError:
-            messagebox.showerror("Input Error", "Please enter valid floating-point numbers")
+        
+        self.vcs_result_text.insert("1.0", result_text)
+        self.vcs_result_text.config(state="disabled")
     
     def validate_energy(self):
         """Validate energy level"""
         try:
             energy = float(self.energy_var.get())
-            
-            # Validate energy
-            is_valid = self.hamiltonian.validate_energy(energy)
-            
-            # Display result
-            self.ham_result_text.config(state="normal")
-            self.ham_result_text.delete("1.0", "end")
-            
-            result_text = f"""
+        except ValueError:
+            messagebox.showerror("Input Error", "Please enter a valid floating-point number")
+            return
+        
+        self.run_in_background(
+            lambda cancel: self.hamiltonian.validate_energy(energy),
+            on_done=lambda is_valid: self.show_energy_result(energy, is_valid)
+        )
+    
+    def show_energy_result(self, energy: float, is_valid: bool):
+        """Display an energy validation result"""
+        self.ham_result_text.config(state="normal")
+        self.ham_result_text.delete("1.0", "end")
+        
+        result_text = f"""
 ENERGY VALIDATION RESULT
 ========================
 
@@ -310,12 +519,9 @@ Interpretation:
 - This makes hallucination architecturally impossible
 - The system can only work with information present in the input
 """
-            
-            self.ham_result_text.insert("1.0", result_text)
-            self.ham_result_text.config(state="disabled")
-            
-        except ValueError:
-            messagebox.showerror("Input Error", "Please enter a valid floating-point number")
+        
+        self.ham_result_text.insert("1.0", result_text)
+        self.ham_result_text.config(state="disabled")
     
     def validate_logic_chain(self):
         """Validate an example logic chain"""
@@ -342,9 +548,13 @@ Interpretation:
         ]
         
         # Validate
-        result = self.hamiltonian.validate_logic_chain(nodes)
-        
-        # Display result
+        self.run_in_background(
+            lambda cancel: self.hamiltonian.validate_logic_chain(nodes),
+            on_done=self.show_logic_chain_result
+        )
+    
+    def show_logic_chain_result(self, result):
+        """Display the example chain's validation result"""
         self.ham_result_text.config(state="normal")
         self.ham_result_text.delete("1.0", "end")
         
@@ -395,6 +605,212 @@ Interpretation:
         self.ham_result_text.config(state="normal")
         self.ham_result_text.delete("1.0", "end")
         self.ham_result_text.config(state="disabled")
+    
+    def load_batch_file(self):
+        """Choose the file the Batch tab processes"""
+        if self.batch_kind_var.get() == "chains":
+            filetypes = [("Logic chains", "*.json *.ndjson *.jsonl"), ("All files", "*.*")]
+        else:
+            filetypes = [("Vectors", "*.ndjson *.jsonl *.csv *.f64 *.bin *.raw"), ("All files", "*.*")]
+        path = filedialog.askopenfilename(title="Load Batch File", filetypes=filetypes)
+        if not path:
+            return
+        self.batch_path = path
+        self.batch_file_var.set(path)
+        self.batch_start_button.config(state="normal")
+    
+    def start_batch(self):
+        """Stream the loaded file through the engine on the worker"""
+        if self.batch_path is None or self.batch_cancel is not None:
+            return
+        # Drop the previous receipts behind any export still queued on the worker
+        old_spool, self.batch_spool = self.batch_spool, None
+        if old_spool is not None:
+            self.run_in_background(lambda cancel: _remove_file(old_spool))
+        self.batch_unit = "chains" if self.batch_kind_var.get() == "chains" else "rows"
+        self.batch_progress.config(value=0, maximum=1)
+        self.batch_status_var.set("Starting...")
+        self.batch_start_button.config(state="disabled")
+        self.batch_export_button.config(state="disabled")
+        self.batch_cancel_button.config(state="normal")
+        
+        job = self._chain_batch_job if self.batch_kind_var.get() == "chains" else self._vector_batch_job
+        self.batch_cancel = self.run_in_background(
+            job,
+            self.batch_path,
+            on_done=self._batch_finished,
+            on_progress=self._batch_progress,
+            on_error=self._batch_failed
+        )
+    
+    def cancel_batch(self):
+        """Stop the running batch after its current step"""
+        if self.batch_cancel is not None:
+            self.batch_cancel.set()
+            self.batch_cancel_button.config(state="disabled")
+            self.batch_status_var.set("Cancelling...")
+    
+    def export_batch(self):
+        """Copy the last batch's receipts to a chosen file"""
+        if self.batch_spool is None:
+            return
+        path = filedialog.asksaveasfilename(
+            title="Export Receipts",
+            defaultextension=".ndjson",
+            filetypes=[("NDJSON", "*.ndjson"), ("All files", "*.*")]
+        )
+        if not path:
+            return
+        # Read on this thread: a new batch may replace the spool before the job runs
+        spool = self.batch_spool
+        self.batch_status_var.set(f"Exporting to {path}...")
+        self.run_in_background(
+            lambda cancel: shutil.copyfile(spool, path),
+            on_done=lambda _: self.batch_status_var.set(f"Exported receipts to {path}")
+        )
+    
+    def _batch_progress(self, progress: Tuple[int, int, int, float]):
+        done, position, size, rate = progress
+        share = 100 * position / max(size, 1)
+        self.batch_progress.config(value=position, maximum=max(size, 1))
+        self.batch_status_var.set(f"{done:,} {self.batch_unit} · {share:.0f}% · {rate:,.0f} {self.batch_unit}/s")
+    
+    def _batch_finished(self, summary: Dict):
+        self.batch_cancel = None
+        self.batch_spool = summary["spool"]
+        self._batch_progress((summary["done"], summary["position"], summary["size"], summary["rate"]))
+        self.batch_start_button.config(state="normal")
+        self.batch_cancel_button.config(state="disabled")
+        self.batch_export_button.config(state="normal" if summary["done"] else "disabled")
+        
+        result_text = f"""
+BATCH {'CANCELLED' if summary['cancelled'] else 'COMPLETE'}
+{'=' * 15}
+
+File: {summary['path']}
+Processed: {summary['done']:,}{'' if summary['total'] is None else f" of {summary['total']:,}"}
+Elapsed: {summary['seconds']:.3f} s
+Throughput: {summary['rate']:,.0f} {self.batch_unit}/s
+
+Outcomes:
+"""
+        for outcome, count in sorted(summary["outcomes"].items()):
+            result_text += f"  {outcome}: {count:,}\n"
+        
+        self.batch_result_text.config(state="normal")
+        self.batch_result_text.delete("1.0", "end")
+        self.batch_result_text.insert("1.0", result_text)
+        self.batch_result_text.config(state="disabled")
+    
+    def _batch_failed(self, error: Exception):
+        self.batch_cancel = None
+        self.batch_progress.config(value=0)
+        self.batch_status_var.set("Failed")
+        self.batch_start_button.config(state="normal")
+        self.batch_cancel_button.config(state="disabled")
+        messagebox.showerror("Batch Error", str(error))
+    
+    def _vector_batch_job(self, cancel: threading.Event, path: str):
+        """Worker job: fold every vector in a file (NDJSON, CSV or raw float64)."""
+        if path.lower().endswith(RAW_EXTENSIONS):
+            input_format = "raw"
+            total = os.path.getsize(path) // (self.vcs.dim * 8) if self.vcs.dim else 0
+        else:
+            input_format = "csv" if path.lower().endswith(".csv") else "ndjson"
+            with open(path, encoding="utf-8", newline="") as f:
+                total = sum(1 for line in f if line.strip())
+        
+        pipeline = StreamPipeline(self.hive, input_format=input_format, output_format="ndjson", batch_size=BATCH_ROWS)
+        return (yield from self._spool_batches(
+            cancel, path, total, pipeline.iter_chunks(path), lambda receipt: receipt["result"],
+            lambda done: (done, max(total, done))
+        ))
+    
+    def _chain_batch_job(self, cancel: threading.Event, path: str):
+        """Worker job: validate every logic chain in a file (JSON array or NDJSON), one at a time."""
+        size = os.path.getsize(path)
+        with open(path, encoding="utf-8") as f:
+            def results():
+                for nodes in read_chains(f):
+                    result = self.hamiltonian.validate_logic_chain(chain_nodes(nodes))
+                    yield 1, json.dumps(validation_dict(result)) + "\n"
+            
+            # Progress by bytes read, so the file is never counted up front
+            return (yield from self._spool_batches(
+                cancel, path, None, results(), lambda result: "VALID" if result["is_valid"] else "INVALID",
+                lambda done: (min(f.buffer.tell(), size), size)
+            ))
+    
+    def _spool_batches(
+        self,
+        cancel: threading.Event,
+        path: str,
+        total: Optional[int],
+        chunks,
+        outcome: Callable,
+        measure: Callable
+    ):
+        """
+        Write (count, NDJSON text) chunks to a temporary file.
+        
+        Yields (done, position, size, per second) at most every
+        PROGRESS_INTERVAL and returns a summary dict; stops between chunks
+        once `cancel` is set.
+        
+        Args:
+            cancel: Event set by the Cancel button
+            path: Input file, reported in the summary
+            total: Expected item count, or None if unknown until the end
+            chunks: Iterator of (items in chunk, NDJSON lines)
+            outcome: Maps one parsed output line to its summary bucket
+            measure: Maps items done to (position, size) for the progress bar
+        """
+        fd, spool = tempfile.mkstemp(prefix="axiom-batch-", suffix=".ndjson")
+        outcomes: Counter = Counter()
+        done = 0
+        start = last_report = time.perf_counter()
+        try:
+            with os.fdopen(fd, "w", encoding="utf-8", newline="") as out:
+                for n_items, chunk in chunks:
+                    out.write(chunk)
+                    outcomes.update(outcome(json.loads(line)) for line in chunk.splitlines())
+                    done += n_items
+                    now = time.perf_counter()
+                    if now - last_report >= PROGRESS_INTERVAL:
+                        last_report = now
+                        yield (done, *measure(done), done / (now - start))
+                    if cancel.is_set():
+                        break
+        except BaseException:
+            os.remove(spool)
+            raise
+        
+        seconds = time.perf_counter() - start
+        if total is not None:
+            total = max(total, done)
+        elif not cancel.is_set():
+            total = done
+        position, size = measure(done)
+        return {
+            "path": path,
+            "spool": spool,
+            "done": done,
+            "total": total,
+            "position": position,
+            "size": size,
+            "cancelled": cancel.is_set(),
+            "seconds": seconds,
+            "rate": done / seconds if seconds > 0 else 0.0,
+            "outcomes": dict(outcomes),
+        }
+
+
+def _remove_file(path: str):
+    """Delete a file if it still exists"""
+    try:
+        os.remove(path)
+    except OSError:
+        pass
 
 
 def main():
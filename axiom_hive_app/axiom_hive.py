@@ -0,0 +1,379 @@
+"""
+Axiom Hive Command Line
+`python -m axiom_hive` with fold, validate-chain, build-lattice and verify
+subcommands, plus a persistent --serve-stdin mode
+
+Only argparse and json are imported up front; NumPy and the engine are
+imported inside the command that needs them, so argument errors and
+--help return immediately.
+"""
+
+import argparse
+import json
+import sys
+from typing import Dict, Iterator, List, Optional, TextIO
+
+
+def _open_input(path: str, binary: bool = False):
+    """File object for a path, or stdin for "-"."""
+    if path == "-":
+        return sys.stdin.buffer if binary else sys.stdin
+    return open(path, "rb") if binary else open(path, encoding="utf-8", newline="")
+
+
+def _open_output(path: str, binary: bool = False):
+    """File object for a path, or stdout for "-"."""
+    if path == "-":
+        return sys.stdout.buffer if binary else sys.stdout
+    return open(path, "wb") if binary else open(path, "w", encoding="utf-8", newline="")
+
+
+def _close(stream) -> None:
+    """Close a stream unless it is one of the standard streams."""
+    if stream not in (sys.stdin, sys.stdout, sys.stdin.buffer, sys.stdout.buffer):
+        stream.close()
+
+
+def _json_lines(stream: TextIO) -> Iterator:
+    """Parsed value of every non-blank line."""
+    for line in stream:
+        line = line.strip()
+        if line:
+            yield json.loads(line)
+
+
+def _write_json(stream: TextIO, value) -> None:
+    stream.write(json.dumps(value) + "\n")
+
+
+def read_chains(stream: TextIO) -> Iterator[List[Dict]]:
+    """
+    Logic chains as lists of node dicts.
+    
+    Accepts one JSON array of nodes, or NDJSON with one chain (an array
+    of nodes) per line. NDJSON is read a line at a time; only an array
+    spread over several lines is read whole.
+    """
+    for first in stream:
+        if first.strip():
+            break
+    else:
+        return
+    try:
+        chain = json.loads(first)
+    except ValueError:
+        # Not a whole line of JSON: one (pretty-printed) array of nodes
+        document = json.loads(first + stream.read())
+        if not isinstance(document, list) or not all(isinstance(node, dict) for node in document):
+            raise ValueError("Expected a JSON array of logic chain nodes")
+        yield document
+        return
+    yield chain
+    for line in stream:
+        if line.strip():
+            yield json.loads(line)
+
+
+def chain_nodes(nodes: List[Dict]):
+    """LogicNodes from dicts with proposition, truth_value, evidence_ids and node_id."""
+    from axiom_core import LogicNode
+    
+    return [
+        LogicNode(
+            proposition=str(node["proposition"]),
+            truth_value=float(node["truth_value"]),
+            evidence_ids=[str(e) for e in node.get("evidence_ids", [])],
+            node_id=str(node["node_id"])
+        )
+        for node in nodes
+    ]
+
+
+def _validator(args):
+    from axiom_core import HamiltonianValidator
+    
+    return HamiltonianValidator(
+        energy_ceiling=args.energy_ceiling,
+        lambda_threshold=args.lambda_threshold,
+        trace_mode=args.trace_mode
+    )
+
+
+def validation_dict(result) -> Dict:
+    """JSON-ready form of a ValidationResult."""
+    return {
+        "is_valid": result.is_valid,
+        "lambda_score": result.lambda_score,
+        "energy_level": result.energy_level,
+        "violations": list(result.violations),
+        "trace_hash": result.trace_hash,
+        "trace_hash_version": result.trace_hash_version,
+    }
+
+
+def _check_record(hive, record: Dict) -> Dict:
+    """
+    Re-check one receipt or Merkle batch item against its input vector.
+    
+    Receipt records are {"vector", "receipt"}: the vector is folded again
+    and every receipt field except the timestamp and lattice version (a
+    per-process counter; the content hash identifies the lattice) must
+    match. Merkle records are {"vector", "item", "proof"} with an
+    optional "root".
+    """
+    from axiom_core import verify_merkle_item
+    
+    if "proof" in record:
+        ok = verify_merkle_item(record["vector"], record["item"], record["proof"], record.get("root"))
+        return {"ok": ok, "mismatched": [] if ok else ["proof"]}
+    
+    expected = record["receipt"]
+    snapshot = hive.vcs.snapshot
+    fresh = json.loads(json.dumps(hive._receipt(
+        hive.vcs.fold(record["vector"], snapshot),
+        expected.get("timestamp"),
+        snapshot
+    )))
+    mismatched = [
+        key for key, value in fresh.items()
+        if key not in ("timestamp", "lattice_version") and expected.get(key) != value
+    ]
+    return {"ok": not mismatched, "mismatched": mismatched}
+
+
+def cmd_fold(args) -> int:
+    """Fold one vector, or stream vectors from a file or stdin."""
+    from axiom_core import AxiomHive, VectorConstrainedSingularity
+    from axiom_stream import StreamPipeline
+    
+    vcs = VectorConstrainedSingularity.load(args.lattice)
+    hive = AxiomHive(vcs, _validator(args))
+    if args.vector is not None:
+        _write_json(sys.stdout, hive.process(json.loads(args.vector)))
+        return 0
+    
+    output_format = args.output_format or args.input_format
+    source = _open_input(args.input, args.input_format == "raw")
+    sink = _open_output(args.output, output_format == "raw")
+    try:
+        stats = StreamPipeline(
+            hive,
+            input_format=args.input_format,
+            output_format=output_format,
+            batch_size=args.batch_size,
+            dim=args.dim
+        ).run(source, sink)
+    finally:
+        _close(source)
+        _close(sink)
+    if args.stats:
+        print(json.dumps(stats), file=sys.stderr)
+    return 0
+
+
+def cmd_validate_chain(args) -> int:
+    """Validate every chain in the input; exit status 1 if any is invalid."""
+    validator = _validator(args)
+    source = _open_input(args.input)
+    sink = _open_output(args.output)
+    all_valid = True
+    try:
+        for nodes in read_chains(source):
+            result = validator.validate_logic_chain(chain_nodes(nodes))
+            all_valid &= result.is_valid
+            _write_json(sink, validation_dict(result))
+    finally:
+        _close(source)
+        _close(sink)
+    return 0 if all_valid else 1
+
+
+def cmd_build_lattice(args) -> int:
+    """Build a lattice from labelled states and save it."""
+    import csv
+    
+    import numpy as np
+    
+    from axiom_core import VectorConstrainedSingularity
+    
+    source = _open_input(args.input)
+    try:
+        if args.input_format == "csv":
+            rows = [row for row in csv.reader(source) if row]
+            states = [{"label": row[0], "coordinates": [float(x) for x in row[1:]]} for row in rows]
+        else:
+            states = list(_json_lines(source))
+    finally:
+        _close(source)
+    
+    vcs = VectorConstrainedSingularity(
+        threshold=args.threshold,
+        max_states=args.max_states or max(10000, len(states)),
+        tie_break_strategy=args.tie_break,
+        index=args.index
+    )
+    if states:
+        vcs.define_invariants(
+            np.array([state["coordinates"] for state in states], dtype=np.float64),
+            [str(state["label"]) for state in states],
+            [state.get("metadata") for state in states]
+        )
+    content_hash = vcs.save(args.output)
+    _write_json(sys.stdout, {
+        "path": args.output,
+        "n_states": len(states),
+        "dim": vcs.dim,
+        "content_hash": content_hash,
+    })
+    return 0
+
+
+def cmd_verify(args) -> int:
+    """Check a lattice's content hash, then any receipts; exit status 1 on failure."""
+    from axiom_core import AxiomHive, VectorConstrainedSingularity
+    
+    try:
+        vcs = VectorConstrainedSingularity.load(args.lattice, verify=True)
+    except ValueError as e:
+        _write_json(sys.stdout, {"lattice": args.lattice, "ok": False, "error": str(e)})
+        return 1
+    _write_json(sys.stdout, {"lattice": args.lattice, "ok": True, "content_hash": vcs.lattice_hash})
+    if args.input is None:
+        return 0
+    
+    hive = AxiomHive(vcs, _validator(args))
+    source = _open_input(args.input)
+    all_ok = True
+    try:
+        for line, record in enumerate(_json_lines(source), 1):
+            checked = _check_record(hive, record)
+            all_ok &= checked["ok"]
+            _write_json(sys.stdout, {"line": line, **checked})
+    finally:
+        _close(source)
+    return 0 if all_ok else 1
+
+
+def serve_stdin(args) -> int:
+    """
+    Answer NDJSON requests on stdin, one JSON line per request on stdout.
+    
+    The lattice is loaded once and stays warm. Requests carry an "op":
+    "fold" ({"vector"}), "fold_batch" ({"vectors"}), "validate-chain"
+    ({"nodes"}) or "verify" (a receipt or Merkle record, see
+    `_check_record`). An optional "id" is echoed back; a failed request
+    answers {"error"} and the loop continues until stdin closes.
+    """
+    hive = None
+    if args.lattice:
+        from axiom_core import AxiomHive, VectorConstrainedSingularity
+        
+        hive = AxiomHive(VectorConstrainedSingularity.load(args.lattice), _validator(args))
+    validator = hive.hamiltonian if hive is not None else _validator(args)
+    
+    for line in sys.stdin:
+        if not line.strip():
+            continue
+        request: Dict = {}
+        try:
+            request = json.loads(line)
+            op = request.get("op", "fold")
+            if op in ("fold", "fold_batch", "verify") and hive is None:
+                raise ValueError(f"{op} needs --lattice")
+            if op == "fold":
+                response = hive.process(request["vector"])
+            elif op == "fold_batch":
+                import numpy as np
+                
+                response = {"receipts": hive.process_batch(np.asarray(request["vectors"], dtype=np.float64))}
+            elif op == "validate-chain":
+                response = validation_dict(validator.validate_logic_chain(chain_nodes(request["nodes"])))
+            elif op == "verify":
+                response = _check_record(hive, request)
+            else:
+                raise ValueError(f"Unknown op: {op}")
+        except Exception as e:
+            response = {"error": f"{type(e).__name__}: {e}"}
+        if isinstance(request, dict) and "id" in request:
+            response = {"id": request["id"], **response}
+        _write_json(sys.stdout, response)
+        sys.stdout.flush()
+    return 0
+
+
+def _add_validator_options(parser: argparse.ArgumentParser, defaults: bool = True) -> None:
+    """
+    Validator settings, accepted before or after a subcommand.
+    
+    Only the root parser sets defaults; subcommand copies use
+    argparse.SUPPRESS, so they cannot overwrite a value given earlier.
+    """
+    def default(value):
+        return value if defaults else argparse.SUPPRESS
+    parser.add_argument("--energy-ceiling", type=float, default=default(100.0))
+    parser.add_argument("--lambda-threshold", type=float, default=default(1e-9))
+    parser.add_argument("--trace-mode", choices=("stream", "merkle"), default=default("stream"))
+
+
+def build_parser() -> argparse.ArgumentParser:
+    """Argument parser for every subcommand."""
+    parser = argparse.ArgumentParser(prog="python -m axiom_hive", description="Axiom Hive command line")
+    parser.add_argument("--serve-stdin", action="store_true",
+                        help="Answer NDJSON requests on stdin until it closes")
+    parser.add_argument("--lattice", help="With --serve-stdin: lattice file to keep loaded")
+    _add_validator_options(parser)
+    commands = parser.add_subparsers(dest="command")
+    
+    fold = commands.add_parser("fold", help="Fold vectors against a saved lattice")
+    fold.add_argument("lattice", help="Lattice file written by VectorConstrainedSingularity.save")
+    fold.add_argument("--vector", help="Fold this one JSON array instead of reading --input")
+    fold.add_argument("--input", default="-", help="Input path, or - for stdin")
+    fold.add_argument("--output", default="-", help="Output path, or - for stdout")
+    fold.add_argument("--input-format", choices=("ndjson", "csv", "raw"), default="ndjson")
+    fold.add_argument("--output-format", choices=("ndjson", "csv", "raw"))
+    fold.add_argument("--dim", type=int, help="Record width for raw input")
+    fold.add_argument("--batch-size", type=int, default=4096)
+    fold.add_argument("--stats", action="store_true", help="Print throughput stats to stderr")
+    fold.set_defaults(handler=cmd_fold)
+    
+    validate = commands.add_parser("validate-chain", help="Validate logic chains (exit 1 if any is invalid)")
+    validate.add_argument("input", nargs="?", default="-",
+                          help="JSON array of nodes, or NDJSON with one chain per line (- for stdin)")
+    validate.add_argument("--output", default="-", help="Output path, or - for stdout")
+    validate.set_defaults(handler=cmd_validate_chain)
+    
+    build = commands.add_parser("build-lattice", help="Build and save a lattice from labelled states")
+    build.add_argument("output", help="Lattice file to write (plus its .json sidecar)")
+    build.add_argument("--input", default="-",
+                       help='NDJSON {"label", "coordinates", "metadata"} lines or CSV label,x1,x2,... (- for stdin)')
+    build.add_argument("--input-format", choices=("ndjson", "csv"), default="ndjson")
+    build.add_argument("--threshold", type=float, default=0.05)
+    build.add_argument("--max-states", type=int, help="State cap to store (default: 10000 or the number of states)")
+    build.add_argument("--tie-break", choices=("lexicographic", "first", "reject"), default="lexicographic")
+    build.add_argument("--index", choices=("auto", "brute", "kdtree"), default="auto")
+    build.set_defaults(handler=cmd_build_lattice)
+    
+    verify = commands.add_parser("verify", help="Check a lattice hash and receipts (exit 1 on failure)")
+    verify.add_argument("lattice", help="Lattice file to check against its recorded content hash")
+    verify.add_argument("--input", help='NDJSON {"vector", "receipt"} or {"vector", "item", "proof"} records (- for stdin)')
+    verify.set_defaults(handler=cmd_verify)
+    
+    for command in (fold, validate, verify):
+        _add_validator_options(command, defaults=False)
+    return parser
+
+
+def main(argv: Optional[List[str]] = None) -> int:
+    """Run the command line; returns the exit status."""
+    parser = build_parser()
+    args = parser.parse_args(argv)
+    if args.serve_stdin:
+        return serve_stdin(args)
+    if args.command is None:
+        parser.print_help()
+        return 2
+    return args.handler(args)
+
+
+if __name__ == "__main__":
+    sys.exit(main())
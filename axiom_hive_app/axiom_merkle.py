@@ -0,0 +1,181 @@
+"""
+Axiom Hive Merkle Trees
+Hashing primitives and inclusion proofs for batched receipts
+"""
+
+import hashlib
+from typing import Callable, Dict, List, Sequence
+
+import numpy as np
+
+
+HASH_ALGORITHMS = ("sha256", "blake2b")
+DIGEST_SIZE = 32
+
+# Domain separation (as in RFC 6962) so a leaf can never pass for a node
+LEAF_PREFIX = b"\x00"
+NODE_PREFIX = b"\x01"
+
+
+def hasher(algorithm: str) -> Callable:
+    """Constructor for a 32-byte hash object of the named algorithm."""
+    if algorithm == "sha256":
+        return hashlib.sha256
+    if algorithm == "blake2b":
+        return lambda data=b"": hashlib.blake2b(data, digest_size=DIGEST_SIZE)
+    raise ValueError(f"Unknown hash algorithm: {algorithm}")
+
+
+def hash_rows(rows: np.ndarray, algorithm: str = "sha256", prefix: bytes = b"") -> np.ndarray:
+    """
+    Full-length digest of every row of a C-contiguous array.
+    
+    Rows are hashed straight from the array's buffer. Returns an
+    (N x 32) uint8 array.
+    """
+    rows = np.ascontiguousarray(rows)
+    n_rows = rows.shape[0]
+    digests = np.empty((n_rows, DIGEST_SIZE), dtype=np.uint8)
+    if n_rows == 0:
+        return digests
+    
+    base = hasher(algorithm)()
+    base.update(prefix)
+    row_bytes = rows.nbytes // n_rows
+    data = memoryview(rows.reshape(-1)).cast("B") if rows.nbytes else b""
+    out = memoryview(digests.reshape(-1)).cast("B")
+    for i in range(n_rows):
+        h = base.copy()
+        h.update(data[i * row_bytes:(i + 1) * row_bytes])
+        out[i * DIGEST_SIZE:(i + 1) * DIGEST_SIZE] = h.digest()
+    return digests
+
+
+class MerkleTree:
+    """
+    Binary Merkle tree over precomputed leaf hashes.
+    
+    Interior nodes hash NODE_PREFIX + left + right; a node without a
+    sibling is carried up to the next level unchanged. Every level is
+    kept so inclusion proofs cost O(log n) lookups.
+    """
+    
+    def __init__(self, leaves: Sequence[bytes], algorithm: str = "sha256"):
+        """Build the tree over leaf hashes (already prefixed with LEAF_PREFIX)."""
+        self.algorithm = algorithm
+        new = hasher(algorithm)
+        level = [bytes(leaf) for leaf in leaves]
+        self.levels: List[List[bytes]] = [level]
+        while len(level) > 1:
+            parents = [
+                new(NODE_PREFIX + level[i] + level[i + 1]).digest()
+                for i in range(0, len(level) - 1, 2)
+            ]
+            if len(level) % 2:
+                parents.append(level[-1])
+            level = parents
+            self.levels.append(level)
+    
+    def __len__(self) -> int:
+        return len(self.levels[0])
+    
+    def append(self, leaf: bytes) -> None:
+        """Add a leaf at the end, rehashing only its path to the root."""
+        self.levels[0].append(bytes(leaf))
+        self._refresh(len(self.levels[0]) - 1)
+    
+    def update(self, index: int, leaf: bytes) -> None:
+        """Replace leaf `index`, rehashing only its path to the root."""
+        if not 0 <= index < len(self):
+            raise ValueError(f"Leaf index {index} out of range for {len(self)} leaves")
+        self.levels[0][index] = bytes(leaf)
+        self._refresh(index)
+    
+    def _refresh(self, index: int) -> None:
+        """Recompute the ancestors of leaf `index` (O(log n) hashes)."""
+        new = hasher(self.algorithm)
+        depth = 0
+        while len(self.levels[depth]) > 1:
+            level = self.levels[depth]
+            parent = index // 2
+            left = 2 * parent
+            if left + 1 < len(level):
+                value = new(NODE_PREFIX + level[left] + level[left + 1]).digest()
+            else:
+                value = level[left]
+            if depth + 1 == len(self.levels):
+                self.levels.append([])
+            above = self.levels[depth + 1]
+            if parent == len(above):
+                above.append(value)
+            else:
+                above[parent] = value
+            index = parent
+            depth += 1
+    
+    @property
+    def root(self) -> bytes:
+        """Root hash (the hash of nothing for an empty tree)."""
+        if not self.levels[0]:
+            return hasher(self.algorithm)().digest()
+        return self.levels[-1][0]
+    
+    def proof(self, index: int) -> List[bytes]:
+        """Sibling hashes from leaf `index` up to the root."""
+        if not 0 <= index < len(self):
+            raise ValueError(f"Leaf index {index} out of range for {len(self)} leaves")
+        path = []
+        for level in self.levels[:-1]:
+            sibling = index ^ 1
+            if sibling < len(level):
+                path.append(level[sibling])
+            index //= 2
+        return path
+
+
+def verify_proof(
+    leaf: bytes,
+    index: int,
+    size: int,
+    path: Sequence[bytes],
+    root: bytes,
+    algorithm: str = "sha256"
+) -> bool:
+    """Check that `leaf` sits at `index` of a `size`-leaf tree with `root`."""
+    if not 0 <= index < size:
+        return False
+    new = hasher(algorithm)
+    node = bytes(leaf)
+    steps = iter(path)
+    while size > 1:
+        if index % 2:
+            node = new(NODE_PREFIX + next(steps, b"") + node).digest()
+        elif index + 1 < size:
+            node = new(NODE_PREFIX + node + next(steps, b"")).digest()
+        index //= 2
+        size = (size + 1) // 2
+    return next(steps, None) is None and node == bytes(root)
+
+
+def proof_to_dict(tree: MerkleTree, index: int) -> Dict:
+    """Compact, JSON-ready inclusion proof for one leaf."""
+    return {
+        "index": index,
+        "size": len(tree),
+        "algorithm": tree.algorithm,
+        "leaf": tree.levels[0][index].hex(),
+        "path": [node.hex() for node in tree.proof(index)],
+        "root": tree.root.hex(),
+    }
+
+
+def verify_proof_dict(proof: Dict) -> bool:
+    """`verify_proof` for a proof produced by `proof_to_dict`."""
+    return verify_proof(
+        bytes.fromhex(proof["leaf"]),
+        proof["index"],
+        proof["size"],
+        [bytes.fromhex(node) for node in proof["path"]],
+        bytes.fromhex(proof["root"]),
+        proof["algorithm"]
+    )
@@ -0,0 +1,280 @@
+"""
+Axiom Hive Metrics
+Stage latency histograms, outcome counters and a Prometheus text exporter
+"""
+
+import bisect
+import os
+import socketserver
+import threading
+import weakref
+from typing import Dict, List, Optional, Tuple
+
+from axiom_core import QuantizationResult, ValidationResult, VectorConstrainedSingularity
+
+
+# Latency bucket upper bounds in seconds (1 us to 10 s)
+LATENCY_BUCKETS = (
+    1e-6, 2.5e-6, 5e-6, 1e-5, 2.5e-5, 5e-5, 1e-4, 2.5e-4, 5e-4,
+    1e-3, 2.5e-3, 5e-3, 1e-2, 2.5e-2, 5e-2, 0.1, 0.25, 0.5, 1.0, 2.5, 5.0, 10.0
+)
+
+
+class MetricsHook:
+    """
+    Receiver for instrumentation events; every method is a no-op here.
+    
+    Assign an instance to `VectorConstrainedSingularity.metrics`,
+    `HamiltonianValidator.metrics` or pass it to `AxiomHive(metrics=...)`.
+    Instrumented code only checks `metrics is not None` while no hook is
+    set, so instrumentation costs nothing until it is enabled.
+    """
+    
+    def observe_stage(self, stage: str, seconds: float) -> None:
+        """One timed run of a pipeline stage ("scan", "resolve", "hash", ...)."""
+    
+    def count_folds(self, result: QuantizationResult, count: int = 1) -> None:
+        """`count` folds finished with `result`."""
+    
+    def count_chain(self, result: ValidationResult) -> None:
+        """One logic chain was validated."""
+    
+    def watch_lattice(self, vcs: VectorConstrainedSingularity) -> None:
+        """Report size and cache statistics of this lattice from now on."""
+
+
+class Histogram:
+    """Cumulative histogram with fixed bucket bounds, as Prometheus reports it."""
+    
+    def __init__(self, buckets: Tuple[float, ...] = LATENCY_BUCKETS):
+        self.buckets = tuple(buckets)
+        self.counts = [0] * (len(self.buckets) + 1)
+        self.sum = 0.0
+        self.count = 0
+    
+    def observe(self, value: float) -> None:
+        """Record one value (callers hold the owning registry's lock)."""
+        self.counts[bisect.bisect_left(self.buckets, value)] += 1
+        self.sum += value
+        self.count += 1
+    
+    def cumulative(self) -> List[int]:
+        """Count of values at or below each bound, then the total."""
+        totals, running = [], 0
+        for count in self.counts:
+            running += count
+            totals.append(running)
+        return totals
+    
+    def quantile(self, q: float) -> float:
+        """Upper bucket bound containing quantile q (inf past the last bound)."""
+        if not self.count:
+            return 0.0
+        rank = q * self.count
+        for bound, total in zip(self.buckets + (float('inf'),), self.cumulative()):
+            if total >= rank:
+                return bound
+        return float('inf')
+
+
+class Metrics(MetricsHook):
+    """
+    Built-in hook: aggregates events and renders them for Prometheus.
+    
+    Events are also forwarded to any hooks passed in, so custom sinks
+    can be chained behind the built-in aggregation.
+    """
+    
+    def __init__(self, hooks: Optional[List[MetricsHook]] = None, buckets: Tuple[float, ...] = LATENCY_BUCKETS):
+        """
+        Create an empty registry.
+        
+        Args:
+            hooks: Further hooks that receive every event
+            buckets: Latency histogram bucket bounds in seconds
+        """
+        self.hooks = list(hooks or [])
+        self.buckets = buckets
+        self._lock = threading.Lock()
+        self._stages: Dict[str, Histogram] = {}
+        self._folds: Dict[str, int] = {result.value: 0 for result in QuantizationResult}
+        self._chains = {"true": 0, "false": 0}
+        self._violations: Dict[str, int] = {}
+        self._lattices: List[weakref.ref] = []
+    
+    def observe_stage(self, stage: str, seconds: float) -> None:
+        with self._lock:
+            histogram = self._stages.get(stage)
+            if histogram is None:
+                histogram = self._stages[stage] = Histogram(self.buckets)
+            histogram.observe(seconds)
+        for hook in self.hooks:
+            hook.observe_stage(stage, seconds)
+    
+    def count_folds(self, result: QuantizationResult, count: int = 1) -> None:
+        with self._lock:
+            self._folds[result.value] += count
+        for hook in self.hooks:
+            hook.count_folds(result, count)
+    
+    def count_chain(self, result: ValidationResult) -> None:
+        with self._lock:
+            self._chains["true" if result.is_valid else "false"] += 1
+            for violation in result.violations:
+                kind = violation.partition(":")[0]
+                self._violations[kind] = self._violations.get(kind, 0) + 1
+        for hook in self.hooks:
+            hook.count_chain(result)
+    
+    def watch_lattice(self, vcs: VectorConstrainedSingularity) -> None:
+        with self._lock:
+            if not any(ref() is vcs for ref in self._lattices):
+                self._lattices.append(weakref.ref(vcs))
+        for hook in self.hooks:
+            hook.watch_lattice(vcs)
+    
+    def stage(self, stage: str) -> Optional[Histogram]:
+        """Histogram for one stage, or None if it has not run."""
+        return self._stages.get(stage)
+    
+    def snapshot(self) -> Dict:
+        """Counters and per-stage count/mean/p50/p99 (seconds) as a dict."""
+        with self._lock:
+            return {
+                "stages": {
+                    stage: {
+                        "count": histogram.count,
+                        "mean": histogram.sum / histogram.count if histogram.count else 0.0,
+                        "p50": histogram.quantile(0.5),
+                        "p99": histogram.quantile(0.99),
+                    }
+                    for stage, histogram in self._stages.items()
+                },
+                "folds": dict(self._folds),
+                "chains": dict(self._chains),
+                "violations": dict(self._violations),
+            }
+    
+    def render(self) -> str:
+        """All metrics in the Prometheus text exposition format."""
+        lines: List[str] = []
+        with self._lock:
+            lines += [
+                "# HELP axiom_stage_seconds Latency of instrumented pipeline stages",
+                "# TYPE axiom_stage_seconds histogram",
+            ]
+            for stage, histogram in sorted(self._stages.items()):
+                bounds = [_format_value(bound) for bound in histogram.buckets] + ["+Inf"]
+                for bound, total in zip(bounds, histogram.cumulative()):
+                    lines.append(f'axiom_stage_seconds_bucket{{stage="{stage}",le="{bound}"}} {total}')
+                lines.append(f'axiom_stage_seconds_sum{{stage="{stage}"}} {_format_value(histogram.sum)}')
+                lines.append(f'axiom_stage_seconds_count{{stage="{stage}"}} {histogram.count}')
+            
+            lines += [
+                "# HELP axiom_fold_results_total Folds by quantization result",
+                "# TYPE axiom_fold_results_total counter",
+            ]
+            lines += [f'axiom_fold_results_total{{result="{result}"}} {count}' for result, count in self._folds.items()]
+            
+            lines += [
+                "# HELP axiom_chain_validations_total Logic chains validated, by outcome",
+                "# TYPE axiom_chain_validations_total counter",
+            ]
+            lines += [f'axiom_chain_validations_total{{valid="{valid}"}} {count}' for valid, count in self._chains.items()]
+            
+            lines += [
+                "# HELP axiom_lambda_violations_total Logic chain violations, by kind",
+                "# TYPE axiom_lambda_violations_total counter",
+            ]
+            lines += [f'axiom_lambda_violations_total{{kind="{kind}"}} {count}' for kind, count in sorted(self._violations.items())]
+            
+            self._lattices = [ref for ref in self._lattices if ref() is not None]
+            lattices = [ref() for ref in self._lattices]
+        
+        lines += _lattice_lines([vcs for vcs in lattices if vcs is not None])
+        return "\n".join(lines) + "\n"
+    
+    def write_textfile(self, path: str) -> None:
+        """Atomically write `render()` to a file (e.g. for node_exporter's textfile collector)."""
+        tmp_path = path + ".tmp"
+        with open(tmp_path, "w", encoding="utf-8") as f:
+            f.write(self.render())
+        os.replace(tmp_path, path)
+    
+    def serve(self, host: str = "127.0.0.1", port: int = 9464) -> "MetricsServer":
+        """Expose `render()` over HTTP on a TCP port from a background thread."""
+        return MetricsServer(self, socketserver.ThreadingTCPServer, (host, port))
+    
+    def serve_unix(self, path: str) -> "MetricsServer":
+        """Expose `render()` over HTTP on a Unix domain socket."""
+        return MetricsServer(self, socketserver.ThreadingUnixStreamServer, path)
+
+
+def _format_value(value: float) -> str:
+    """Prometheus float formatting (shortest repr, +Inf/-Inf/NaN spelled out)."""
+    if value != value:
+        return "NaN"
+    if value in (float('inf'), float('-inf')):
+        return "+Inf" if value > 0 else "-Inf"
+    return repr(float(value))
+
+
+def _lattice_lines(lattices: List[VectorConstrainedSingularity]) -> List[str]:
+    """Gauge and counter lines for the watched lattices."""
+    gauges = [
+        ("axiom_lattice_states", "gauge", "States in the lattice", lambda vcs, _: vcs.coordinates.shape[0]),
+        ("axiom_lattice_generation", "gauge", "Lattice mutation counter", lambda vcs, _: vcs.generation),
+        ("axiom_fold_cache_size", "gauge", "Entries in the fold cache", lambda _, info: info["size"]),
+        ("axiom_fold_cache_capacity", "gauge", "Fold cache capacity", lambda _, info: info["capacity"]),
+        ("axiom_fold_cache_hits_total", "counter", "Fold cache hits", lambda _, info: info["hits"]),
+        ("axiom_fold_cache_misses_total", "counter", "Fold cache misses", lambda _, info: info["misses"]),
+        ("axiom_fold_cache_evictions_total", "counter", "Fold cache evictions", lambda _, info: info["evictions"]),
+        ("axiom_fold_cache_invalidations_total", "counter", "Fold cache flushes on lattice change",
+         lambda _, info: info["invalidations"]),
+    ]
+    infos = [vcs.cache_info() for vcs in lattices]
+    lines = []
+    for name, kind, help_text, value in gauges:
+        lines += [f"# HELP {name} {help_text}", f"# TYPE {name} {kind}"]
+        for i, (vcs, info) in enumerate(zip(lattices, infos)):
+            lines.append(f'{name}{{lattice="{i}"}} {value(vcs, info)}')
+    return lines
+
+
+class _MetricsHandler(socketserver.StreamRequestHandler):
+    """Answer any HTTP request with the current metrics."""
+    
+    def handle(self) -> None:
+        while self.rfile.readline() not in (b"\r\n", b"\n", b""):
+            pass
+        body = self.server.metrics.render().encode("utf-8")
+        self.wfile.write(
+            b"HTTP/1.0 200 OK\r\n"
+            b"Content-Type: text/plain; version=0.0.4; charset=utf-8\r\n"
+            + f"Content-Length: {len(body)}\r\n\r\n".encode("latin-1")
+            + body
+        )
+
+
+class MetricsServer:
+    """Background HTTP listener serving one `Metrics` registry."""
+    
+    def __init__(self, metrics: Metrics, server_class, address):
+        self._server = server_class(address, _MetricsHandler)
+        self._server.daemon_threads = True
+        self._server.metrics = metrics
+        self.address = self._server.server_address
+        self._thread = threading.Thread(target=self._server.serve_forever, name="axiom-metrics", daemon=True)
+        self._thread.start()
+    
+    def close(self) -> None:
+        """Stop listening."""
+        self._server.shutdown()
+        self._server.server_close()
+        self._thread.join()
+    
+    def __enter__(self) -> "MetricsServer":
+        return self
+    
+    def __exit__(self, *exc) -> None:
+        self.close()
@@ -0,0 +1,416 @@
+"""
+Axiom Hive Parallel Execution
+Multi-core fold over a lattice shared through multiprocessing.shared_memory,
+and multi-chain validation over a process pool
+"""
+
+import multiprocessing
+import os
+import time
+from concurrent.futures import FIRST_COMPLETED, ProcessPoolExecutor, wait
+from dataclasses import replace
+from multiprocessing import shared_memory
+from typing import Dict, Iterable, Iterator, List, Optional, Tuple, Union
+
+import numpy as np
+
+from axiom_core import (
+    HamiltonianValidator,
+    LogicChain,
+    LogicNode,
+    VectorConstrainedSingularity,
+    QuantizationBatch,
+    ValidationResult,
+    _decode_label_table,
+    _label_table
+)
+
+
+# Per-worker state, set once by the pool initializer
+_worker_vcs: Optional[VectorConstrainedSingularity] = None
+_worker_validator: Optional[HamiltonianValidator] = None
+_worker_blocks: Dict[str, shared_memory.SharedMemory] = {}
+
+
+def _attach(name: str) -> shared_memory.SharedMemory:
+    """Attach to a block owned by the parent without taking over its cleanup."""
+    block = _worker_blocks.get(name)
+    if block is None:
+        try:
+            block = shared_memory.SharedMemory(name=name, track=False)
+        except TypeError:
+            # Python < 3.13 registers every attach with the resource tracker
+            # shared with the parent, which then reports (or unlinks) the
+            # parent's block when workers exit. Skip the registration.
+            from multiprocessing import resource_tracker
+            register = resource_tracker.register
+            resource_tracker.register = lambda *args, **kwargs: None
+            try:
+                block = shared_memory.SharedMemory(name=name)
+            finally:
+                resource_tracker.register = register
+        _worker_blocks[name] = block
+    return block
+
+
+def _init_worker(
+    coords_name: str,
+    shape: Tuple[int, int],
+    labels_name: str,
+    labels_size: int,
+    settings: Dict
+) -> None:
+    """Pool initializer: map the shared lattice into this worker."""
+    global _worker_vcs
+    coords = np.ndarray(shape, dtype=np.float64, buffer=_attach(coords_name).buf)
+    coords.flags.writeable = False
+    table = bytes(_attach(labels_name).buf[:labels_size])
+    _worker_vcs = VectorConstrainedSingularity.from_arrays(
+        coords,
+        _decode_label_table(table, shape[0]),
+        **settings
+    )
+
+
+def _fold_shard(
+    inputs_name: str,
+    shape: Tuple[int, int],
+    start: int,
+    stop: int,
+    max_chunk_bytes: int
+) -> Tuple[np.ndarray, ...]:
+    """Fold rows [start, stop) of the shared input block."""
+    inputs = np.ndarray(shape, dtype=np.float64, buffer=_attach(inputs_name).buf)
+    batch = _worker_vcs.fold_batch(inputs[start:stop], max_chunk_bytes=max_chunk_bytes)
+    # Drop the attachment so the parent can free the block after this call
+    _worker_blocks.pop(inputs_name).close()
+    return (
+        batch.result_codes,
+        batch.label_index,
+        batch.residual_energy,
+        batch.nearest_indptr,
+        batch.nearest_index,
+        batch.nearest_distance,
+        batch.input_hashes,
+    )
+
+
+class ParallelFold:
+    """
+    Process pool that folds batches against one shared copy of a lattice.
+    
+    The lattice coordinates and label table are copied once into shared
+    memory; workers map them read-only instead of receiving pickled
+    copies. Each call to `fold_batch` places its input in a shared block,
+    shards the rows across workers and reassembles the results in input
+    order, so the output is identical to `vcs.fold_batch` on one core.
+    
+    The pool is bound to the lattice snapshot current at construction, and
+    its batches report that snapshot; create a new pool to fold against a
+    later version.
+    """
+    
+    def __init__(
+        self,
+        vcs: VectorConstrainedSingularity,
+        workers: Optional[int] = None,
+        mp_context: Optional[str] = None
+    ):
+        """
+        Start the worker pool.
+        
+        Args:
+            vcs: Lattice and settings to fold against
+            workers: Number of worker processes (default: CPU count)
+            mp_context: multiprocessing start method ("fork", "spawn", ...)
+        """
+        self.vcs = vcs
+        self.snapshot = vcs.snapshot
+        self.workers = workers or os.cpu_count() or 1
+        self._blocks = []
+        self._labels = np.empty(len(self.snapshot), dtype=object)
+        self._labels[:] = self.snapshot.labels
+        
+        coords = np.ascontiguousarray(self.snapshot.coordinates)
+        table = _label_table(self.snapshot.labels)
+        coords_block = self._share(coords.nbytes)
+        np.ndarray(coords.shape, dtype=np.float64, buffer=coords_block.buf)[:] = coords
+        labels_block = self._share(len(table))
+        labels_block.buf[:len(table)] = table
+        
+        settings = {
+            "threshold": vcs.threshold,
+            "max_states": vcs.max_states,
+            "tie_break_strategy": vcs.tie_break_strategy,
+            "index": vcs.index,
+            "precision": vcs.precision,
+        }
+        self._pool = ProcessPoolExecutor(
+            max_workers=self.workers,
+            mp_context=multiprocessing.get_context(mp_context),
+            initializer=_init_worker,
+            initargs=(coords_block.name, coords.shape, labels_block.name, len(table), settings)
+        )
+    
+    def _share(self, size: int) -> shared_memory.SharedMemory:
+        """Create a shared block owned (and later unlinked) by this pool."""
+        block = shared_memory.SharedMemory(create=True, size=max(size, 1))
+        self._blocks.append(block)
+        return block
+    
+    def fold_batch(
+        self,
+        vectors: np.ndarray,
+        shards_per_worker: int = 4,
+        max_chunk_bytes: int = 64 * 1024 * 1024
+    ) -> QuantizationBatch:
+        """
+        Quantize an (N x D) array across the worker pool.
+        
+        Rows are split into contiguous shards (several per worker for load
+        balancing); the result equals `vcs.fold_batch(vectors)`.
+        """
+        batch = np.ascontiguousarray(vectors, dtype=np.float64)
+        if batch.ndim != 2:
+            raise ValueError(f"Batch input must be two-dimensional, got shape {batch.shape}")
+        
+        n_rows = batch.shape[0]
+        n_shards = max(1, min(n_rows, self.workers * shards_per_worker))
+        bounds = np.linspace(0, n_rows, n_shards + 1).astype(np.int64).tolist()
+        
+        inputs = shared_memory.SharedMemory(create=True, size=max(batch.nbytes, 1))
+        try:
+            np.ndarray(batch.shape, dtype=np.float64, buffer=inputs.buf)[:] = batch
+            futures = [
+                self._pool.submit(_fold_shard, inputs.name, batch.shape, start, stop, max_chunk_bytes)
+                for start, stop in zip(bounds[:-1], bounds[1:])
+            ]
+            shards = [future.result() for future in futures]
+        finally:
+            inputs.close()
+            inputs.unlink()
+        
+        (codes, label_index, residual, indptrs,
+         nearest_index, nearest_distance, hashes) = zip(*shards)
+        offsets = np.cumsum([0] + [indptr[-1] for indptr in indptrs[:-1]])
+        indptr = np.concatenate(
+            [np.zeros(1, dtype=np.int64)]
+            + [part[1:] + offset for part, offset in zip(indptrs, offsets)]
+        )
+        
+        return QuantizationBatch(
+            result_codes=np.concatenate(codes),
+            label_index=np.concatenate(label_index),
+            residual_energy=np.concatenate(residual),
+            nearest_indptr=indptr,
+            nearest_index=np.concatenate(nearest_index),
+            nearest_distance=np.concatenate(nearest_distance),
+            input_hashes=np.concatenate(hashes),
+            labels=self._labels,
+            snapshot=self.snapshot
+        )
+    
+    def close(self) -> None:
+        """Shut down the workers and free the shared lattice."""
+        self._pool.shutdown()
+        for block in self._blocks:
+            block.close()
+            block.unlink()
+        self._blocks = []
+    
+    def __enter__(self) -> "ParallelFold":
+        return self
+    
+    def __exit__(self, *exc) -> None:
+        self.close()
+
+
+def _pack_chain(chain: Union[List[LogicNode], LogicChain]) -> Tuple:
+    """
+    Compact wire form of a chain: its columns as raw bytes.
+    
+    Strings travel as `_label_table` blobs and numbers as little-endian
+    arrays, so pickling is a handful of byte strings instead of one
+    object graph per node. Evidence that names a node in the chain is
+    sent as that node's row; only unresolved ids are sent as strings.
+    A node list's truth values that print differently as float64 (an
+    int 1 is "1", not "1.0") are also sent as their text, so the trace
+    hash matches `validate_logic_chain(nodes)`.
+    """
+    retraced, texts = [], []
+    if not isinstance(chain, LogicChain):
+        for i, node in enumerate(chain):
+            value = node.truth_value
+            if type(value) is not float and f"{value}" != f"{float(value)}":
+                retraced.append(i)
+                texts.append(f"{value}")
+        chain = LogicChain.from_nodes(chain)
+    rows = chain.evidence_rows
+    unresolved = rows < 0
+    rows = rows.copy()
+    rows[unresolved] = -1 - np.arange(np.count_nonzero(unresolved))
+    return (
+        len(chain),
+        np.ascontiguousarray(chain.truth_values, dtype="<f8").tobytes(),
+        np.ascontiguousarray(chain.evidence_indptr, dtype="<i8").tobytes(),
+        rows.astype("<i8").tobytes(),
+        _label_table(chain.node_ids.tolist()),
+        _label_table(chain.propositions.tolist()),
+        _label_table(chain.evidence_ids[unresolved].tolist()),
+        np.asarray(retraced, dtype="<i8").tobytes(),
+        _label_table(texts),
+    )
+
+
+def _unpack_chain(packed: Tuple) -> Tuple[LogicChain, Optional[LogicChain]]:
+    """
+    Inverse of `_pack_chain`.
+    
+    Returns the chain and, when some truth values were sent as text, the
+    same chain with those texts in its truth value column, for hashing
+    its trace (None otherwise).
+    """
+    n_nodes, truth, indptr, rows, node_ids, propositions, unresolved, retraced, texts = packed
+    rows = np.frombuffer(rows, dtype="<i8").astype(np.int64)
+    
+    def strings(table: bytes, count: int) -> np.ndarray:
+        column = np.empty(count, dtype=object)
+        column[:] = _decode_label_table(table, count)
+        return column
+    
+    node_ids = strings(node_ids, n_nodes)
+    missing = rows < 0
+    evidence_ids = np.empty(len(rows), dtype=object)
+    evidence_ids[~missing] = node_ids[rows[~missing]]
+    evidence_ids[missing] = strings(unresolved, int(np.count_nonzero(missing)))
+    chain = LogicChain(
+        node_ids,
+        strings(propositions, n_nodes),
+        np.frombuffer(truth, dtype="<f8").astype(np.float64),
+        np.frombuffer(indptr, dtype="<i8").astype(np.int64),
+        evidence_ids
+    )
+    
+    retraced = np.frombuffer(retraced, dtype="<i8")
+    if not len(retraced):
+        return chain, None
+    truth_texts = chain.truth_values.astype(object)
+    truth_texts[retraced] = strings(texts, len(retraced))
+    return chain, LogicChain(
+        chain.node_ids, chain.propositions, truth_texts, chain.evidence_indptr, chain.evidence_ids
+    )
+
+
+def _init_validator(settings: Dict) -> None:
+    """Pool initializer: build this worker's validator."""
+    global _worker_validator
+    _worker_validator = HamiltonianValidator(**settings)
+
+
+def _validate_packed(index: int, packed: Tuple) -> Tuple[int, ValidationResult, float]:
+    """Validate one packed chain; returns its index, result and seconds taken."""
+    start = time.perf_counter()
+    chain, trace_chain = _unpack_chain(packed)
+    result = _worker_validator.validate_logic_chain(chain)
+    if trace_chain is not None:
+        result = replace(result, trace_hash=_worker_validator._hash_chain(trace_chain))
+    return index, result, time.perf_counter() - start
+
+
+class ParallelValidator:
+    """
+    Process pool that validates many independent logic chains.
+    
+    Chains are sent in a compact columnar form (see `_pack_chain`) and
+    validated as `LogicChain`s, so truth values are compared as float64;
+    trace hashes still use each node's own truth value text. At most `max_in_flight` chains are packed and queued at a time, so
+    an arbitrarily long iterable of chains can be streamed through.
+    """
+    
+    def __init__(
+        self,
+        validator: Optional[HamiltonianValidator] = None,
+        workers: Optional[int] = None,
+        mp_context: Optional[str] = None,
+        max_in_flight: Optional[int] = None
+    ):
+        """
+        Start the worker pool.
+        
+        Args:
+            validator: Settings to validate with (default: a default validator)
+            workers: Number of worker processes (default: CPU count)
+            mp_context: multiprocessing start method ("fork", "spawn", ...)
+            max_in_flight: Chains queued at once (default: 4 per worker)
+        """
+        validator = validator or HamiltonianValidator()
+        self.workers = workers or os.cpu_count() or 1
+        self.max_in_flight = max_in_flight or 4 * self.workers
+        settings = {
+            "energy_ceiling": validator.energy_ceiling,
+            "lambda_threshold": validator.lambda_threshold,
+            "trace_mode": validator.trace_mode,
+        }
+        self._pool = ProcessPoolExecutor(
+            max_workers=self.workers,
+            mp_context=multiprocessing.get_context(mp_context),
+            initializer=_init_validator,
+            initargs=(settings,)
+        )
+    
+    def iter_validate(
+        self,
+        chains: Iterable[Union[List[LogicNode], LogicChain]]
+    ) -> Iterator[Tuple[int, ValidationResult, float]]:
+        """
+        Yield (index, result, seconds) for each chain as soon as it finishes.
+        
+        Results arrive in completion order; `index` is the chain's
+        position in `chains` and `seconds` its validation time in the
+        worker.
+        """
+        pending = set()
+        for index, chain in enumerate(chains):
+            if len(pending) >= self.max_in_flight:
+                done, pending = wait(pending, return_when=FIRST_COMPLETED)
+                for future in done:
+                    yield future.result()
+            pending.add(self._pool.submit(_validate_packed, index, _pack_chain(chain)))
+        
+        while pending:
+            done, pending = wait(pending, return_when=FIRST_COMPLETED)
+            for future in done:
+                yield future.result()
+    
+    def validate_many(
+        self,
+        chains: Iterable[Union[List[LogicNode], LogicChain]]
+    ) -> Tuple[List[ValidationResult], np.ndarray]:
+        """Validate every chain; returns results and per-chain seconds, in input order."""
+        results: Dict[int, ValidationResult] = {}
+        seconds: Dict[int, float] = {}
+        for index, result, elapsed in self.iter_validate(chains):
+            results[index] = result
+            seconds[index] = elapsed
+        order = range(len(results))
+        return [results[i] for i in order], np.array([seconds[i] for i in order])
+    
+    def close(self) -> None:
+        """Shut down the workers."""
+        self._pool.shutdown()
+    
+    def __enter__(self) -> "ParallelValidator":
+        return self
+    
+    def __exit__(self, *exc) -> None:
+        self.close()
+
+
+def validate_many(
+    chains: Iterable[Union[List[LogicNode], LogicChain]],
+    validator: Optional[HamiltonianValidator] = None,
+    workers: Optional[int] = None
+) -> Tuple[List[ValidationResult], np.ndarray]:
+    """One-shot `ParallelValidator.validate_many` with a temporary pool."""
+    with ParallelValidator(validator, workers=workers) as pool:
+        return pool.validate_many(chains)
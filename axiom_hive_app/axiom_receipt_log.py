@@ -0,0 +1,335 @@
+"""
+Axiom Hive Receipt Log
+Durable, append-only, segmented log of receipts with an input_hash index
+"""
+
+import bisect
+import glob
+import json
+import os
+import queue
+import struct
+import threading
+import zlib
+from typing import Dict, Iterator, List, Optional, Tuple
+
+SEGMENT_MAGIC = b"AXRLOG01"
+
+# Record: payload length, CRC-32 of the payload, then the UTF-8 JSON payload
+_RECORD_HEADER = struct.Struct("<II")
+# Index entry: 16-character input_hash, byte offset of the record in its segment
+_INDEX_ENTRY = struct.Struct("<16sQ")
+
+_CLOSE = object()
+
+
+class ReceiptLog:
+    """
+    Append-only receipt log written by a background thread.
+    
+    `append` only places the receipt on a bounded queue; the writer
+    thread serializes queued receipts, writes them as length-prefixed
+    records and makes the whole group durable with one fsync (group
+    commit). Segments rotate as soon as a record takes them past
+    `segment_bytes`, even in the middle of a group. Every
+    segment has an index file mapping input_hash to record offset, kept
+    in memory as a dict for O(1) `find`. On open, a torn tail left by a
+    crash is truncated along with any index entries pointing into it, and
+    any records missing from the index are re-indexed.
+    """
+    
+    def __init__(
+        self,
+        directory: str,
+        segment_bytes: int = 64 * 1024 * 1024,
+        group_commit_records: int = 4096,
+        group_commit_interval: float = 0.005,
+        queue_size: int = 65536,
+        fsync: bool = True
+    ):
+        """
+        Open (or create) the log.
+        
+        Args:
+            directory: Directory holding the segment and index files
+            segment_bytes: Size after which a new segment is started
+            group_commit_records: Most records made durable by one fsync
+            group_commit_interval: Seconds to keep gathering a group after its first record
+            queue_size: Receipts buffered before `append` blocks
+            fsync: Whether commits call fsync (disable only for tests and benchmarks)
+        """
+        self.directory = directory
+        self.segment_bytes = segment_bytes
+        self.group_commit_records = group_commit_records
+        self.group_commit_interval = group_commit_interval
+        self.fsync = fsync
+        os.makedirs(directory, exist_ok=True)
+        
+        self._index: Dict[str, Tuple[int, int]] = {}
+        self._segments: List[int] = sorted(
+            int(os.path.basename(path)[9:17])
+            for path in glob.glob(os.path.join(directory, "receipts-*.log"))
+        )
+        # Recover first, so only the repaired index files are loaded
+        if self._segments:
+            self._recover(self._segments[-1])
+        else:
+            self._segments.append(1)
+        for segment in self._segments:
+            self._load_index(segment)
+        self._open_segment(self._segments[-1])
+        
+        self._queue: queue.Queue = queue.Queue(maxsize=queue_size)
+        self._committed = 0
+        self._submitted = 0
+        self._commit_cond = threading.Condition()
+        self._error: Optional[BaseException] = None
+        self._writer = threading.Thread(target=self._run_writer, name="axiom-receipt-log", daemon=True)
+        self._writer.start()
+    
+    def _path(self, segment: int, suffix: str) -> str:
+        return os.path.join(self.directory, f"receipts-{segment:08d}.{suffix}")
+    
+    def _load_index(self, segment: int) -> None:
+        """Read one segment's index file into the in-memory index."""
+        try:
+            with open(self._path(segment, "idx"), "rb") as f:
+                data = f.read()
+        except FileNotFoundError:
+            return
+        usable = len(data) - len(data) % _INDEX_ENTRY.size
+        for input_hash, offset in _INDEX_ENTRY.iter_unpack(data[:usable]):
+            self._index[input_hash.decode("ascii")] = (segment, offset)
+    
+    def _recover(self, segment: int) -> None:
+        """
+        Truncate a torn tail, with any index entries pointing into it, and
+        index records the index file missed.
+        """
+        path = self._path(segment, "log")
+        idx_path = self._path(segment, "idx")
+        
+        indexed = []
+        if os.path.exists(idx_path):
+            with open(idx_path, "rb") as f:
+                data = f.read()
+            usable = len(data) - len(data) % _INDEX_ENTRY.size
+            if usable != len(data):
+                os.truncate(idx_path, usable)
+            indexed = [offset for _, offset in _INDEX_ENTRY.iter_unpack(data[:usable])]
+        indexed_to = indexed[-1] if indexed else -1
+        
+        entries = []
+        valid_end = len(SEGMENT_MAGIC)
+        with open(path, "rb") as f:
+            if f.read(len(SEGMENT_MAGIC)) != SEGMENT_MAGIC:
+                raise ValueError(f"{path} is not a receipt log segment")
+            for offset, payload in _iter_records(f, len(SEGMENT_MAGIC)):
+                valid_end = offset + _RECORD_HEADER.size + len(payload)
+                if offset <= indexed_to:
+                    continue
+                input_hash = json.loads(payload).get("input_hash")
+                if input_hash:
+                    entries.append((input_hash, offset))
+        
+        if valid_end < os.path.getsize(path):
+            os.truncate(path, valid_end)
+        if indexed_to >= valid_end:
+            # Entries are in offset order; drop those past the last whole record
+            os.truncate(idx_path, bisect.bisect_left(indexed, valid_end) * _INDEX_ENTRY.size)
+        if entries:
+            with open(idx_path, "ab") as f:
+                for input_hash, offset in entries:
+                    f.write(_INDEX_ENTRY.pack(input_hash.encode("ascii"), offset))
+    
+    def _open_segment(self, segment: int) -> None:
+        """Make `segment` the active segment, creating it if needed."""
+        path = self._path(segment, "log")
+        created = not os.path.exists(path)
+        self._log_file = open(path, "ab")
+        self._idx_file = open(self._path(segment, "idx"), "ab")
+        if created:
+            self._log_file.write(SEGMENT_MAGIC)
+            self._log_file.flush()
+            if self.fsync:
+                os.fsync(self._log_file.fileno())
+                _fsync_dir(self.directory)
+        self._active = segment
+        self._offset = self._log_file.tell()
+    
+    def _rotate(self) -> None:
+        """Close the active segment and start the next one."""
+        self._log_file.close()
+        self._idx_file.close()
+        self._segments.append(self._active + 1)
+        self._open_segment(self._active + 1)
+    
+    def append(self, receipt: Dict, block: bool = True, timeout: Optional[float] = None) -> None:
+        """
+        Queue a receipt for writing and return immediately.
+        
+        Blocks only while the queue is full (or raises queue.Full if
+        `block` is False or `timeout` expires). Use `flush` to wait until
+        it is durable.
+        """
+        if self._error is not None:
+            raise RuntimeError("Receipt log writer failed") from self._error
+        self._queue.put(receipt, block, timeout)
+        with self._commit_cond:
+            self._submitted += 1
+    
+    def append_many(self, receipts: List[Dict]) -> None:
+        """Queue several receipts in order."""
+        for receipt in receipts:
+            self.append(receipt)
+    
+    def flush(self, timeout: Optional[float] = None) -> bool:
+        """Wait until every receipt appended so far is durable."""
+        with self._commit_cond:
+            target = self._submitted
+            done = self._commit_cond.wait_for(
+                lambda: self._committed >= target or self._error is not None,
+                timeout
+            )
+        if self._error is not None:
+            raise RuntimeError("Receipt log writer failed") from self._error
+        return done
+    
+    def _run_writer(self) -> None:
+        """Writer thread: gather groups, write, fsync once per group."""
+        closing = False
+        while not closing:
+            group = [self._queue.get()]
+            if group[0] is _CLOSE:
+                break
+            try:
+                while len(group) < self.group_commit_records:
+                    try:
+                        item = self._queue.get(timeout=self.group_commit_interval)
+                    except queue.Empty:
+                        break
+                    if item is _CLOSE:
+                        closing = True
+                        break
+                    group.append(item)
+                self._commit(group)
+            except BaseException as e:
+                with self._commit_cond:
+                    self._error = e
+                    self._commit_cond.notify_all()
+                return
+            with self._commit_cond:
+                self._committed += len(group)
+                self._commit_cond.notify_all()
+    
+    def _commit(self, group: List[Dict]) -> None:
+        """Write one group of receipts and make it durable, rotating as segments fill."""
+        chunks: List[bytes] = []
+        entries: List[Tuple[str, int]] = []
+        for receipt in group:
+            payload = json.dumps(receipt, separators=(",", ":")).encode("utf-8")
+            input_hash = receipt.get("input_hash")
+            if input_hash:
+                entries.append((input_hash, self._offset))
+            chunks.append(_RECORD_HEADER.pack(len(payload), zlib.crc32(payload)))
+            chunks.append(payload)
+            self._offset += _RECORD_HEADER.size + len(payload)
+            if self._offset >= self.segment_bytes:
+                self._write(chunks, entries)
+                self._rotate()
+                chunks, entries = [], []
+        
+        if chunks:
+            self._write(chunks, entries)
+    
+    def _write(self, chunks: List[bytes], entries: List[Tuple[str, int]]) -> None:
+        """Write records and their index entries to the active segment and make them durable."""
+        self._log_file.write(b"".join(chunks))
+        self._log_file.flush()
+        self._idx_file.write(b"".join(
+            _INDEX_ENTRY.pack(input_hash.encode("ascii"), offset) for input_hash, offset in entries
+        ))
+        self._idx_file.flush()
+        if self.fsync:
+            os.fsync(self._log_file.fileno())
+            os.fsync(self._idx_file.fileno())
+        
+        for input_hash, offset in entries:
+            self._index[input_hash] = (self._active, offset)
+    
+    def find(self, input_hash: str) -> Optional[Dict]:
+        """Latest durable receipt for an input hash, or None."""
+        location = self._index.get(input_hash)
+        if location is None:
+            return None
+        segment, offset = location
+        with open(self._path(segment, "log"), "rb") as f:
+            header = os.pread(f.fileno(), _RECORD_HEADER.size, offset)
+            length, _ = _RECORD_HEADER.unpack(header)
+            return json.loads(os.pread(f.fileno(), length, offset + _RECORD_HEADER.size))
+    
+    def scan(self) -> Iterator[Dict]:
+        """Every durable receipt in append order."""
+        for payload in self.scan_raw():
+            yield json.loads(payload)
+    
+    def scan_raw(self) -> Iterator[bytes]:
+        """Every durable record payload (UTF-8 JSON) in append order."""
+        for segment in list(self._segments):
+            with open(self._path(segment, "log"), "rb") as f:
+                if f.read(len(SEGMENT_MAGIC)) != SEGMENT_MAGIC:
+                    raise ValueError(f"Segment {segment} is not a receipt log segment")
+                for _, payload in _iter_records(f, len(SEGMENT_MAGIC)):
+                    yield payload
+    
+    def close(self) -> None:
+        """Write everything still queued, then stop the writer."""
+        if self._writer.is_alive():
+            self._queue.put(_CLOSE)
+            self._writer.join()
+        self._log_file.close()
+        self._idx_file.close()
+        if self._error is not None:
+            raise RuntimeError("Receipt log writer failed") from self._error
+    
+    def __enter__(self) -> "ReceiptLog":
+        return self
+    
+    def __exit__(self, *exc) -> None:
+        self.close()
+
+
+def _iter_records(f, offset: int, chunk_bytes: int = 1 << 20) -> Iterator[Tuple[int, bytes]]:
+    """(offset, payload) for each intact record, stopping at a torn or corrupt one."""
+    buffer = b""
+    start = offset
+    while True:
+        data = f.read(chunk_bytes)
+        buffer += data
+        pos = 0
+        while len(buffer) - pos >= _RECORD_HEADER.size:
+            length, crc = _RECORD_HEADER.unpack_from(buffer, pos)
+            end = pos + _RECORD_HEADER.size + length
+            if end > len(buffer):
+                break
+            payload = buffer[pos + _RECORD_HEADER.size:end]
+            if zlib.crc32(payload) != crc:
+                return
+            yield start + pos, payload
+            pos = end
+        buffer = buffer[pos:]
+        start += pos
+        if not data:
+            return
+
+
+def _fsync_dir(directory: str) -> None:
+    """Persist directory entries (new segment files)."""
+    try:
+        fd = os.open(directory, os.O_RDONLY)
+    except OSError:
+        return
+    try:
+        os.fsync(fd)
+    finally:
+        os.close(fd)
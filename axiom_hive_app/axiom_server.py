@@ -0,0 +1,413 @@
+"""
+Axiom Hive Quantization Server
+HTTP/JSON access to AxiomHive.process with request micro-batching
+"""
+
+import argparse
+import asyncio
+import json
+import time
+from collections import deque
+from concurrent.futures import ThreadPoolExecutor
+from typing import Dict, List, Optional, Tuple, Union
+
+import numpy as np
+
+from axiom_core import AxiomHive, HamiltonianValidator, VectorConstrainedSingularity
+
+
+MAX_BODY_BYTES = 1024 * 1024
+
+_REASONS = {
+    200: "OK",
+    400: "Bad Request",
+    404: "Not Found",
+    405: "Method Not Allowed",
+    413: "Payload Too Large",
+    500: "Internal Server Error",
+    503: "Service Unavailable",
+}
+
+
+class Overloaded(Exception):
+    """Raised when a request is refused to protect the latency of the others."""
+
+
+class LatencyStats:
+    """Rolling window of request latencies with percentile reporting."""
+    
+    def __init__(self, window: int = 10000):
+        self._samples = deque(maxlen=window)
+        self.requests = 0
+        self.batches = 0
+        self.batched_rows = 0
+        self.rejected = 0
+        self.shed = 0
+    
+    def record(self, seconds: float) -> None:
+        """Record one completed request."""
+        self._samples.append(seconds)
+        self.requests += 1
+    
+    def snapshot(self) -> Dict:
+        """Counts plus p50/p99 latency (milliseconds) over the window."""
+        if self._samples:
+            p50, p99 = np.percentile(np.fromiter(self._samples, dtype=np.float64), [50, 99]) * 1e3
+        else:
+            p50 = p99 = 0.0
+        return {
+            "requests": self.requests,
+            "batches": self.batches,
+            "mean_batch_size": self.batched_rows / self.batches if self.batches else 0.0,
+            "rejected": self.rejected,
+            "shed": self.shed,
+            "p50_ms": float(p50),
+            "p99_ms": float(p99),
+        }
+
+
+class QuantizationServer:
+    """
+    Asyncio front end that merges concurrent requests into batched folds.
+    
+    Requests go onto a bounded queue. A single batcher task takes the
+    first waiting request, keeps collecting for up to `batch_window`
+    seconds or until `max_batch_size` requests are in hand, folds them
+    with one `fold_batch` call on a worker thread and resolves each
+    caller's future with its own receipt. Receipts match
+    `AxiomHive.process`; requests in one batch share a timestamp.
+    
+    Backpressure: when the queue is full, new requests are refused
+    immediately (HTTP 503) instead of queueing without bound. Requests
+    that have already waited longer than `latency_budget` by the time
+    their batch is formed are shed the same way.
+    """
+    
+    def __init__(
+        self,
+        hive: AxiomHive,
+        max_batch_size: int = 256,
+        batch_window: float = 0.002,
+        latency_budget: Optional[float] = 0.1,
+        max_queue: int = 1024
+    ):
+        """
+        Configure the server.
+        
+        Args:
+            hive: System that serves the requests
+            max_batch_size: Most requests merged into one fold
+            batch_window: Seconds to wait for more requests after the first
+            latency_budget: Longest queue wait before a request is shed (None: never)
+            max_queue: Pending requests accepted before refusing new ones
+        """
+        if max_batch_size < 1:
+            raise ValueError("max_batch_size must be at least 1")
+        if max_queue < 1:
+            raise ValueError("max_queue must be at least 1")
+        
+        self.hive = hive
+        self.max_batch_size = max_batch_size
+        self.batch_window = batch_window
+        self.latency_budget = latency_budget
+        self.max_queue = max_queue
+        self.stats = LatencyStats()
+        
+        self._queue: Optional[asyncio.Queue] = None
+        self._batcher: Optional[asyncio.Task] = None
+        self._executor = ThreadPoolExecutor(max_workers=1, thread_name_prefix="axiom-fold")
+        self._servers: List[asyncio.AbstractServer] = []
+    
+    async def start(self) -> None:
+        """Start the batcher on the running loop (called by serve/submit)."""
+        if self._batcher is None:
+            self._queue = asyncio.Queue(maxsize=self.max_queue)
+            self._batcher = asyncio.get_running_loop().create_task(self._run_batcher())
+    
+    async def close(self) -> None:
+        """Stop listening, fail pending requests and stop the batcher."""
+        for server in self._servers:
+            server.close()
+            await server.wait_closed()
+        self._servers = []
+        
+        if self._batcher is not None:
+            self._batcher.cancel()
+            try:
+                await self._batcher
+            except asyncio.CancelledError:
+                pass
+            self._batcher = None
+            while not self._queue.empty():
+                _, _, future = self._queue.get_nowait()
+                if not future.done():
+                    future.set_exception(Overloaded("Server shutting down"))
+        self._executor.shutdown(wait=True)
+    
+    async def submit(self, vector) -> Dict:
+        """
+        Quantize one vector through the batcher and return its receipt.
+        
+        Raises Overloaded if the queue is full or the request is shed.
+        """
+        await self.start()
+        start = time.perf_counter()
+        future = asyncio.get_running_loop().create_future()
+        try:
+            self._queue.put_nowait((vector, start, future))
+        except asyncio.QueueFull:
+            self.stats.rejected += 1
+            raise Overloaded("Request queue is full") from None
+        receipt = await future
+        self.stats.record(time.perf_counter() - start)
+        return receipt
+    
+    async def _run_batcher(self) -> None:
+        """Collect requests into batches and fan the receipts back out."""
+        loop = asyncio.get_running_loop()
+        while True:
+            batch = [await self._queue.get()]
+            deadline = loop.time() + self.batch_window
+            while len(batch) < self.max_batch_size:
+                timeout = deadline - loop.time()
+                if timeout <= 0:
+                    if self._queue.empty():
+                        break
+                    batch.append(self._queue.get_nowait())
+                    continue
+                try:
+                    batch.append(await asyncio.wait_for(self._queue.get(), timeout))
+                except asyncio.TimeoutError:
+                    break
+            
+            batch = self._shed(batch)
+            if not batch:
+                continue
+            
+            vectors = [vector for vector, _, _ in batch]
+            try:
+                receipts = await loop.run_in_executor(self._executor, self._process, vectors)
+            except Exception as e:
+                for _, _, future in batch:
+                    if not future.done():
+                        future.set_exception(e)
+                continue
+            
+            self.stats.batches += 1
+            self.stats.batched_rows += len(batch)
+            for (_, _, future), receipt in zip(batch, receipts):
+                if future.done():
+                    continue
+                if isinstance(receipt, Exception):
+                    future.set_exception(receipt)
+                else:
+                    future.set_result(receipt)
+    
+    def _shed(self, batch: List[Tuple]) -> List[Tuple]:
+        """Refuse requests that have already used up their latency budget."""
+        if self.latency_budget is None:
+            return batch
+        now = time.perf_counter()
+        kept = []
+        for item in batch:
+            _, start, future = item
+            if now - start > self.latency_budget:
+                self.stats.shed += 1
+                if not future.done():
+                    future.set_exception(Overloaded("Latency budget exceeded"))
+            else:
+                kept.append(item)
+        return kept
+    
+    def _process(self, vectors: List) -> List[Union[Dict, Exception]]:
+        """
+        Fold a list of request vectors (runs on the worker thread).
+        
+        Well-formed vectors of the lattice dimension go through one
+        `fold_batch`; anything else is folded on its own so it gets the
+        same receipt (usually ERROR_INVALID_INPUT) as `process` would give.
+        A vector that `process` cannot handle at all (a ragged array, say)
+        gets its exception in place of a receipt, leaving the rest intact.
+        """
+        dim = self.hive.vcs.dim
+        receipts: List[Optional[Union[Dict, Exception]]] = [None] * len(vectors)
+        rows, positions = [], []
+        for i, vector in enumerate(vectors):
+            try:
+                row = np.asarray(vector, dtype=np.float64)
+            except (ValueError, TypeError):
+                row = None
+            if row is not None and row.shape == (dim,):
+                rows.append(row)
+                positions.append(i)
+            else:
+                try:
+                    receipts[i] = self.hive.process(vector)
+                except Exception as e:
+                    receipts[i] = e
+        
+        if rows:
+            batch_receipts = self.hive.process_batch(np.stack(rows))
+            for i, receipt in zip(positions, batch_receipts):
+                receipts[i] = receipt
+        return receipts
+    
+    async def serve(self, host: str = "127.0.0.1", port: int = 8765) -> asyncio.AbstractServer:
+        """Listen for HTTP on a TCP port."""
+        await self.start()
+        server = await asyncio.start_server(self._handle_connection, host, port)
+        self._servers.append(server)
+        return server
+    
+    async def serve_unix(self, path: str) -> asyncio.AbstractServer:
+        """Listen for HTTP on a Unix domain socket."""
+        await self.start()
+        server = await asyncio.start_unix_server(self._handle_connection, path)
+        self._servers.append(server)
+        return server
+    
+    async def _handle_connection(
+        self,
+        reader: asyncio.StreamReader,
+        writer: asyncio.StreamWriter
+    ) -> None:
+        """Serve HTTP/1.1 requests on one connection until it closes."""
+        try:
+            while True:
+                request = await _read_request(reader)
+                if request is None:
+                    break
+                method, path, headers, body, error = request
+                if error is not None:
+                    status, payload = error[0], {"error": error[1]}
+                else:
+                    try:
+                        status, payload = await self._route(method, path, body)
+                    except Exception as e:
+                        status, payload = 500, {"error": f"Internal error: {e}"}
+                # The body of a rejected request was never read, so the connection ends
+                keep_alive = error is None and headers.get("connection", "").lower() != "close"
+                _write_response(writer, status, payload, keep_alive)
+                await writer.drain()
+                if not keep_alive:
+                    break
+        except (ConnectionError, asyncio.IncompleteReadError):
+            pass
+        except Exception as e:
+            # Answer rather than drop the connection without a response
+            _write_response(writer, 500, {"error": f"Internal error: {e}"}, False)
+        finally:
+            writer.close()
+    
+    async def _route(self, method: str, path: str, body: bytes) -> Tuple[int, Dict]:
+        """Dispatch one request to its endpoint."""
+        if path == "/stats":
+            return 200, self.stats.snapshot()
+        if path == "/health":
+            snapshot = self.hive.vcs.snapshot
+            return 200, {"status": "ok", "lattice_hash": snapshot.content_hash, "lattice_version": snapshot.version}
+        if path != "/process":
+            return 404, {"error": f"Unknown path: {path}"}
+        if method != "POST":
+            return 405, {"error": "Use POST /process"}
+        
+        try:
+            message = json.loads(body)
+            vector = message["vector"] if isinstance(message, dict) else message
+        except (ValueError, KeyError) as e:
+            return 400, {"error": f"Invalid request body: {e}"}
+        
+        try:
+            return 200, await self.submit(vector)
+        except Overloaded as e:
+            return 503, {"error": str(e)}
+        except (ValueError, TypeError) as e:
+            return 400, {"error": f"Invalid vector: {e}"}
+
+
+async def _read_request(reader: asyncio.StreamReader):
+    """
+    Read one HTTP request: (method, path, headers, body, error) or None at EOF.
+    
+    `error` is None, or the (status, message) to reject the request with
+    when its Content-Length is invalid or too large; the body is then
+    left unread (None).
+    """
+    line = await reader.readline()
+    if not line:
+        return None
+    parts = line.decode("latin-1").split()
+    if len(parts) < 2:
+        raise ConnectionError("Malformed request line")
+    method, path = parts[0].upper(), parts[1]
+    
+    headers = {}
+    while True:
+        line = await reader.readline()
+        if line in (b"\r\n", b"\n", b""):
+            break
+        name, _, value = line.decode("latin-1").partition(":")
+        headers[name.strip().lower()] = value.strip()
+    
+    value = headers.get("content-length", "") or "0"
+    if not (value.isascii() and value.isdigit()):
+        return method, path, headers, None, (400, f"Invalid Content-Length: {value}")
+    length = int(value)
+    if length > MAX_BODY_BYTES:
+        return method, path, headers, None, (413, "Request body too large")
+    body = await reader.readexactly(length) if length else b""
+    return method, path, headers, body, None
+
+
+def _write_response(writer: asyncio.StreamWriter, status: int, payload: Dict, keep_alive: bool) -> None:
+    """Write one JSON HTTP response."""
+    body = json.dumps(payload).encode("utf-8")
+    head = [
+        f"HTTP/1.1 {status} {_REASONS.get(status, '')}",
+        "Content-Type: application/json",
+        f"Content-Length: {len(body)}",
+        f"Connection: {'keep-alive' if keep_alive else 'close'}",
+    ]
+    if status == 503:
+        head.append("Retry-After: 1")
+    writer.write(("\r\n".join(head) + "\r\n\r\n").encode("latin-1") + body)
+
+
+def main():
+    """Serve a saved lattice over HTTP"""
+    parser = argparse.ArgumentParser(description="Axiom Hive quantization server")
+    parser.add_argument("lattice", help="Lattice file written by VectorConstrainedSingularity.save")
+    parser.add_argument("--host", default="127.0.0.1")
+    parser.add_argument("--port", type=int, default=8765)
+    parser.add_argument("--unix", help="Listen on this Unix socket path instead of TCP")
+    parser.add_argument("--max-batch-size", type=int, default=256)
+    parser.add_argument("--batch-window-ms", type=float, default=2.0)
+    parser.add_argument("--latency-budget-ms", type=float, default=100.0,
+                        help="Shed requests queued longer than this (0 disables)")
+    parser.add_argument("--max-queue", type=int, default=1024)
+    args = parser.parse_args()
+    
+    hive = AxiomHive(VectorConstrainedSingularity.load(args.lattice), HamiltonianValidator())
+    server = QuantizationServer(
+        hive,
+        max_batch_size=args.max_batch_size,
+        batch_window=args.batch_window_ms / 1e3,
+        latency_budget=args.latency_budget_ms / 1e3 if args.latency_budget_ms > 0 else None,
+        max_queue=args.max_queue
+    )
+    
+    async def run():
+        listener = await (server.serve_unix(args.unix) if args.unix else server.serve(args.host, args.port))
+        try:
+            await listener.serve_forever()
+        finally:
+            await server.close()
+    
+    try:
+        asyncio.run(run())
+    except KeyboardInterrupt:
+        pass
+
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,436 @@
+"""
+Axiom Hive Streaming Pipeline
+Folds NDJSON, CSV or raw float64 vector streams with constant memory
+"""
+
+import argparse
+import csv
+import hashlib
+import io
+import json
+import queue
+import sys
+import threading
+import time
+from dataclasses import dataclass
+from datetime import datetime
+from typing import BinaryIO, Dict, Iterator, List, Optional, TextIO, Tuple, Union
+
+import numpy as np
+
+from axiom_core import (
+    AxiomHive,
+    HamiltonianValidator,
+    QuantizationBatch,
+    QuantizationOutput,
+    QuantizationResult,
+    RESULT_CODES,
+    VectorConstrainedSingularity
+)
+
+
+FORMATS = ("ndjson", "csv", "raw")
+
+CSV_RECEIPT_FIELDS = [
+    "timestamp", "input_hash", "result", "state_label",
+    "residual_energy", "nearest_states", "lattice_hash", "lattice_version"
+]
+
+# Fixed-size little-endian receipt record for raw output. `result` indexes
+# RESULT_CODES and `label_index` is the state's row in the lattice (-1 if
+# none); the lattice itself is identified by its content hash.
+RAW_RECEIPT_DTYPE = np.dtype([
+    ("result", "u1"),
+    ("label_index", "<i8"),
+    ("residual_energy", "<f8"),
+    ("input_hash", "S16"),
+])
+
+_END = object()
+
+
+@dataclass(frozen=True)
+class _InvalidRow:
+    """A row that is not a vector at all; it gets an ERROR_INVALID_INPUT receipt."""
+    text: str
+
+
+def read_ndjson(stream: TextIO, batch_size: int) -> Iterator[List]:
+    """
+    Yield lists of vectors from lines holding a JSON array or {"vector": [...]}.
+    
+    A line that is not valid JSON, or an object without "vector", is
+    passed on as an invalid row so it still gets its receipt.
+    """
+    batch = []
+    for line in stream:
+        line = line.strip()
+        if not line:
+            continue
+        try:
+            value = json.loads(line)
+            batch.append(value["vector"] if isinstance(value, dict) else value)
+        except (ValueError, KeyError):
+            batch.append(_InvalidRow(line))
+        if len(batch) >= batch_size:
+            yield batch
+            batch = []
+    if batch:
+        yield batch
+
+
+def read_csv(stream: TextIO, batch_size: int, skip_header: bool = False) -> Iterator[List]:
+    """Yield lists of vectors from comma-separated rows of numbers."""
+    reader = csv.reader(stream)
+    if skip_header:
+        next(reader, None)
+    batch = []
+    for row in reader:
+        if not row:
+            continue
+        batch.append(row)
+        if len(batch) >= batch_size:
+            yield batch
+            batch = []
+    if batch:
+        yield batch
+
+
+def read_raw(
+    source: Union[str, BinaryIO],
+    dim: int,
+    batch_size: int
+) -> Iterator[np.ndarray]:
+    """
+    Yield (rows x dim) blocks of little-endian float64 records.
+    
+    A path is memory-mapped and sliced without copying; a binary stream
+    (such as stdin) is read one block at a time into a reused buffer.
+    """
+    record_bytes = dim * 8
+    if isinstance(source, str):
+        mapped = np.memmap(source, dtype="<f8", mode="r")
+        if mapped.size % dim:
+            raise ValueError(f"{source} does not hold whole {dim}-dimensional records")
+        records = mapped.reshape(-1, dim)
+        for start in range(0, records.shape[0], batch_size):
+            yield records[start:start + batch_size]
+        return
+    
+    buffer = bytearray(batch_size * record_bytes)
+    view = memoryview(buffer)
+    while True:
+        filled = 0
+        while filled < len(buffer):
+            n_read = source.readinto(view[filled:])
+            if not n_read:
+                break
+            filled += n_read
+        if filled % record_bytes:
+            raise ValueError("Input ends with a partial record")
+        if filled:
+            yield np.frombuffer(buffer, dtype="<f8", count=filled // 8).reshape(-1, dim).copy()
+        if filled < len(buffer):
+            return
+
+
+class StreamPipeline:
+    """
+    Three-stage streaming fold: reader -> fold -> writer.
+    
+    The reader and writer run on their own threads and hand micro-batches
+    through bounded queues, so at most `queue_depth` batches wait between
+    stages and memory stays constant regardless of input size. Each batch
+    goes through the vectorized `fold_batch` (or a `ParallelFold` pool);
+    batches whose rows cannot form a numeric array fall back to per-row
+    `AxiomHive.process`, so every row still gets a receipt in input order.
+    A malformed NDJSON line or a row `process` rejects outright (a ragged
+    array) gets an ERROR_INVALID_INPUT receipt and the stream goes on.
+    """
+    
+    def __init__(
+        self,
+        hive: AxiomHive,
+        input_format: str = "ndjson",
+        output_format: Optional[str] = None,
+        batch_size: int = 4096,
+        queue_depth: int = 4,
+        dim: Optional[int] = None,
+        parallel=None
+    ):
+        """
+        Configure the pipeline.
+        
+        Args:
+            hive: System whose lattice the vectors are folded against
+            input_format: "ndjson", "csv" or "raw"
+            output_format: Receipt format (defaults to the input format)
+            batch_size: Rows per micro-batch
+            queue_depth: Batches buffered between stages
+            dim: Record width for raw input (defaults to the lattice dimension)
+            parallel: Optional `ParallelFold` used instead of in-process folds
+        """
+        output_format = output_format or input_format
+        for fmt in (input_format, output_format):
+            if fmt not in FORMATS:
+                raise ValueError(f"Unknown stream format: {fmt}")
+        
+        self.hive = hive
+        self.input_format = input_format
+        self.output_format = output_format
+        self.batch_size = batch_size
+        self.queue_depth = queue_depth
+        self.dim = dim or hive.vcs.dim
+        self.parallel = parallel
+    
+    def _batches(self, source) -> Iterator:
+        """Reader stage: micro-batches from the source."""
+        if self.input_format == "raw":
+            if not self.dim:
+                raise ValueError("Raw input needs a record dimension")
+            return read_raw(source, self.dim, self.batch_size)
+        read = read_csv if self.input_format == "csv" else read_ndjson
+        if isinstance(source, str):
+            return self._read_path(read, source)
+        return read(source, self.batch_size)
+    
+    def _read_path(self, read, path: str) -> Iterator[List]:
+        """Run a text reader over a file it opens and closes itself."""
+        with open(path, encoding="utf-8", newline="") as stream:
+            yield from read(stream, self.batch_size)
+    
+    def _fold(self, rows) -> Optional[QuantizationBatch]:
+        """Fold stage: the batch result, or None if the rows are not a numeric array."""
+        if not isinstance(rows, np.ndarray):
+            try:
+                rows = np.array(rows, dtype=np.float64)
+            except (ValueError, TypeError):
+                rows = None
+            if rows is None or rows.ndim != 2:
+                return None
+        fold_batch = self.parallel.fold_batch if self.parallel is not None else self.hive.vcs.fold_batch
+        return fold_batch(rows)
+    
+    def _encode(self, rows, batch: Optional[QuantizationBatch]) -> Union[str, bytes]:
+        """Serialize one batch of receipts, logged like `AxiomHive.process_batch`'s."""
+        if batch is None:
+            receipts = [self._process_row(row) for row in rows]
+        elif self.output_format != "raw" or self.hive.receipt_log is not None:
+            receipts = self.hive.issue_receipts(batch)
+        
+        if self.output_format == "raw":
+            if batch is None:
+                return self._raw_records_from_receipts(receipts).tobytes()
+            records = np.empty(len(batch), dtype=RAW_RECEIPT_DTYPE)
+            records["result"] = batch.result_codes
+            records["label_index"] = batch.label_index
+            records["residual_energy"] = batch.residual_energy
+            records["input_hash"] = batch.input_hashes
+            return records.tobytes()
+        
+        if self.output_format == "ndjson":
+            return "".join(json.dumps(receipt) + "\n" for receipt in receipts)
+        
+        out = io.StringIO()
+        writer = csv.DictWriter(out, fieldnames=CSV_RECEIPT_FIELDS, lineterminator="\n")
+        for receipt in receipts:
+            writer.writerow(dict(receipt, nearest_states=json.dumps(receipt["nearest_states"])))
+        return out.getvalue()
+    
+    def _process_row(self, row) -> Dict:
+        """`AxiomHive.process` for one row; rows it cannot take get an ERROR_INVALID_INPUT receipt."""
+        if not isinstance(row, _InvalidRow):
+            try:
+                return self.hive.process(row)
+            except (ValueError, TypeError):
+                row = _InvalidRow(json.dumps(row))
+        
+        snapshot = self.hive.vcs.snapshot
+        output = QuantizationOutput(
+            result=QuantizationResult.ERROR_INVALID_INPUT,
+            state_label=None,
+            residual_energy=float("inf"),
+            nearest_states=[],
+            input_hash=hashlib.sha256(row.text.encode("utf-8")).hexdigest()[:16]
+        )
+        receipt = self.hive._receipt(output, datetime.now().isoformat(), snapshot)
+        if self.hive.receipt_log is not None:
+            self.hive.receipt_log.append(receipt)
+        return receipt
+    
+    def _raw_records_from_receipts(self, receipts: List[Dict]) -> np.ndarray:
+        """Raw records for receipts produced by the per-row fallback."""
+        codes = [result.value for result in RESULT_CODES]
+        records = np.empty(len(receipts), dtype=RAW_RECEIPT_DTYPE)
+        for record, receipt in zip(records, receipts):
+            record["result"] = codes.index(receipt["result"])
+            label = receipt["state_label"]
+            record["label_index"] = self.hive.vcs.state_index(label) if label is not None else -1
+            record["residual_energy"] = receipt["residual_energy"]
+            record["input_hash"] = receipt["input_hash"]
+        return records
+    
+    def iter_chunks(self, source) -> Iterator[Tuple[int, Union[str, bytes]]]:
+        """
+        Single-threaded `run`: (row count, encoded receipts) per batch.
+        
+        For callers that drive the loop themselves, e.g. to report progress
+        or stop between batches. No CSV header is emitted.
+        """
+        for rows in self._batches(source):
+            yield len(rows), self._encode(rows, self._fold(rows))
+    
+    def run(self, source, sink) -> Dict:
+        """
+        Stream every vector from source to receipts on sink.
+        
+        `source` is a path (raw input is memory-mapped) or an open stream;
+        `sink` is an open text stream, or a binary stream for raw output.
+        Returns row, batch and throughput counts.
+        """
+        inbox: queue.Queue = queue.Queue(maxsize=self.queue_depth)
+        outbox: queue.Queue = queue.Queue(maxsize=self.queue_depth)
+        errors: List[BaseException] = []
+        stop = threading.Event()
+        
+        def put(q: queue.Queue, item) -> bool:
+            while not stop.is_set():
+                try:
+                    q.put(item, timeout=0.1)
+                    return True
+                except queue.Full:
+                    continue
+            return False
+        
+        def get(q: queue.Queue):
+            while True:
+                try:
+                    return q.get(timeout=0.1)
+                except queue.Empty:
+                    if stop.is_set():
+                        return _END
+        
+        def reader():
+            try:
+                for rows in self._batches(source):
+                    if not put(inbox, rows):
+                        return
+                put(inbox, _END)
+            except BaseException as e:
+                errors.append(e)
+                stop.set()
+        
+        def writer():
+            try:
+                if self.output_format == "csv":
+                    sink.write(",".join(CSV_RECEIPT_FIELDS) + "\n")
+                while True:
+                    chunk = outbox.get()
+                    if chunk is _END:
+                        break
+                    sink.write(chunk)
+                sink.flush()
+            except BaseException as e:
+                errors.append(e)
+                stop.set()
+                # Keep draining so the fold stage never blocks on a dead writer
+                while outbox.get() is not _END:
+                    pass
+        
+        threads = [
+            threading.Thread(target=reader, name="axiom-stream-reader", daemon=True),
+            threading.Thread(target=writer, name="axiom-stream-writer", daemon=True),
+        ]
+        for thread in threads:
+            thread.start()
+        
+        n_rows = n_batches = 0
+        start = time.perf_counter()
+        try:
+            while True:
+                rows = get(inbox)
+                if rows is _END or stop.is_set():
+                    break
+                chunk = self._encode(rows, self._fold(rows))
+                n_rows += len(rows)
+                n_batches += 1
+                if not put(outbox, chunk):
+                    break
+        except BaseException:
+            stop.set()
+            raise
+        finally:
+            outbox.put(_END)
+            for thread in threads:
+                thread.join()
+        
+        if errors:
+            raise errors[0]
+        
+        seconds = time.perf_counter() - start
+        return {
+            "rows": n_rows,
+            "batches": n_batches,
+            "seconds": seconds,
+            "rows_per_second": n_rows / seconds if seconds > 0 else 0.0,
+        }
+
+
+def main():
+    """Stream vectors from a file or stdin through a saved lattice"""
+    parser = argparse.ArgumentParser(description="Axiom Hive streaming fold")
+    parser.add_argument("lattice", help="Lattice file written by VectorConstrainedSingularity.save")
+    parser.add_argument("--input", default="-", help="Input path, or - for stdin")
+    parser.add_argument("--output", default="-", help="Output path, or - for stdout")
+    parser.add_argument("--input-format", choices=FORMATS, default="ndjson")
+    parser.add_argument("--output-format", choices=FORMATS)
+    parser.add_argument("--dim", type=int, help="Record width for raw input")
+    parser.add_argument("--batch-size", type=int, default=4096)
+    parser.add_argument("--queue-depth", type=int, default=4)
+    parser.add_argument("--workers", type=int, help="Fold with a process pool of this size")
+    args = parser.parse_args()
+    
+    vcs = VectorConstrainedSingularity.load(args.lattice)
+    hive = AxiomHive(vcs, HamiltonianValidator())
+    output_format = args.output_format or args.input_format
+    
+    parallel = None
+    if args.workers:
+        from axiom_parallel import ParallelFold
+        parallel = ParallelFold(vcs, workers=args.workers)
+    
+    binary_in = args.input_format == "raw"
+    binary_out = output_format == "raw"
+    if args.input == "-":
+        source = sys.stdin.buffer if binary_in else sys.stdin
+    else:
+        source = args.input
+    if args.output == "-":
+        sink = sys.stdout.buffer if binary_out else sys.stdout
+    elif binary_out:
+        sink = open(args.output, "wb")
+    else:
+        sink = open(args.output, "w", encoding="utf-8", newline="")
+    
+    try:
+        pipeline = StreamPipeline(
+            hive,
+            input_format=args.input_format,
+            output_format=output_format,
+            batch_size=args.batch_size,
+            queue_depth=args.queue_depth,
+            dim=args.dim,
+            parallel=parallel
+        )
+        stats = pipeline.run(source, sink)
+    finally:
+        if parallel is not None:
+            parallel.close()
+        if sink not in (sys.stdout, sys.stdout.buffer):
+            sink.close()
+    
+    print(json.dumps(stats), file=sys.stderr)
+
+
+if __name__ == "__main__":
+    main()